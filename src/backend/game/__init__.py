@@ -2,7 +2,14 @@
 
 Modules exported by this package:
 
+- `clock`: Provide the chess clock of games played with time controls.
+- `dataset`: Provide a pipeline that builds training datasets of positions labelled by the
+    minimax engine.
+- `distributed`: Provide a coordinator and workers that share analyses and tournaments over
+    TCP.
 - `engine`: Provide the class that handles the game.
+- `memory`: Provide a report of the memory used by games, measured with tracemalloc.
 - `players`: Provide the classes to instantiate players, human or computer.
 - `renderers`: Provide classes for visual and state rendering.
+- `simulation`: Provide a vectorised simulator of random games of the classic game.
 """
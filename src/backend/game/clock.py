@@ -0,0 +1,134 @@
+"""Provide the chess clock of games played with time controls.
+
+This module allows a game to bound the time each player spends on their moves. A time control
+gives every player a base time and an increment added after each move. The clock of the
+player to move runs while they choose their move, and a player whose clock reaches zero has
+lost on time: their flag has fallen.
+
+Examples:
+
+    >>> from backend.game.clock import ChessClock, TimeControl
+    >>> clock = ChessClock(TimeControl(60, increment_seconds=2))
+    >>> clock.start(Mark("X"))
+    >>> clock.stop()
+    0.0001
+    >>> clock.snapshot()
+    {'X': 61.9999, 'O': 60.0}
+
+The module contains the following classes:
+- `TimeControl` - A inmutable data class with the base time and increment of every player.
+- `ChessClock` - The clock of a game, with the time left of every player.
+"""
+
+import time
+from dataclasses import dataclass
+
+from backend.logic.models import Mark
+
+@dataclass(frozen=True)
+class TimeControl:
+    """An inmutable data class that is strictly a data transfer object (DTO) whose main purpose
+    is to carry the time control of a game.
+
+    Attributes:
+        base_seconds: float
+            Time of every player at the start of the game.
+        increment_seconds: float = 0.0
+            Time added to a player after each of their moves.
+    """
+    base_seconds: float
+    increment_seconds: float = 0.0
+
+    def __post_init__(self) -> None:
+        """Post instantiation hook that verifies that the times are valid"""
+        if self.base_seconds <= 0:
+            raise ValueError("Base time must be positive")
+        if self.increment_seconds < 0:
+            raise ValueError("Increment can not be negative")
+
+class ChessClock:
+    """The clock of a game, with the time left of every player. Only the clock of the player
+    to move runs.
+
+    Attributes:
+        time_control: TimeControl
+            Base time and increment of every player.
+        flagged: Mark | None
+            Mark of the player whose time ran out, if any.
+
+    Methods:
+        start(self, mark: Mark) -> None:
+            Start the clock of a player.
+        stop(self, increment: bool = True) -> float:
+            Stop the running clock and return the time spent.
+        time_left(self, mark: Mark) -> float:
+            Return the time left of a player.
+        snapshot(self) -> dict[str, float]:
+            Return the time left of every player.
+    """
+    def __init__(self, time_control: TimeControl) -> None:
+        """
+        Args:
+            time_control (TimeControl): Base time and increment of every player.
+        """
+        self.time_control = time_control
+        self.flagged: Mark | None = None
+        self._remaining = {mark: time_control.base_seconds for mark in Mark}
+        self._running: Mark | None = None
+        self._started = 0.0
+
+    def start(self, mark: Mark) -> None:
+        """Start the clock of a player.
+
+        Args:
+            mark (Mark): Mark of the player to move.
+        """
+        self._running = mark
+        self._started = time.monotonic()
+
+    def stop(self, increment: bool = True) -> float:
+        """Stop the running clock and return the time spent. The flag of the player falls
+        when the time spent is more than the time they had, otherwise the increment is added.
+
+        Args:
+            increment (bool, optional): Rather to add the increment, only for moves played.
+                Defaults to True.
+
+        Returns:
+            float: Seconds spent since the clock started.
+        """
+        if self._running is None:
+            return 0.0
+        spent = time.monotonic() - self._started
+        mark, self._running = self._running, None
+        remaining = self._remaining[mark] - spent
+        if remaining <= 0:
+            self.flagged = mark
+            remaining = 0.0
+        elif increment:
+            remaining += self.time_control.increment_seconds
+        self._remaining[mark] = remaining
+        return spent
+
+    def time_left(self, mark: Mark) -> float:
+        """Return the time left of a player, counting the time spent so far when their clock
+        is running.
+
+        Args:
+            mark (Mark): Mark of the player.
+
+        Returns:
+            float: Seconds left, 0.0 when the flag fell.
+        """
+        remaining = self._remaining[mark]
+        if mark is self._running:
+            remaining -= time.monotonic() - self._started
+        return max(remaining, 0.0)
+
+    def snapshot(self) -> dict[str, float]:
+        """Return the time left of every player.
+
+        Returns:
+            dict[str, float]: Seconds left by mark.
+        """
+        return {str(mark): self.time_left(mark) for mark in Mark}
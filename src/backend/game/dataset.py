@@ -0,0 +1,350 @@
+"""Provide a pipeline that builds training datasets of positions labelled by the minimax engine.
+
+This module allows evaluation models to be trained on positions of the classic game. Positions
+come from a walk of every reachable position or from self-play games between any pair of
+players, and each one is labelled with its minimax value and a policy that spreads the
+probability evenly over the best moves. Labels are streamed in chunks into preallocated,
+memory-mapped `.npy` files written with the standard library only, so the whole dataset is
+never held in memory and NumPy is only needed to read it:
+
+- `boards.npy` - uint8 array of shape (n, 2, 9), the cells of X and the cells of O.
+- `to_move.npy` - uint8 array of shape (n,), 0 when X is to move and 1 when O is.
+- `value.npy` - int8 array of shape (n,), 1, 0 or -1 for the player to move.
+- `policy.npy` - float32 array of shape (n, 9), probability of every cell.
+
+Examples:
+
+    >>> from backend.game.dataset import build_dataset, reachable_positions
+    >>> build_dataset("data", reachable_positions(), capacity=2 * REACHABLE_POSITIONS)
+    9040
+    >>> numpy.load("data/value.npy", mmap_mode="r").shape
+    (9040,)
+
+The module contains the following classes:
+- `NpyWriter` - Writer of a memory-mapped `.npy` file.
+- `DatasetWriter` - Writer of the arrays of a dataset.
+
+The module contains the following functions:
+- `label_position(game_state: GameState, cache: SearchCache) -> tuple[int, list[float]]` -
+    Return the minimax value and policy of a position.
+- `reachable_positions(
+    starting_marks: Iterable[Mark] = (Mark("X"), Mark("O"))
+    ) -> Iterator[GameState]` - Return every position reachable in a game that is not over.
+- `self_play_positions(
+    player1: Player, player2: Player, games: int, starting_mark: Mark = Mark("X"),
+    seed: int | None = None
+    ) -> Iterator[GameState]` - Return the positions of self-play games that are not over.
+- `build_dataset(
+    directory: str | Path, positions: Iterable[GameState], capacity: int,
+    chunk_size: int = 4096
+    ) -> int` - Label positions and write them as a dataset.
+"""
+
+import mmap
+import os
+import random
+import struct
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from backend.logic.cache import SearchCache
+from backend.logic.minimax import evaluate_position
+from backend.logic.models import GameState, Grid, Mark
+
+from .engine import EventKind, TicTacToe
+from .players import ComputerPlayer, Player
+
+REACHABLE_POSITIONS = 4520
+NPY_MAGIC = b"\x93NUMPY\x01\x00"
+NPY_HEADER_SIZE = 128
+ITEM_SIZES = {"|u1": 1, "|i1": 1, "<f4": 4}
+
+class NpyWriter:
+    """Writer of a memory-mapped `.npy` file. The file is preallocated for a number of rows,
+    filled row by row and shrunk to the rows written when closed. The header is padded to a
+    fixed size, so it can be rewritten in place with the final shape.
+
+    Attributes:
+        path: Path
+            Path of the file.
+        dtype: str
+            NumPy type string of the items, like "|u1" or "<f4".
+        row_shape: tuple[int, ...]
+            Shape of a row.
+        rows: int
+            Rows written so far.
+
+    Methods:
+        write(self, data: bytes | bytearray) -> None:
+            Append rows given as raw bytes.
+        close(self) -> None:
+            Shrink the file to the rows written and close it.
+    """
+    def __init__(
+        self, path: str | Path, dtype: str, row_shape: tuple[int, ...], capacity: int
+    ) -> None:
+        """
+        Args:
+            path (str | Path): Path of the file, overwritten if it exists.
+            dtype (str): NumPy type string of the items, like "|u1" or "<f4".
+            row_shape (tuple[int, ...]): Shape of a row.
+            capacity (int): Maximum number of rows.
+        """
+        self.path = Path(path)
+        self.dtype = dtype
+        self.row_shape = row_shape
+        self.rows = 0
+        self._row_size = ITEM_SIZES[dtype]
+        for size in row_shape:
+            self._row_size *= size
+        self._capacity = capacity
+        with open(self.path, "w+b") as file:
+            file.write(self._header(capacity))
+            file.truncate(NPY_HEADER_SIZE + max(capacity * self._row_size, 1))
+            self._map = mmap.mmap(file.fileno(), 0)
+
+    def _header(self, rows: int) -> bytes:
+        """Return the header of the file for a number of rows.
+
+        Args:
+            rows (int): Number of rows.
+
+        Returns:
+            bytes: Header padded with spaces to NPY_HEADER_SIZE bytes.
+        """
+        shape = (rows, *self.row_shape)
+        description = repr(
+            {"descr": self.dtype, "fortran_order": False, "shape": shape}
+        ).encode("latin1")
+        size = NPY_HEADER_SIZE - len(NPY_MAGIC) - 2
+        return NPY_MAGIC + struct.pack("<H", size) + description.ljust(size - 1) + b"\n"
+
+    def write(self, data: bytes | bytearray) -> None:
+        """Append rows given as raw bytes.
+
+        Args:
+            data (bytes | bytearray): Whole rows in C order.
+
+        Raises:
+            ValueError: Exception when the data is not made of whole rows or does not fit.
+        """
+        rows, remainder = divmod(len(data), self._row_size)
+        if remainder or self.rows + rows > self._capacity:
+            raise ValueError(f"Cannot write {len(data)} bytes to {self.path}")
+        offset = NPY_HEADER_SIZE + self.rows * self._row_size
+        self._map[offset:offset + len(data)] = data
+        self.rows += rows
+
+    def close(self) -> None:
+        """Shrink the file to the rows written and close it. Closing it again does nothing."""
+        if self._map.closed:
+            return
+        try:
+            self._map[:NPY_HEADER_SIZE] = self._header(self.rows)
+            self._map.flush()
+        finally:
+            self._map.close()
+        os.truncate(self.path, NPY_HEADER_SIZE + self.rows * self._row_size)
+
+class DatasetWriter:
+    """Writer of the arrays of a dataset. Labelled positions are gathered in chunks, each chunk
+    being copied to the memory-mapped files at once.
+
+    Attributes:
+        directory: Path
+            Directory of the `.npy` files.
+        rows: int
+            Positions written so far.
+
+    Methods:
+        add(self, game_state: GameState) -> None:
+            Label a position and add it to the dataset.
+        flush(self) -> None:
+            Write the current chunk to the files.
+        close(self) -> None:
+            Write the last chunk and close the files.
+    """
+    def __init__(
+        self,
+        directory: str | Path,
+        capacity: int,
+        chunk_size: int = 4096,
+        cache: SearchCache | None = None,
+    ) -> None:
+        """
+        Args:
+            directory (str | Path): Directory of the files, created if needed.
+            capacity (int): Maximum number of positions.
+            chunk_size (int, optional): Positions gathered before writing. Defaults to 4096.
+            cache (SearchCache | None, optional): Cache of solved positions. Defaults to a new
+                cache.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.rows = 0
+        self._chunk_size = chunk_size
+        self._cache = SearchCache() if cache is None else cache
+        self._writers = {
+            "boards": NpyWriter(self.directory / "boards.npy", "|u1", (2, 9), capacity),
+            "to_move": NpyWriter(self.directory / "to_move.npy", "|u1", (), capacity),
+            "value": NpyWriter(self.directory / "value.npy", "|i1", (), capacity),
+            "policy": NpyWriter(self.directory / "policy.npy", "<f4", (9,), capacity),
+        }
+        self._chunks = {name: bytearray() for name in self._writers}
+        self._pending = 0
+
+    def add(self, game_state: GameState) -> None:
+        """Label a position and add it to the dataset.
+
+        Args:
+            game_state (GameState): current GameState, consisting of a current Grid (9 elemets that
+                that can be X, O or spaces) and a starting Mark (default X).
+        """
+        value, policy = label_position(game_state, self._cache)
+        cells = game_state.grid.cells
+        self._chunks["boards"] += bytes(cell == "X" for cell in cells)
+        self._chunks["boards"] += bytes(cell == "O" for cell in cells)
+        self._chunks["to_move"].append(game_state.current_mark is Mark.NAUGHT)
+        self._chunks["value"] += struct.pack("<b", value)
+        self._chunks["policy"] += struct.pack("<9f", *policy)
+        self._pending += 1
+        if self._pending >= self._chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the current chunk to the files."""
+        for name, chunk in self._chunks.items():
+            self._writers[name].write(chunk)
+            chunk.clear()
+        self.rows += self._pending
+        self._pending = 0
+
+    def close(self) -> None:
+        """Write the last chunk and close the files. The files are closed with the rows
+        already written even when the last chunk can not be written.
+        """
+        try:
+            self.flush()
+        finally:
+            self._close_writers()
+
+    def _close_writers(self) -> None:
+        """Close the files with the rows already written, dropping the current chunk."""
+        for writer in self._writers.values():
+            writer.close()
+
+    def __enter__(self) -> "DatasetWriter":
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, *exc_info: object) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._close_writers()
+
+def label_position(game_state: GameState, cache: SearchCache) -> tuple[int, list[float]]:
+    """Return the minimax value of a position for the player to move and a policy that gives
+    the same probability to every best move.
+
+    Args:
+        game_state (GameState): current GameState, consisting of a current Grid (9 elemets that
+            that can be X, O or spaces) and a starting Mark (default X).
+        cache (SearchCache): Cache of solved positions to read and fill.
+
+    Returns:
+        tuple[int, list[float]]: Value (1, 0 or -1) and probability of each of the 9 cells.
+    """
+    value, _ = evaluate_position(game_state, cache)
+    best_moves = [
+        move.cell_index for move in game_state.possible_moves
+        if -evaluate_position(move.after_state, cache)[0] == value
+    ]
+    policy = [0.0] * 9
+    for index in best_moves:
+        policy[index] = 1 / len(best_moves)
+    return value, policy
+
+def reachable_positions(
+    starting_marks: Iterable[Mark] = (Mark("X"), Mark("O"))
+) -> Iterator[GameState]:
+    """Return every position reachable in a game that is not over, ply by ply, in a stable
+    order. There are REACHABLE_POSITIONS of them for each starting mark.
+
+    Args:
+        starting_marks (Iterable[Mark], optional): Starting marks of the games. Defaults to
+            both marks.
+
+    Yields:
+        Iterator[GameState]: Positions that are not over.
+    """
+    for starting_mark in starting_marks:
+        frontier = [GameState(Grid(), starting_mark)]
+        while frontier:
+            seen = set()
+            next_frontier = []
+            for game_state in frontier:
+                yield game_state
+                for move in game_state.possible_moves:
+                    after_state = move.after_state
+                    if not after_state.game_over and after_state.grid.cells not in seen:
+                        seen.add(after_state.grid.cells)
+                        next_frontier.append(after_state)
+            frontier = next_frontier
+
+def self_play_positions(
+    player1: Player,
+    player2: Player,
+    games: int,
+    starting_mark: Mark = Mark("X"),
+    seed: int | None = None,
+) -> Iterator[GameState]:
+    """Return the positions of self-play games that are not over, game after game. The
+    computer players draw their moves from a random generator of their own, so the games
+    only depend on the seed, whatever else uses the random module meanwhile.
+
+    Args:
+        player1 (Player): Player of one mark.
+        player2 (Player): Player of the other mark.
+        games (int): Number of games.
+        starting_mark (Mark, optional): Starting mark of every game. Defaults to Mark("X").
+        seed (int | None, optional): Seed of the random generator of the players, for
+            reproducible games. Defaults to None.
+
+    Yields:
+        Iterator[GameState]: Positions that are not over, at most 9 per game.
+    """
+    rng = random.Random(seed)
+    for player in (player1, player2):
+        if isinstance(player, ComputerPlayer):
+            player.rng = rng
+    engine = TicTacToe(player1, player2)
+    for _ in range(games):
+        for event in engine.events(starting_mark):
+            if event.kind is not EventKind.INVALID_MOVE and not event.game_state.game_over:
+                yield event.game_state
+
+def build_dataset(
+    directory: str | Path,
+    positions: Iterable[GameState],
+    capacity: int,
+    chunk_size: int = 4096,
+) -> int:
+    """Label positions and write them as a dataset. The positions are consumed lazily, so
+    self-play games are played while the dataset is written.
+
+    Args:
+        directory (str | Path): Directory of the `.npy` files.
+        positions (Iterable[GameState]): Positions to label.
+        capacity (int): Maximum number of positions.
+        chunk_size (int, optional): Positions gathered before writing. Defaults to 4096.
+
+    Raises:
+        ValueError: Exception when there are more positions than the capacity.
+
+    Returns:
+        int: Number of positions written.
+    """
+    with DatasetWriter(directory, capacity, chunk_size) as writer:
+        for game_state in positions:
+            writer.add(game_state)
+    return writer.rows
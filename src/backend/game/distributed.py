@@ -0,0 +1,487 @@
+"""Provide a coordinator and workers that share analyses and tournaments over TCP.
+
+This module allows batches of work to be spread over several machines, beyond the process pool
+of a single one. A `Coordinator` splits the work into units, either chunks of position lines
+to analyse or matches of a number of games between two computer players, and serves them over
+a TCP socket. Workers connect, pull a unit, run it headless through `analyze_chunk` or the
+`TicTacToe` engine, send back a compact result and pull the next one, until the coordinator
+tells them the work is done. Messages are JSON objects, one per line.
+
+A unit is handed to one worker at a time. When the worker disconnects, stops answering or
+fails to run the unit, the unit is queued again for another worker, up to a number of
+attempts. Results are yielded in the order of the units, and units are only taken from the
+input while few results are waiting, so memory stays bounded whatever the size of the batch.
+Workers on the same machine stand in for remote nodes.
+
+Examples:
+
+    >>> from backend.game.distributed import Coordinator, run_worker, tournament_units
+    >>> units = tournament_units(["random", "minimax"], 1000)
+    >>> with Coordinator(units, ("0.0.0.0", 9000)) as coordinator:
+            # on every node: run_worker("coordinator-host", 9000)
+            print(aggregate_tournament(coordinator.results()))
+    {('random', 'random'): {'X': 585, 'O': 288, 'tie': 127}, ...}
+
+The module contains the following class:
+- `Coordinator` - Server that hands out work units to workers and gathers their results.
+
+The module contains the following functions:
+- `analysis_units(lines: Iterable[str], chunk_size: int = 256) -> Iterator[dict]` - Split
+    position lines into analysis units.
+- `tournament_units(
+    players: Iterable[str], games: int, games_per_unit: int = 100,
+    starting_mark: Mark = Mark("X"), seed: int | None = None
+    ) -> Iterator[dict]` - Split the matches between every pair of players into units.
+- `run_unit(unit: dict) -> list` - Run a work unit and return its compact result.
+- `run_worker(host: str, port: int, connect_timeout: float = 10.0) -> int` - Pull and run
+    units from a coordinator until the work is done.
+- `analysis_results(results: Iterable[tuple[dict, list]]) -> Iterator[PositionAnalysis]` -
+    Return the analyses of the results of analysis units.
+- `aggregate_tournament(results: Iterable[tuple[dict, list]]) -> dict` - Return the number
+    of games won by X, won by O and tied for every pair of players.
+"""
+
+import json
+import random
+import socket
+import socketserver
+import threading
+import time
+from collections import Counter, deque
+from itertools import islice, product
+from typing import Any, BinaryIO, Iterable, Iterator
+
+from backend.game.engine import TicTacToe
+from backend.game.players import MinimaxComputerPlayer, RandomComputerPlayer
+from backend.logic.analysis import PositionAnalysis, analyze_chunk
+from backend.logic.exceptions import WorkUnitFailed
+from backend.logic.models import Mark
+
+COMPUTER_PLAYER_CLASSES = {
+    "random": RandomComputerPlayer,
+    "minimax": MinimaxComputerPlayer,
+}
+
+MATCH_RESULTS = ("X", "O", "tie")
+
+class Coordinator:
+    """Server that hands out work units to workers and gathers their results. The server
+    runs in a background thread, started by `results` or by entering the coordinator as a
+    context manager, and every worker connection is served by its own thread.
+
+    Attributes:
+        address: tuple[str, int]
+            Host and port the coordinator listens on, with the port chosen by the system
+            when 0 was given.
+        max_attempts: int
+            Times a unit is handed out before it fails.
+        timeout: float
+            Seconds a worker is given to answer before its unit is queued again.
+        window: int
+            Units handed out or waiting to be yielded at most.
+
+    Methods:
+        start(self) -> None:
+            Start serving workers in a background thread.
+        results(self) -> Iterator[tuple[dict, Any]]:
+            Return every unit with its result, in the order of the units.
+        handle_worker(self, rfile: BinaryIO, wfile: BinaryIO) -> None:
+            Answer every message of a worker until the work is done or the worker is lost.
+        close(self) -> None:
+            Stop serving workers and release the socket.
+    """
+    # pylint: disable=too-many-instance-attributes
+    # The bookkeeping of the units is guarded by a single condition, so it stays together.
+    def __init__(
+        self,
+        units: Iterable[dict],
+        address: tuple[str, int] = ("127.0.0.1", 0),
+        *,
+        max_attempts: int = 3,
+        timeout: float = 300.0,
+        window: int = 1024,
+    ) -> None:
+        """
+        Args:
+            units (Iterable[dict]): Work units, consumed lazily.
+            address (tuple[str, int], optional): Host and port to listen on, port 0 for any
+                free port. Defaults to ("127.0.0.1", 0).
+            max_attempts (int, optional): Times a unit is handed out before it fails.
+                Defaults to 3.
+            timeout (float, optional): Seconds a worker is given to answer. Defaults to
+                300.0.
+            window (int, optional): Units handed out or waiting to be yielded at most.
+                Defaults to 1024.
+        """
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self.window = window
+        self._units = enumerate(units)
+        self._retries: deque[tuple[int, dict]] = deque()
+        self._attempts: Counter[int] = Counter()
+        self._finished: dict[int, tuple[dict, Any]] = {}
+        self._issued = 0
+        self._yielded = 0
+        self._in_flight = 0
+        self._exhausted = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._server = _CoordinatorServer(address, self)
+        self.address = self._server.server_address[:2]
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> "Coordinator":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def start(self) -> None:
+        """Start serving workers in a background thread, if not started yet."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+            self._thread.start()
+
+    def results(self) -> Iterator[tuple[dict, Any]]:
+        """Return every unit with its result, in the order of the units, as soon as the
+        results of the units before it are known. The coordinator is closed when every
+        result was yielded or the iterator is closed.
+
+        Raises:
+            WorkUnitFailed: Exception when a unit failed on every attempt.
+
+        Yields:
+            Iterator[tuple[dict, Any]]: Unit and result of the unit.
+        """
+        self.start()
+        try:
+            while True:
+                with self._condition:
+                    while self._yielded not in self._finished:
+                        if self._exhausted and self._yielded >= self._issued:
+                            return
+                        self._condition.wait()
+                    unit, result = self._finished.pop(self._yielded)
+                    self._yielded += 1
+                if isinstance(result, WorkUnitFailed):
+                    raise result
+                yield unit, result
+        finally:
+            self.close()
+
+    def handle_worker(self, rfile: BinaryIO, wfile: BinaryIO) -> None:
+        """Answer every message of a worker until the work is done or the worker is lost, and
+        queue again the unit it was running when it is lost. A malformed message, or a message
+        of a worker holding a unit that does not answer that unit, is taken as a lost worker.
+
+        Args:
+            rfile (BinaryIO): Stream of the messages of the worker.
+            wfile (BinaryIO): Stream of the replies to the worker.
+        """
+        unit_id: int | None = None
+        unit: dict = {}
+        try:
+            for line in rfile:
+                message = json.loads(line)
+                if not isinstance(message, dict):
+                    break
+                if unit_id is not None:
+                    if message.get("id") != unit_id:
+                        break
+                    if message["type"] == "result":
+                        self._complete(unit_id, unit, message["result"])
+                    else:
+                        self._retry(unit_id, unit, str(message.get("error", "unknown error")))
+                    unit_id = None
+                reply = self._assign()
+                if reply["type"] == "unit":
+                    unit_id, unit = reply["id"], reply["unit"]
+                _send(wfile, reply)
+                if reply["type"] == "done":
+                    return
+        except (OSError, ValueError, KeyError):
+            pass
+        finally:
+            if unit_id is not None:
+                self._retry(unit_id, unit, "worker lost")
+
+    def close(self) -> None:
+        """Stop serving workers and release the socket. Connected workers are told the work
+        is done when they pull their next unit."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+        if self._thread is not None:
+            self._server.shutdown()
+        self._server.server_close()
+
+    def _assign(self) -> dict:
+        """Return the message answering a worker pulling a unit: a unit, a request to wait
+        while the window is full or other workers may fail, or the end of the work.
+
+        Returns:
+            dict: Message sent to the worker.
+        """
+        with self._condition:
+            if self._closed:
+                return {"type": "done"}
+            entry = None
+            if self._retries:
+                entry = self._retries.popleft()
+            elif not self._exhausted and self._issued - self._yielded < self.window:
+                entry = next(self._units, None)
+                if entry is None:
+                    self._exhausted = True
+                    self._condition.notify_all()
+                else:
+                    self._issued += 1
+            if entry is not None:
+                self._in_flight += 1
+                return {"type": "unit", "id": entry[0], "unit": entry[1]}
+            if self._exhausted and not self._in_flight:
+                return {"type": "done"}
+            return {"type": "wait", "seconds": 0.1}
+
+    def _complete(self, unit_id: int, unit: dict, result: Any) -> None:
+        """Record the result of a unit.
+
+        Args:
+            unit_id (int): Id of the unit.
+            unit (dict): Work unit.
+            result (Any): Result sent by the worker.
+        """
+        with self._condition:
+            self._in_flight -= 1
+            self._finished[unit_id] = (unit, result)
+            self._condition.notify_all()
+
+    def _retry(self, unit_id: int, unit: dict, error: str) -> None:
+        """Queue a unit again after a failed attempt, or record its failure after the last
+        attempt.
+
+        Args:
+            unit_id (int): Id of the unit.
+            unit (dict): Work unit.
+            error (str): Reason of the failure.
+        """
+        with self._condition:
+            self._in_flight -= 1
+            self._attempts[unit_id] += 1
+            attempts = self._attempts[unit_id]
+            if attempts >= self.max_attempts:
+                self._finished[unit_id] = (
+                    unit, WorkUnitFailed(f"Unit {unit_id} failed {attempts} times: {error}")
+                )
+            else:
+                self._retries.append((unit_id, unit))
+            self._condition.notify_all()
+
+class _CoordinatorHandler(socketserver.StreamRequestHandler):
+    """Handler of the connection of a worker. Extends StreamRequestHandler."""
+    server: "_CoordinatorServer"
+
+    def handle(self) -> None:
+        """Serve the worker through the coordinator, with the timeout of the coordinator."""
+        self.connection.settimeout(self.server.coordinator.timeout)
+        self.server.coordinator.handle_worker(self.rfile, self.wfile)
+
+class _CoordinatorServer(socketserver.ThreadingTCPServer):
+    """TCP server of a coordinator, a thread per worker. Extends ThreadingTCPServer."""
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], coordinator: Coordinator) -> None:
+        """
+        Args:
+            address (tuple[str, int]): Host and port to listen on.
+            coordinator (Coordinator): Coordinator of the units.
+        """
+        super().__init__(address, _CoordinatorHandler)
+        self.coordinator = coordinator
+
+def analysis_units(lines: Iterable[str], chunk_size: int = 256) -> Iterator[dict]:
+    """Split position lines into analysis units, as analysis.analyze_lines splits them into
+    chunks. Blank lines are skipped.
+
+    Args:
+        lines (Iterable[str]): Position lines, trailing newlines are ignored.
+        chunk_size (int, optional): Positions of a unit. Defaults to 256.
+
+    Yields:
+        Iterator[dict]: Units with the pairs of line number and position line.
+    """
+    numbered = (
+        (line_number, line.rstrip("\r\n"))
+        for line_number, line in enumerate(lines, start=1)
+        if line.strip("\r\n")
+    )
+    for chunk in iter(lambda: list(islice(numbered, chunk_size)), []):
+        yield {"kind": "analyze", "lines": chunk}
+
+def tournament_units(
+    players: Iterable[str],
+    games: int,
+    games_per_unit: int = 100,
+    starting_mark: Mark = Mark("X"),
+    seed: int | None = None,
+) -> Iterator[dict]:
+    """Split the matches between every ordered pair of computer players into units, each
+    player playing X against every player, itself included.
+
+    Args:
+        players (Iterable[str]): Names of the players, keys of COMPUTER_PLAYER_CLASSES.
+        games (int): Games of every match.
+        games_per_unit (int, optional): Games of a unit. Defaults to 100.
+        starting_mark (Mark, optional): Starting mark of every game. Defaults to Mark("X").
+        seed (int | None, optional): Seed of the units, for reproducible tournaments
+            whatever the worker running each unit. Defaults to None.
+
+    Raises:
+        ValueError: Exception when a player is not a computer player.
+
+    Yields:
+        Iterator[dict]: Units with the players, the number of games and a seed.
+    """
+    players = list(players)
+    for name in players:
+        if name not in COMPUTER_PLAYER_CLASSES:
+            raise ValueError(f"Unknown computer player {name!r}")
+    index = 0
+    for player_x, player_o in product(players, repeat=2):
+        for start in range(0, games, games_per_unit):
+            yield {
+                "kind": "match",
+                "player_x": player_x,
+                "player_o": player_o,
+                "starting_mark": str(starting_mark),
+                "games": min(games_per_unit, games - start),
+                "seed": None if seed is None else seed * 1_000_003 + index,
+            }
+            index += 1
+
+def run_unit(unit: dict) -> list:
+    """Run a work unit and return its compact result: a list of the fields of every
+    PositionAnalysis for an analysis unit, or the games won by X, won by O and tied for a
+    match unit. The players of a match draw from a random generator of their own, seeded
+    with the seed of the unit, so the random module of the process is left alone.
+
+    Args:
+        unit (dict): Work unit, from analysis_units or tournament_units.
+
+    Raises:
+        ValueError: Exception when the kind of the unit is unknown.
+
+    Returns:
+        list: Result of the unit, serializable as JSON.
+    """
+    if unit["kind"] == "analyze":
+        return [list(result) for result in analyze_chunk(unit["lines"])]
+    if unit["kind"] == "match":
+        player_x = COMPUTER_PLAYER_CLASSES[unit["player_x"]](Mark("X"), delay_seconds=0)
+        player_o = COMPUTER_PLAYER_CLASSES[unit["player_o"]](Mark("O"), delay_seconds=0)
+        player_x.rng = player_o.rng = random.Random(unit["seed"])
+        engine = TicTacToe(player_x, player_o, low_memory=True)
+        counts = Counter()
+        for _ in range(unit["games"]):
+            for event in engine.events(Mark(unit["starting_mark"])):
+                if event.result:
+                    counts[event.result] += 1
+        return [counts[result] for result in MATCH_RESULTS]
+    raise ValueError(f"Unknown unit kind {unit['kind']!r}")
+
+def run_worker(host: str, port: int, connect_timeout: float = 10.0) -> int:
+    """Pull and run units from a coordinator until the work is done or the coordinator is
+    gone. Connecting is retried until the timeout, so workers can be started before the
+    coordinator.
+
+    Args:
+        host (str): Host of the coordinator.
+        port (int): Port of the coordinator.
+        connect_timeout (float, optional): Seconds to keep trying to connect. Defaults to
+            10.0.
+
+    Raises:
+        OSError: Exception when the coordinator can not be reached.
+
+    Returns:
+        int: Number of units run.
+    """
+    deadline = time.monotonic() + connect_timeout
+    while True:
+        try:
+            connection = socket.create_connection((host, port))
+            break
+        except OSError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.1)
+    connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    units_run = 0
+    with connection, connection.makefile("rwb") as stream:
+        try:
+            _send(stream, {"type": "pull"})
+            for line in stream:
+                message = json.loads(line)
+                if message["type"] == "done":
+                    break
+                if message["type"] == "wait":
+                    time.sleep(message["seconds"])
+                    _send(stream, {"type": "pull"})
+                    continue
+                try:
+                    result = run_unit(message["unit"])
+                # Any failure of a unit is sent back, so the coordinator retries it elsewhere.
+                except Exception as ex:  # pylint: disable=broad-exception-caught
+                    _send(stream, {"type": "error", "id": message["id"], "error": repr(ex)})
+                    continue
+                _send(stream, {"type": "result", "id": message["id"], "result": result})
+                units_run += 1
+        except ConnectionError:
+            pass
+    return units_run
+
+def analysis_results(results: Iterable[tuple[dict, list]]) -> Iterator[PositionAnalysis]:
+    """Return the analyses of the results of analysis units.
+
+    Args:
+        results (Iterable[tuple[dict, list]]): Units and results, from Coordinator.results.
+
+    Yields:
+        Iterator[PositionAnalysis]: Result of every position, in input order.
+    """
+    for _, result in results:
+        for fields in result:
+            yield PositionAnalysis(*fields)
+
+def aggregate_tournament(
+    results: Iterable[tuple[dict, list]]
+) -> dict[tuple[str, str], dict[str, int]]:
+    """Return the number of games won by X, won by O and tied for every pair of players.
+
+    Args:
+        results (Iterable[tuple[dict, list]]): Units and results, from Coordinator.results.
+
+    Returns:
+        dict[tuple[str, str], dict[str, int]]: Counts by result, by player of X and player
+            of O.
+    """
+    totals: dict[tuple[str, str], dict[str, int]] = {}
+    for unit, result in results:
+        counts = totals.setdefault(
+            (unit["player_x"], unit["player_o"]), dict.fromkeys(MATCH_RESULTS, 0)
+        )
+        for name, count in zip(MATCH_RESULTS, result):
+            counts[name] += count
+    return totals
+
+def _send(stream: BinaryIO, message: dict) -> None:
+    """Write a message as a line of JSON and flush it.
+
+    Args:
+        stream (BinaryIO): Stream of the connection.
+        message (dict): Message.
+    """
+    stream.write(json.dumps(message).encode() + b"\n")
+    stream.flush()
@@ -1,6 +1,9 @@
 """Provide the class that handles the game.
 
-This module allows the game to run. It is the game engine.
+This module allows the game to run. It is the game engine. A game can be played to the end with
+`play`, which renders every state, or consumed lazily as a stream of events with `events`, so
+callers can drive, pause or stop the game, or filter and aggregate many games, without a
+renderer.
 
 Examples:
 
@@ -8,23 +11,129 @@ Examples:
     >>> player2 = RandomComputerPlayer(Mark("O"))
     >>> TicTacToe(player1, player2, ConsoleRenderer()).play()
 
-The module contains the following class:
+    >>> game = TicTacToe(RandomComputerPlayer(Mark("X"), 0), RandomComputerPlayer(Mark("O"), 0))
+    >>> for event in game.events():
+            print(event.kind, event.move and event.move.cell_index, event.result)
+    start None None
+    move 4 None
+    ...
+    move 2 X
+
+Games can be played with time controls. Each player then has a chess clock, with a base time
+and an increment added after each move, and a player who does not move before their time runs
+out loses on time, so a slow computer player or an idle human can not hold a game forever. The
+player is then told to stop, and the engine waits for their search or their read of the console
+to end, so no thread outlives the game.
+
+    >>> game = TicTacToe(player1, player2, time_control=TimeControl(30, 1))
+    >>> [event.clock for event in game.events()][-1]
+    {'X': 30.7312, 'O': 30.9944}
+
+Long-running processes can play in low memory mode. The possible moves cached on each state
+are dropped once the player moved, and events carry a `CompactMove`, which holds the codes of
+the states, instead of a `Move`, which would keep the previous state and every state searched
+from it alive. Only the current state is then held between moves, so memory stays flat however
+many games are played.
+
+    >>> game = TicTacToe(player1, player2, low_memory=True)
+
+The module contains the following classes:
+- `EventKind` - Kinds of events of a game.
+- `GameEvent` - Something that happened during a game.
 - `TicTacToe`
 
 """
+import enum
+import threading
+import time
 from dataclasses import dataclass
-from typing import Callable, TypeAlias
+from typing import Any, Callable, Iterator, TypeAlias
 
+from backend.logic.encoding import CompactMove
 from backend.logic.exceptions import InvalidMove
-from backend.logic.models import GameState, Grid, Mark
+from backend.logic.models import GameState, Grid, Mark, Move
+from backend.logic.rules import STANDARD_RULES, RuleSet
 from backend.logic.validators import validate_players
 
+from .clock import ChessClock, TimeControl
 from .players import Player
 from .renderers import Renderer
 
 ErrorHandler: TypeAlias = Callable[[Exception], None]
 
 
+class EventKind(enum.StrEnum):
+    """A class that handles the kinds of events of a game. Extends enum.StrEnum class. It can be
+    START, MOVE, INVALID_MOVE or FLAG_FALL.
+    """
+    START = "start"
+    MOVE = "move"
+    INVALID_MOVE = "invalid_move"
+    FLAG_FALL = "flag_fall"
+
+
+@dataclass(frozen=True, slots=True)
+class GameEvent:
+    """An inmutable data class that is strictly a data transfer object (DTO) whose main purpose
+    is to carry data about something that happened during a game.
+
+    Attributes:
+        kind: EventKind
+            What happened: the game started, a move was played, a move was rejected or the
+            time of the player ran out.
+        game_state: GameState
+            Game state after the event.
+        move: Move | CompactMove | None = None
+            The move played, for MOVE events, a CompactMove in low memory mode.
+        player: Player | None = None
+            The player who moved or tried to move.
+        seconds: float = 0.0
+            Time taken by the player to choose the move.
+        error: InvalidMove | None = None
+            Reason why the move was rejected, for INVALID_MOVE events.
+        clock: dict[str, float] | None = None
+            Time left of every player after the event, None without time controls.
+
+    Methods:
+        position_id(self) -> int | None:
+            Zobrist hash of the game state, a stable id of the position.
+        result(self) -> str | None:
+            Mark of the winner, "tie", or None while the game is not over.
+    """
+    kind: EventKind
+    game_state: GameState
+    move: Move | CompactMove | None = None
+    player: Player | None = None
+    seconds: float = 0.0
+    error: InvalidMove | None = None
+    clock: dict[str, float] | None = None
+
+    @property
+    def position_id(self) -> int | None:
+        """Zobrist hash of the game state, a stable id of the position.
+
+        Returns:
+            int | None: 64-bit hash.
+        """
+        return self.game_state.zobrist_hash
+
+    @property
+    def result(self) -> str | None:
+        """Mark of the winner, "tie", or None while the game is not over. The opponent of
+        a player whose time ran out wins.
+
+        Returns:
+            str | None: X, O, tie or None.
+        """
+        if self.kind is EventKind.FLAG_FALL:
+            return self.player.mark.other
+        if self.game_state.winner:
+            return self.game_state.winner
+        if self.game_state.tie:
+            return "tie"
+        return None
+
+
 @dataclass(frozen=True)
 class TicTacToe:
     """A class used to represebt the game engine.
@@ -34,44 +143,175 @@ class TicTacToe:
             An instance of subclass of the Player class that represents a human or computer.
         player2: Player
             An instance of subclass of the Player class that represents a human or computer.
-        renderer: Renderer
-            An instance of subclass of the Renderer class that handles UI rendering.
+        renderer: Renderer | None = None
+            An instance of subclass of the Renderer class that handles UI rendering. Nothing is
+            rendered when it is None.
         error_handler: ErrorHandler | None = None
             A placehholder for a callback function that handles InvalidMove exceptions.
+        rules: RuleSet = STANDARD_RULES
+            Rules of the games started from an empty classic Grid.
+        time_control: TimeControl | None = None
+            Base time and increment of every player, None to play without clocks.
+        low_memory: bool = False
+            Rather to drop the cached moves of every state played and to carry compact moves
+            in the events, for long-running processes.
 
     Methods:
-        play(self, starting_mark: Mark = Mark("X")) -> None:
+        play(self, starting_mark: Mark = Mark("X"), game_state: GameState | None = None) -> None:
             Handles the flow of the game. The engine itself
+        events(
+            self, starting_mark: Mark = Mark("X"), game_state: GameState | None = None
+        ) -> Iterator[GameEvent]:
+            Play the game lazily, yielding an event for the start and for every move.
         def get_current_player(self, game_state: GameState) -> Player:
             Determines current player base on the current game state
     """
 
     player1: Player
     player2: Player
-    renderer: Renderer
+    renderer: Renderer | None = None
     error_handler: ErrorHandler | None = None
+    rules: RuleSet = STANDARD_RULES
+    time_control: TimeControl | None = None
+    low_memory: bool = False
 
     def __post_init__(self):
         """Post instantiation hook that verifies that the player instantiation was corrected"""
         validate_players(self.player1, self.player2)
 
-    def play(self, starting_mark: Mark = Mark("X")) -> None:
+    def play(
+        self, starting_mark: Mark = Mark("X"), game_state: GameState | None = None
+    ) -> None:
         """Starts and handles the game until the game is over
 
         Args:
             starting_mark (Mark, optional): Initial Mark. Defaults to Mark("X").
+            game_state (GameState | None, optional): Initial state, for instance the empty
+                board of another variant. Defaults to an empty classic Grid with the rules
+                of the engine.
+        """
+        for event in self.events(starting_mark, game_state):
+            if event.error and self.error_handler:
+                self.error_handler(event.error)
+            if self.renderer:
+                self.renderer.render(event.game_state)
+                if event.clock is not None:
+                    flagged = event.player.mark if event.kind is EventKind.FLAG_FALL else None
+                    self.renderer.render_clock(event.clock, flagged)
+
+    def events(
+        self, starting_mark: Mark = Mark("X"), game_state: GameState | None = None
+    ) -> Iterator[GameEvent]:
+        """Play the game lazily, yielding an event for the start, for every move played and for
+        every move rejected. The next move is only asked for when the next event is requested,
+        so the caller can pause the game by not iterating and stop it by closing the iterator.
+
+        Args:
+            starting_mark (Mark, optional): Initial Mark. Defaults to Mark("X").
+            game_state (GameState | None, optional): Initial state, for instance the empty
+                board of another variant. Defaults to an empty classic Grid with the rules
+                of the engine.
+
+        Yields:
+            Iterator[GameEvent]: Events of the game, the last one with a game over state.
         """
-        game_state = GameState(Grid(), starting_mark)
-        while True:
-            self.renderer.render(game_state)
-            if game_state.game_over:
-                break
+        if game_state is None:
+            game_state = GameState(Grid(), starting_mark, self.rules)
+        clock = None if self.time_control is None else ChessClock(self.time_control)
+        yield GameEvent(EventKind.START, game_state, clock=clock and clock.snapshot())
+        while not game_state.game_over:
             player = self.get_current_player(game_state)
+            started = time.perf_counter()
             try:
-                game_state = player.make_move(game_state)
+                if clock is None:
+                    move = player.select_move(game_state)
+                else:
+                    move = self._select_move_on_clock(player, game_state, clock)
             except InvalidMove as ex:
-                if self.error_handler:
-                    self.error_handler(ex)
+                kind = EventKind.INVALID_MOVE
+                if clock is not None and clock.flagged:
+                    kind = EventKind.FLAG_FALL
+                yield GameEvent(
+                    kind,
+                    game_state,
+                    player=player,
+                    seconds=time.perf_counter() - started,
+                    error=ex,
+                    clock=clock and clock.snapshot(),
+                )
+                if kind is EventKind.FLAG_FALL:
+                    return
+                continue
+            if move is None:
+                yield GameEvent(
+                    EventKind.FLAG_FALL,
+                    game_state,
+                    player=player,
+                    seconds=time.perf_counter() - started,
+                    clock=clock.snapshot(),
+                )
+                return
+            game_state = move.after_state
+            if self.low_memory:
+                move.before_state.release_moves()
+                if isinstance(move, Move):
+                    move = CompactMove.from_move(move)
+            yield GameEvent(
+                EventKind.MOVE,
+                game_state,
+                move=move,
+                player=player,
+                seconds=time.perf_counter() - started,
+                clock=clock and clock.snapshot(),
+            )
+
+    def _select_move_on_clock(
+        self, player: Player, game_state: GameState, clock: ChessClock
+    ) -> Move | None:
+        """Return the move of a player, waiting no longer than the time left on their clock.
+        The player is told the time left and chooses the move in a daemon thread. When the
+        time runs out the move is cancelled and the thread is joined, so the search or the
+        read of the console stops with the game.
+
+        Args:
+            player (Player): Player to move.
+            game_state (GameState): current GameState, consisting of a current Grid (9 elemets
+                that that can be X, O or spaces) and a starting Mark (default X).
+            clock (ChessClock): Clock of the game, stopped when the move is chosen.
+
+        Raises:
+            InvalidMove: Exception when a invalid move is selected, even after the time ran
+                out.
+
+        Returns:
+            Move | None: The move played, None when the time ran out.
+        """
+        player.set_time_left(clock.time_left(player.mark), self.time_control.increment_seconds)
+        outcome: dict[str, Any] = {}
+        cancelled = threading.Event()
+
+        def select() -> None:
+            try:
+                outcome["move"] = player.select_move(game_state, cancelled)
+            # Anything raised by the player, even an interrupt, is raised again by the engine.
+            except BaseException as ex:  # pylint: disable=broad-exception-caught
+                outcome["error"] = ex
+
+        thread = threading.Thread(target=select, daemon=True)
+        clock.start(player.mark)
+        thread.start()
+        thread.join(clock.time_left(player.mark))
+        if thread.is_alive():
+            clock.stop()
+            clock.flagged = player.mark
+            cancelled.set()
+            thread.join()
+            return None
+        played = "move" in outcome
+        clock.stop(increment=played)
+        if not played:
+            raise outcome["error"]
+        return None if clock.flagged else outcome["move"]
 
     def get_current_player(self, game_state: GameState) -> Player:
         """Determines current player base on the current game state
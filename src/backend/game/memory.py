@@ -0,0 +1,237 @@
+"""Provide a report of the memory used by games, measured with tracemalloc.
+
+This module allows the memory footprint of long-running processes to be checked. Games
+between two players are played one after the other while tracemalloc traces the allocations
+of the process. The report gives the bytes of a game state and of a move, the peak of every
+game above the memory held before it, and the memory held above the start at regular
+checkpoints, which stays flat when nothing is leaked from game to game. Tracing slows the
+games down several times, so reports are meant for a few thousand games.
+
+Examples:
+
+    >>> from backend.game.memory import measure_games
+    >>> engine = TicTacToe(
+            RandomComputerPlayer(Mark("X"), 0), RandomComputerPlayer(Mark("O"), 0),
+            low_memory=True,
+        )
+    >>> report = measure_games(engine, 10_000)
+    >>> report.bytes_per_state, report.bytes_per_move, report.max_peak_bytes
+    (378.7, 175.3, 7086)
+
+The module contains the following class:
+- `MemoryReport` - A inmutable data class with the memory used by games.
+
+The module contains the following functions:
+- `bytes_per_state(count: int = 2000) -> float` - Return the bytes held by a game state.
+- `bytes_per_move(compact: bool = False, count: int = 2000) -> float` - Return the bytes
+    kept alive by a move.
+- `measure_games(
+    engine: TicTacToe, games: int, *, starting_mark: Mark = Mark("X"), checkpoints: int = 10
+    ) -> MemoryReport` - Play games while tracing memory and return the report.
+"""
+
+import gc
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import cache
+from typing import Any, Callable, Iterator
+
+from backend.logic.encoding import CompactMove
+from backend.logic.graph import StateGraph
+from backend.logic.models import GameState, Grid, Mark, Move
+
+from .engine import TicTacToe
+
+@dataclass(frozen=True)
+class MemoryReport:
+    """An inmutable data class that is strictly a data transfer object (DTO) whose main purpose
+    is to carry the memory used by games. Sizes are in bytes.
+
+    Attributes:
+        games: int
+            Number of games played.
+        low_memory: bool
+            Rather the games were played in low memory mode.
+        bytes_per_state: float
+            Memory held by a game state with its grid and cached properties.
+        bytes_per_move: float
+            Memory kept alive by a move of the events: a Move with the states it refers to,
+            or a CompactMove in low memory mode.
+        max_peak_bytes: int
+            Highest peak of a game above the memory held before it.
+        mean_peak_bytes: float
+            Mean peak of the games above the memory held before them.
+        held_bytes: tuple[int, ...]
+            Memory held above the start after every checkpoint of the games.
+    """
+    games: int
+    low_memory: bool
+    bytes_per_state: float
+    bytes_per_move: float
+    max_peak_bytes: int
+    mean_peak_bytes: float
+    held_bytes: tuple[int, ...]
+
+def bytes_per_state(count: int = 2000) -> float:
+    """Return the bytes held by a game state of the classic game, with its grid and the cached
+    properties read by the engine, measured over reachable positions.
+
+    Args:
+        count (int, optional): Game states measured. Defaults to 2000.
+
+    Returns:
+        float: Mean bytes per game state.
+    """
+    nodes = _ongoing_nodes()
+
+    def build(index: int) -> GameState:
+        game_state = GameState(Grid(_graph().cells(nodes[index % len(nodes)])))
+        _ = game_state.game_over, game_state.current_mark
+        return game_state
+
+    return _traced_bytes(build, count)
+
+def bytes_per_move(compact: bool = False, count: int = 2000) -> float:
+    """Return the bytes kept alive by a move of the classic game, chosen among the possible
+    moves of a position as players choose them. A Move keeps its states alive, and the state
+    before it keeps every possible move and the state after each of them, while a CompactMove
+    only keeps integers.
+
+    Args:
+        compact (bool, optional): Rather to measure a CompactMove instead of a Move. Defaults
+            to False.
+        count (int, optional): Moves measured. Defaults to 2000.
+
+    Returns:
+        float: Mean bytes per move.
+    """
+    nodes = _ongoing_nodes()
+
+    def build(index: int) -> Move | CompactMove:
+        game_state = GameState(Grid(_graph().cells(nodes[index % len(nodes)])))
+        move = game_state.possible_moves[0]
+        return CompactMove.from_move(move) if compact else move
+
+    return _traced_bytes(build, count)
+
+def measure_games(
+    engine: TicTacToe, games: int, *, starting_mark: Mark = Mark("X"), checkpoints: int = 10
+) -> MemoryReport:
+    """Play games of an engine one after the other while tracing memory and return the
+    report. Memory held by caches filled on the first games, like the search cache of the
+    minimax players, shows as growth at the first checkpoints only.
+
+    Args:
+        engine (TicTacToe): Engine of the games, with its players and its memory mode.
+        games (int): Number of games.
+        starting_mark (Mark, optional): Starting mark of every game. Defaults to Mark("X").
+        checkpoints (int, optional): Times the memory held is recorded. Defaults to 10.
+
+    Returns:
+        MemoryReport: Sizes of the objects, peaks of the games and memory held.
+    """
+    state_bytes = bytes_per_state()
+    move_bytes = bytes_per_move(compact=engine.low_memory)
+    max_peak, total_peak, held = _trace_games(
+        engine, games, starting_mark, min(checkpoints, games)
+    )
+    return MemoryReport(
+        games,
+        engine.low_memory,
+        round(state_bytes, 1),
+        round(move_bytes, 1),
+        max_peak,
+        round(total_peak / games, 1) if games else 0.0,
+        held,
+    )
+
+def _trace_games(
+    engine: TicTacToe, games: int, starting_mark: Mark, checkpoints: int
+) -> tuple[int, int, tuple[int, ...]]:
+    """Play games one after the other while tracing memory. The bookkeeping is allocated
+    before tracing starts, so it is not counted.
+
+    Args:
+        engine (TicTacToe): Engine of the games.
+        games (int): Number of games.
+        starting_mark (Mark): Starting mark of every game.
+        checkpoints (int): Times the memory held is recorded, at most the number of games.
+
+    Returns:
+        tuple[int, int, tuple[int, ...]]: Highest peak of a game, sum of the peaks of the
+            games and memory held above the start after every checkpoint.
+    """
+    max_peak = total_peak = 0
+    held = [0] * checkpoints
+    ends = {
+        games * (checkpoint + 1) // checkpoints: checkpoint for checkpoint in range(checkpoints)
+    }
+    with _tracing():
+        gc.collect()
+        start = tracemalloc.get_traced_memory()[0]
+        for game in range(games):
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            deque(engine.events(starting_mark), maxlen=0)
+            peak = tracemalloc.get_traced_memory()[1] - before
+            max_peak = max(max_peak, peak)
+            total_peak += peak
+            if game + 1 in ends:
+                gc.collect()
+                held[ends[game + 1]] = tracemalloc.get_traced_memory()[0] - start
+    return max_peak, total_peak, tuple(held)
+
+def _traced_bytes(build: Callable[[int], Any], count: int) -> float:
+    """Return the mean bytes held by objects, traced while they are built and kept alive.
+
+    Args:
+        build (Callable[[int], Any]): Function building the object of an index.
+        count (int): Objects built.
+
+    Returns:
+        float: Mean bytes per object, the list holding them excluded.
+    """
+    objects: list[Any] = [None] * count
+    with _tracing():
+        gc.collect()
+        before = tracemalloc.get_traced_memory()[0]
+        for index in range(count):
+            objects[index] = build(index)
+        held = tracemalloc.get_traced_memory()[0] - before
+    return held / count
+
+@contextmanager
+def _tracing() -> Iterator[None]:
+    """Trace memory allocations, unless tracemalloc already traces them.
+
+    Yields:
+        Iterator[None]: Nothing, allocations are traced inside the block.
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        yield
+    finally:
+        if started:
+            tracemalloc.stop()
+
+@cache
+def _graph() -> StateGraph:
+    """Return the graph of the positions measured, built the first time only.
+
+    Returns:
+        StateGraph: Graph of the games started by X with the standard rules.
+    """
+    return StateGraph()
+
+@cache
+def _ongoing_nodes() -> tuple[int, ...]:
+    """Return the nodes of the positions where the game is not over.
+
+    Returns:
+        tuple[int, ...]: Ids of the nodes in the graph.
+    """
+    return tuple(node for node, terminal in enumerate(_graph().terminal) if not terminal)
@@ -12,13 +12,27 @@ The module contains the following class:
 - `ComputerPlayer` - ABC. Extension of class Player.
 - `RandomComputerPlayer` - Extension of class ComputerPlayer.
 - `MinimaxComputerPlayer` - ABC. Extension of class ComputerPlayer.
+- `UltimateComputerPlayer` - Extension of class ComputerPlayer.
+- `QubicComputerPlayer` - Extension of class ComputerPlayer.
+
+The module contains the following constant:
+- `MOVES_TO_GO` - Moves a computer player expects to play when it sizes its time.
 """
 import abc
+import random
+import threading
 import time
 
+from backend.logic.book import book_move
+from backend.logic.cache import SHARED_SEARCH_CACHE, SearchCache
 from backend.logic.exceptions import InvalidMove
-from backend.logic.minimax import find_best_move
+from backend.logic.minimax import find_best_move, find_qubic_move, find_ultimate_move
 from backend.logic.models import GameState, Mark, Move
+from backend.logic.qubic import QubicGameState, QubicMove
+from backend.logic.rules import STANDARD_RULES
+from backend.logic.ultimate import UltimateGameState, UltimateMove
+
+MOVES_TO_GO = 10
 
 class Player(metaclass=abc.ABCMeta):
     """Abstract class for the creation of players. Extends as metaclass, abc.ABCMeta.
@@ -26,10 +40,19 @@ class Player(metaclass=abc.ABCMeta):
     Attributes:
         mark: Mark
             An instance of Mark class that handles user marks.
+        move_cancelled: threading.Event | None
+            Event set when the player must stop choosing the move, None outside select_move
+            or in games without time controls.
 
     Methods:
         make_move(self, game_state: GameState) -> GameState:
             Handles the current player move.
+        select_move(
+            self, game_state: GameState, cancelled: threading.Event | None = None
+            ) -> Move:
+            Return the current player move, checking that it is the player's turn.
+        set_time_left(self, seconds: float, increment_seconds: float = 0.0) -> None:
+            Receive the time left on the clock before choosing a move.
         get_move(self, game_state: GameState) -> Move | None:
             Determines current player base on the current game state. Abstract method.
     """
@@ -39,6 +62,7 @@ class Player(metaclass=abc.ABCMeta):
             mark (Mark): An instance class that handles user marks.
         """
         self.mark = mark
+        self.move_cancelled: threading.Event | None = None
 
     def make_move(self, game_state: GameState) -> GameState:
         """Handles the current player move which depends on the get_move method
@@ -54,12 +78,47 @@ class Player(metaclass=abc.ABCMeta):
             GameState: current GameState, consisting of a current Grid (9 elemets that
             that can be X, O or spaces) and a starting Mark (default X).
         """
+        return self.select_move(game_state).after_state
+
+    def select_move(
+        self, game_state: GameState, cancelled: threading.Event | None = None
+    ) -> Move:
+        """Return the current player move, which depends on the get_move method implemented in
+        each subclass, if it's the given player's turn and whether the move exists. While the
+        move is chosen the event is available as move_cancelled, so the player can stop
+        waiting or searching once it is set and return no move.
+
+        Args:
+            game_state (GameState): current GameState, consisting of a current Grid (9 elemets that
+                that can be X, O or spaces) and a starting Mark (default X).
+            cancelled (threading.Event | None, optional): Event set when the player must stop
+                choosing the move, for instance when their time ran out. Defaults to None.
+
+        Raises:
+            InvalidMove: Exception when a invalid move is selected
+        Returns:
+            Move: The move played, with the states before and after it.
+        """
         if self.mark is game_state.current_mark:
-            if move := self.get_move(game_state):
-                return move.after_state
+            self.move_cancelled = cancelled
+            try:
+                move = self.get_move(game_state)
+            finally:
+                self.move_cancelled = None
+            if move:
+                return move
             raise InvalidMove("No more possible moves")
         raise InvalidMove("It's the other player's turn")
 
+    def set_time_left(self, seconds: float, increment_seconds: float = 0.0) -> None:
+        """Receive the time left on the clock before choosing a move, in games played with
+        time controls. Players that do not manage their time ignore it.
+
+        Args:
+            seconds (float): Time left on the clock of the player.
+            increment_seconds (float, optional): Time added after the move. Defaults to 0.0.
+        """
+
     @abc.abstractmethod
     def get_move(self, game_state: GameState) -> Move | None:
         """Return the current player's move in the given game state."""
@@ -72,8 +131,18 @@ class ComputerPlayer(Player, metaclass=abc.ABCMeta):
     Attributes:
         mark: Mark
             An instance of Mark class that handles user marks
+        time_left: float | None
+            Time left on the clock, None in games without time controls.
+        increment_seconds: float
+            Time added to the clock after each move.
+        rng: random.Random | None
+            Random generator of the moves, None for the random module.
 
     Methods:
+        set_time_left(self, seconds: float, increment_seconds: float = 0.0) -> None:
+            Receive the time left on the clock before choosing a move.
+        move_time(self, limit: float | None) -> float | None:
+            Return the time the player can spend on the move.
         get_move(self, game_state: GameState) -> Move | None:
             Return the current computer player's move in the given game state
         get_computer_move(self, game_state: GameState) -> Move | None:
@@ -88,6 +157,39 @@ class ComputerPlayer(Player, metaclass=abc.ABCMeta):
         """
         super().__init__(mark)
         self.delay_seconds = delay_seconds
+        self.time_left: float | None = None
+        self.increment_seconds = 0.0
+        self.rng: random.Random | None = None
+
+    def set_time_left(self, seconds: float, increment_seconds: float = 0.0) -> None:
+        """Receive the time left on the clock before choosing a move, so the delay and the
+        search can be sized to it.
+
+        Args:
+            seconds (float): Time left on the clock of the player.
+            increment_seconds (float, optional): Time added after the move. Defaults to 0.0.
+        """
+        self.time_left = seconds
+        self.increment_seconds = increment_seconds
+
+    def move_time(self, limit: float | None) -> float | None:
+        """Return the time the player can spend on the move: a share of the time left,
+        assuming MOVES_TO_GO moves remain, plus the increment, and never more than a quarter of
+        the time left.
+
+        Args:
+            limit (float | None): Time the player would spend without a clock, None for no
+                limit.
+
+        Returns:
+            float | None: Seconds for the move, the limit when the game has no clock.
+        """
+        if self.time_left is None:
+            return limit
+        budget = min(
+            self.time_left / 4, self.time_left / MOVES_TO_GO + self.increment_seconds
+        )
+        return budget if limit is None else min(limit, budget)
 
     def get_move(self, game_state: GameState) -> Move | None:
         """Return the current computer player's move in the given game state
@@ -97,9 +199,13 @@ class ComputerPlayer(Player, metaclass=abc.ABCMeta):
                 that can be X, O or spaces) and a starting Mark (default X).
 
         Returns:
-            Move | None: return a move class or none
+            Move | None: return a move class or none, none when cancelled during the delay
         """
-        time.sleep(self.delay_seconds)
+        delay = self.move_time(self.delay_seconds)
+        if self.move_cancelled is None:
+            time.sleep(delay)
+        elif self.move_cancelled.wait(delay):
+            return None
         return self.get_computer_move(game_state)
 
     @abc.abstractmethod
@@ -124,16 +230,62 @@ class RandomComputerPlayer(ComputerPlayer):
         Returns:
             Move | None: return a move class or none
         """
-        return game_state.make_random_move()
+        return game_state.make_random_move(self.rng)
 
 class MinimaxComputerPlayer(ComputerPlayer):
     """A class for the creation of computer players with move based on minimax algorithm.
     Extends ComputerPlayer, an abstract class for the creation of computer players.
 
+    When pondering is enabled, the player searches the replies to every possible opponent
+    move in a background thread while the opponent is thinking, so the reply to the move
+    actually played is ready immediately. Only the index of each reply is kept, at most one
+    per empty cell, so the memory used by pondering is bounded.
+
+    Solved positions are stored in a search cache, by default the one shared by every
+    computer player of the process, so positions reached in any game are answered without
+    searching again. The first plies are played from the opening book, which picks at random
+    among equally good moves.
+
+    Attributes:
+        ponder: bool
+            Rather the player searches during the opponent's turn.
+        opening_book: bool
+            Rather the player uses the opening book for the first plies.
+        cache: SearchCache | None
+            Cache of solved positions, None to search from scratch every time.
+
     Methods:
         get_computer_move(self, game_state: GameState) -> Move | None:
             Return the current computer player's move in the given game state.
+        cancel_pondering(self) -> None:
+            Stop the background search and discard its results.
     """
+    def __init__(
+        self,
+        mark: Mark,
+        delay_seconds: float = 0.25,
+        ponder: bool = False,
+        cache: SearchCache | None = SHARED_SEARCH_CACHE,
+        opening_book: bool = True,
+    ) -> None:
+        """
+        Args:
+            mark (Mark): An instance class that handles user marks
+            delay_seconds (float, optional): Represents the delay time for the computer
+                to player. Defaults to 0.25.
+            ponder (bool, optional): Search during the opponent's turn. Defaults to False.
+            cache (SearchCache | None, optional): Cache of solved positions. Defaults to
+                the search cache shared by the whole process.
+            opening_book (bool, optional): Use the opening book. Defaults to True.
+        """
+        super().__init__(mark, delay_seconds)
+        self.ponder = ponder
+        self.cache = cache
+        self.opening_book = opening_book
+        self._ponder_thread: threading.Thread | None = None
+        self._ponder_cancelled = threading.Event()
+        self._ponder_replies: dict[int, int] = {}
+
     def get_computer_move(self, game_state: GameState) -> Move | None:
         """Return the current computer player's move in the given game state using
         minimax algorithm.
@@ -145,6 +297,172 @@ class MinimaxComputerPlayer(ComputerPlayer):
         Returns:
             Move | None: return a move class or none.
         """
-        if game_state.game_not_started:
-            return game_state.make_random_move()
-        return find_best_move(game_state)
+        pondered_code = self._stop_pondering().get(game_state.zobrist_hash)
+        move = book_move(game_state, self.rng) if self.opening_book else None
+        if move is None:
+            if game_state.game_not_started and game_state.rules == STANDARD_RULES:
+                move = game_state.make_random_move(self.rng)
+            elif pondered_code is not None:
+                move = game_state.move_from_code(pondered_code)
+            else:
+                move = find_best_move(game_state, self.cache)
+        if self.ponder and move and not move.after_state.game_over:
+            self._start_pondering(move.after_state)
+        return move
+
+    def cancel_pondering(self) -> None:
+        """Stop the background search and discard its results."""
+        self._stop_pondering()
+
+    def _stop_pondering(self) -> dict[int, int]:
+        """Stop the background search. The search in progress, if any, finishes before the
+        thread exits.
+
+        Returns:
+            dict[int, int]: Code of the best reply by Zobrist hash of the pondered state.
+        """
+        self._ponder_cancelled.set()
+        if self._ponder_thread is not None:
+            self._ponder_thread.join()
+            self._ponder_thread = None
+        replies, self._ponder_replies = self._ponder_replies, {}
+        return replies
+
+    def _start_pondering(self, game_state: GameState) -> None:
+        """Start searching the replies to every opponent move in a background thread.
+
+        Args:
+            game_state (GameState): State the opponent has to move from.
+        """
+        self._ponder_cancelled = threading.Event()
+        self._ponder_thread = threading.Thread(
+            target=self._ponder,
+            args=(game_state, self._ponder_cancelled),
+            daemon=True,
+        )
+        self._ponder_thread.start()
+
+    def _ponder(self, game_state: GameState, cancelled: threading.Event) -> None:
+        """Search the best reply to every opponent move until cancelled. Moves are built
+        from the cells directly, instead of game_state.possible_moves, so the searched
+        subtrees are not cached on the live game state and are freed after each search.
+
+        Args:
+            game_state (GameState): State the opponent has to move from.
+            cancelled (threading.Event): Event set when pondering must stop.
+        """
+        marks = (game_state.current_mark,)
+        if game_state.rules.wild:
+            marks = (game_state.current_mark, game_state.current_mark.other)
+        for index, cell in enumerate(game_state.grid.cells):
+            if cell != " ":
+                continue
+            for mark in marks:
+                if cancelled.is_set():
+                    return
+                opponent_state = game_state.make_move_to(index, mark).after_state
+                if not opponent_state.game_over:
+                    reply = find_best_move(opponent_state, self.cache)
+                    self._ponder_replies[opponent_state.zobrist_hash] = reply.code
+
+class UltimateComputerPlayer(ComputerPlayer):
+    """A class for the creation of computer players of Ultimate Tic Tac Toe, with moves based on
+    a depth and time bounded alpha-beta search. Extends ComputerPlayer, an abstract class for the
+    creation of computer players.
+
+    Attributes:
+        max_depth: int
+            Maximum depth of the search in plies.
+        time_limit: float | None
+            Seconds available for each search, None for no limit. The clock lowers it in
+            games with time controls.
+
+    Methods:
+        get_computer_move(self, game_state: UltimateGameState) -> UltimateMove | None:
+            Return the current computer player's move in the given game state.
+    """
+    def __init__(
+        self,
+        mark: Mark,
+        delay_seconds: float = 0.25,
+        max_depth: int = 8,
+        time_limit: float | None = 1.0,
+    ) -> None:
+        """
+        Args:
+            mark (Mark): An instance class that handles user marks
+            delay_seconds (float, optional): Represents the delay time for the computer
+                to player. Defaults to 0.25.
+            max_depth (int, optional): Maximum depth of the search. Defaults to 8.
+            time_limit (float | None, optional): Seconds available for each search.
+                Defaults to 1.0.
+        """
+        super().__init__(mark, delay_seconds)
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+
+    def get_computer_move(self, game_state: UltimateGameState) -> UltimateMove | None:
+        """Return the current computer player's move in the given game state using a bounded
+        alpha-beta search.
+
+        Args:
+            game_state (UltimateGameState): current UltimateGameState, consisting of a current
+                UltimateGrid, a starting Mark (default X) and the active board.
+
+        Returns:
+            UltimateMove | None: return a move class or none.
+        """
+        return find_ultimate_move(
+            game_state, self.max_depth, self.move_time(self.time_limit), self.move_cancelled
+        )
+
+class QubicComputerPlayer(ComputerPlayer):
+    """A class for the creation of computer players of Qubic, with moves based on threat
+    detection and a depth and time bounded alpha-beta search. Extends ComputerPlayer, an
+    abstract class for the creation of computer players.
+
+    Attributes:
+        max_depth: int
+            Maximum depth of the search in plies.
+        time_limit: float | None
+            Seconds available for each search, None for no limit. The clock lowers it in
+            games with time controls.
+
+    Methods:
+        get_computer_move(self, game_state: QubicGameState) -> QubicMove | None:
+            Return the current computer player's move in the given game state.
+    """
+    def __init__(
+        self,
+        mark: Mark,
+        delay_seconds: float = 0.25,
+        max_depth: int = 4,
+        time_limit: float | None = 1.0,
+    ) -> None:
+        """
+        Args:
+            mark (Mark): An instance class that handles user marks
+            delay_seconds (float, optional): Represents the delay time for the computer
+                to player. Defaults to 0.25.
+            max_depth (int, optional): Maximum depth of the search. Defaults to 4.
+            time_limit (float | None, optional): Seconds available for each search.
+                Defaults to 1.0.
+        """
+        super().__init__(mark, delay_seconds)
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+
+    def get_computer_move(self, game_state: QubicGameState) -> QubicMove | None:
+        """Return the current computer player's move in the given game state using threat
+        detection and a bounded alpha-beta search.
+
+        Args:
+            game_state (QubicGameState): current QubicGameState, consisting of a current
+                QubicGrid and a starting Mark (default X).
+
+        Returns:
+            QubicMove | None: return a move class or none.
+        """
+        return find_qubic_move(
+            game_state, self.max_depth, self.move_time(self.time_limit), self.move_cancelled
+        )
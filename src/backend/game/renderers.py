@@ -7,7 +7,7 @@ The module contains the following class:
 """
 import abc
 
-from backend.logic.models import GameState
+from backend.logic.models import GameState, Mark
 
 class Renderer(metaclass=abc.ABCMeta):
     """Abstract class for the creation of visual and state rendering. Extends as
@@ -16,10 +16,22 @@ class Renderer(metaclass=abc.ABCMeta):
     Methods:
         def render(self, game_state: GameState) -> None:
             Render the current game state.
+        def render_clock(self, clock: dict[str, float], flagged: Mark | None = None) -> None:
+            Render the time left of every player.
     """
     @abc.abstractmethod
     def render(self, game_state: GameState) -> None:
         """Render the current game state."""
 
+    def render_clock(self, clock: dict[str, float], flagged: Mark | None = None) -> None:
+        """Render the time left of every player, after the game state, in games played with
+        time controls. Renderers without a clock render nothing.
+
+        Args:
+            clock (dict[str, float]): Seconds left by mark.
+            flagged (Mark | None, optional): Mark of the player whose time ran out, if any.
+                Defaults to None.
+        """
+
     def placerholder(self) -> None:
         """Render the current game state."""
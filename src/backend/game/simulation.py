@@ -0,0 +1,211 @@
+"""Provide a vectorised simulator of random games of the classic game.
+
+This module allows strategy statistics to be gathered from millions of random games. Instead
+of playing games one at a time through players and game states, every game of a batch is
+advanced in lockstep as NumPy arrays: the cells of each mark are 9-bit integers, the random
+empty cell of every game is read from a table indexed by the occupied cells, and lines are
+checked with the table of the rule set. All the games that are not over have the same number
+of empty cells at a given ply, so a whole ply is a handful of array operations. The games
+follow the same distribution as games between two `RandomComputerPlayer`.
+
+NumPy is an optional dependency, installed with `pip install tic-tac-toe-ldk[simulation]`.
+It is only imported when a simulation runs.
+
+Examples:
+
+    >>> from backend.game.simulation import simulate_random_games
+    >>> stats = simulate_random_games(1_000_000, seed=1)
+    >>> stats.outcomes
+    {'tie': 126711, 'X': 585494, 'O': 287795}
+    >>> round(stats.first_move_win_rates()[4], 2)
+    0.69
+
+The module contains the following class:
+- `SimulationStats` - A inmutable data class with the statistics of simulated games.
+
+The module contains the following function:
+- `simulate_random_games(
+    games: int, starting_mark: Mark = Mark("X"), *, rules: RuleSet = STANDARD_RULES,
+    seed: int | None = None, chunk_size: int = 1048576
+    ) -> SimulationStats` - Play random games in lockstep and return their statistics.
+"""
+
+from dataclasses import dataclass
+from functools import cache
+from typing import Any
+
+from backend.logic.models import Mark
+from backend.logic.rules import STANDARD_RULES, RuleSet
+
+OUTCOMES = ("tie", "X", "O")
+
+@dataclass(frozen=True)
+class SimulationStats:
+    """An inmutable data class that is strictly a data transfer object (DTO) whose main purpose
+    is to carry the statistics of simulated games.
+
+    Attributes:
+        games: int
+            Number of games played.
+        starting_mark: Mark
+            Starting mark of every game.
+        outcomes: dict[str, int]
+            Games tied, won by X and won by O.
+        lengths: tuple[int, ...]
+            Games by number of moves, from 0 to 9 moves.
+        first_moves: tuple[dict[str, int], ...]
+            Outcomes of the games by cell of the first move.
+
+    Methods:
+        first_move_win_rates(self, mark: Mark | None = None) -> tuple[float, ...]:
+            Return the share of games won by a mark for each cell of the first move.
+    """
+    games: int
+    starting_mark: Mark
+    outcomes: dict[str, int]
+    lengths: tuple[int, ...]
+    first_moves: tuple[dict[str, int], ...]
+
+    def first_move_win_rates(self, mark: Mark | None = None) -> tuple[float, ...]:
+        """Return the share of games won by a mark for each cell of the first move.
+
+        Args:
+            mark (Mark | None, optional): Mark of the winner. Defaults to the starting mark.
+
+        Returns:
+            tuple[float, ...]: Win rate of every cell, 0.0 for cells never played first.
+        """
+        if mark is None:
+            mark = self.starting_mark
+        return tuple(
+            counts[mark] / total if (total := sum(counts.values())) else 0.0
+            for counts in self.first_moves
+        )
+
+def simulate_random_games(
+    games: int,
+    starting_mark: Mark = Mark("X"),
+    *,
+    rules: RuleSet = STANDARD_RULES,
+    seed: int | None = None,
+    chunk_size: int = 1 << 20,
+) -> SimulationStats:
+    """Play random games in lockstep and return their statistics. Every move is chosen
+    uniformly among the empty cells and, with wild rules, the mark uniformly among both marks.
+
+    Args:
+        games (int): Number of games.
+        starting_mark (Mark, optional): Starting mark of every game. Defaults to Mark("X").
+        rules (RuleSet, optional): Rules of the games. Defaults to STANDARD_RULES.
+        seed (int | None, optional): Seed of the random generator, for reproducible results.
+            Defaults to None.
+        chunk_size (int, optional): Games held in memory at once. Defaults to 1048576.
+
+    Raises:
+        ImportError: Exception when NumPy is not installed.
+
+    Returns:
+        SimulationStats: Outcomes, lengths and outcomes by first move of the games.
+    """
+    np = _import_numpy()
+    rng = np.random.default_rng(seed)
+    outcomes = np.zeros(3, dtype=np.int64)
+    lengths = np.zeros(10, dtype=np.int64)
+    first_moves = np.zeros(27, dtype=np.int64)
+    for start in range(0, games, chunk_size):
+        outcome, length, first_cell = _play_chunk(
+            rng, min(chunk_size, games - start), starting_mark=starting_mark, rules=rules
+        )
+        outcomes += np.bincount(outcome, minlength=3)
+        lengths += np.bincount(length, minlength=10)
+        first_moves += np.bincount(first_cell * 3 + outcome, minlength=27)
+    return SimulationStats(
+        games,
+        starting_mark,
+        dict(zip(OUTCOMES, outcomes.tolist())),
+        tuple(lengths.tolist()),
+        tuple(dict(zip(OUTCOMES, counts)) for counts in first_moves.reshape(9, 3).tolist()),
+    )
+
+def _play_chunk(
+    rng: Any, size: int, *, starting_mark: Mark, rules: RuleSet
+) -> tuple[Any, Any, Any]:
+    """Play a batch of random games to the end, one ply at a time over the games not over.
+
+    Args:
+        rng (Any): NumPy random generator.
+        size (int): Number of games.
+        starting_mark (Mark): Starting mark of every game.
+        rules (RuleSet): Rules of the games.
+
+    Returns:
+        tuple[Any, Any, Any]: Arrays of the outcome (0 tie, 1 X, 2 O), number of moves and
+            cell of the first move of every game.
+    """
+    # pylint: disable=too-many-locals
+    # Every array of the batch is a local of the loop, which runs once per ply of all games.
+    np = _import_numpy()
+    bits = np.zeros((2, size), dtype=np.int16)
+    outcome, length, first_cell = np.zeros((3, size), dtype=np.int8)
+    length[:] = 9
+    active = np.arange(size)
+    for ply in range(9):
+        mover = (ply + (starting_mark is Mark.NAUGHT)) % 2
+        cells = _empty_cells_table()[
+            bits[0, active] | bits[1, active], rng.integers(0, 9 - ply, active.size)
+        ]
+        if ply == 0:
+            first_cell[:] = cells
+        marks = rng.integers(0, 2, active.size) if rules.wild else mover
+        placed = bits[marks, active] | 1 << cells
+        bits[marks, active] = placed
+        done = _completed_table(rules)[placed]
+        over = active[done]
+        outcome[over] = (mover ^ rules.misere) + 1
+        length[over] = ply + 1
+        active = active[~done]
+    return outcome, length, first_cell
+
+@cache
+def _completed_table(rules: RuleSet) -> Any:
+    """Return the table of the sets of cells that complete a line of some rules.
+
+    Args:
+        rules (RuleSet): Rules of the games.
+
+    Returns:
+        Any: Boolean array of shape (512,), rather each set of cells completes a line.
+    """
+    return _import_numpy().array(rules.completed, dtype=bool)
+
+@cache
+def _empty_cells_table() -> Any:
+    """Return the table of the empty cells of every set of occupied cells.
+
+    Returns:
+        Any: int16 array of shape (512, 9), the k-th empty cell of each set, 0 past the last.
+    """
+    np = _import_numpy()
+    table = np.zeros((1 << 9, 9), dtype=np.int16)
+    for occupied in range(1 << 9):
+        empty = [index for index in range(9) if not occupied >> index & 1]
+        table[occupied, :len(empty)] = empty
+    return table
+
+def _import_numpy() -> Any:
+    """Return the NumPy module, imported on first use.
+
+    Raises:
+        ImportError: Exception when NumPy is not installed.
+
+    Returns:
+        Any: NumPy module.
+    """
+    try:
+        # NumPy is optional, so it is only imported when a simulation runs.
+        import numpy  # pylint: disable=import-outside-toplevel
+    except ImportError as ex:
+        raise ImportError(
+            "The simulator needs NumPy: pip install tic-tac-toe-ldk[simulation]"
+        ) from ex
+    return numpy
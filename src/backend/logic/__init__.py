@@ -2,8 +2,21 @@
 
 Modules exported by this package:
 
+- `analysis`: Provide functions to analyse positions in bulk with the minimax engine.
+- `book`: Provide an opening book for the first plies of the classic game.
+- `cache`: Provide a thread-safe search cache shared by every computer player of the process.
+- `encoding`: Provide a compact integer encoding of the classic game states.
 - `exceptions`: Provide exceptions for that handles the game.
+- `graph`: Provide the precomputed graph of the reachable positions of the classic game.
 - `minimax`: Provide methods to implement basic AI to computer player
 - `validator`: Provide methods to validate game states and grid.
+- `zobrist`: Provide Zobrist hashing for the positions of every variant of the game.
 - `models`: Provide classes for domain models.
+- `position_index`: Provide an index of the reachable positions of the classic game for
+    puzzle and analysis queries.
+- `qubic`: Provide classes for the domain model of Qubic, 3D Tic Tac Toe in a 4x4x4 cube.
+- `rules`: Provide the rule sets of the classic game, compiled into lookup tables.
+- `search_board`: Provide a mutable board of the classic game for searches.
+- `shared_cache`: Provide a search cache in shared memory for the workers of a process pool.
+- `ultimate`: Provide classes for the domain model of Ultimate Tic Tac Toe.
 """
@@ -0,0 +1,182 @@
+"""Provide functions to analyse positions in bulk with the minimax engine.
+
+This module allows large streams of positions to be scored. Every position is given as
+the 9 characters of `Grid.cells` optionally followed by the starting mark, for example
+`"XXO O X O,X"`. Positions are validated, solved with the minimax engine and returned in
+the same order they were read, while the work is split in chunks across a process pool.
+Workers attach to a single search cache in shared memory, so every position solved by one
+worker is known to the others.
+
+Examples:
+
+    >>> from backend.logic.analysis import analyze_lines
+    >>> for result in analyze_lines(["XXO O X O,X", "XXX      "], workers=0):
+            print(result.status, result.best_move, result.value, result.error)
+    ongoing 3 1 None
+    invalid None None Wrong number of Xs and Os
+
+The module contains the following class:
+- `PositionAnalysis(NamedTuple)` - Result of the analysis of a single position.
+
+The module contains the following functions:
+- `parse_position(line: str) -> GameState` - Build a game state from a position line.
+- `attach_worker_cache(name: str) -> None` - Make a pool worker use a shared search cache.
+- `analyze_position(line_number: int, line: str) -> PositionAnalysis` - Analyse a single
+    position line.
+- `analyze_lines(
+    lines: Iterable[str], workers: int | None = None, chunk_size: int = 256
+    )` - Analyse a stream of position lines, preserving their order.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, NamedTuple
+
+from backend.logic.cache import SHARED_SEARCH_CACHE, SearchCache
+from backend.logic.exceptions import InvalidGameState
+from backend.logic.minimax import evaluate_position
+from backend.logic.models import GameState, Grid, Mark
+from backend.logic.shared_cache import SharedSearchCache
+
+_worker_cache: dict[str, SearchCache | SharedSearchCache] = {"cache": SHARED_SEARCH_CACHE}
+
+class PositionAnalysis(NamedTuple):
+    """A class that holds the result of the analysis of a single position. Extends NamedTuple
+
+    Attributes:
+        line: int
+            One-based line number of the position in the input stream.
+        cells: str
+            The 9 cells of the position as read.
+        starting_mark: str | None
+            Starting mark of the position, None if it could not be parsed.
+        to_move: str | None
+            Mark of the player to move.
+        status: str
+            One of "ongoing", "win", "tie" or "invalid".
+        winner: str | None
+            Mark of the winner, if any.
+        best_move: int | None
+            Zero-based index of the best move, None when the game is over.
+        value: int | None
+            Minimax value (1, 0 or -1) from the point of view of the player to move.
+        error: str | None
+            Reason why the position is invalid.
+    """
+    line: int
+    cells: str
+    starting_mark: str | None = None
+    to_move: str | None = None
+    status: str = "invalid"
+    winner: str | None = None
+    best_move: int | None = None
+    value: int | None = None
+    error: str | None = None
+
+def parse_position(line: str) -> GameState:
+    """Build a game state from a position line. The first 9 characters are the cells of the
+    grid, they can be followed by an optional separator (comma, tab or space) and the
+    starting mark, which defaults to X.
+
+    Args:
+        line (str): Position line, without the trailing newline.
+
+    Raises:
+        ValueError: Exception when the grid or the starting mark is malformed.
+        InvalidGameState: Exception that represent a invalidad game state.
+
+    Returns:
+        GameState: Validated game state of the position.
+    """
+    starting_mark = line[9:].strip(" ,\t") or "X"
+    if starting_mark not in ("X", "O"):
+        raise ValueError(f"Invalid starting mark: {starting_mark!r}")
+    return GameState(Grid(line[:9]), Mark(starting_mark))
+
+def analyze_position(line_number: int, line: str) -> PositionAnalysis:
+    """Analyse a single position line. Invalid positions are reported with the reason of
+    the failed validation instead of raising.
+
+    Args:
+        line_number (int): One-based line number of the position.
+        line (str): Position line, without the trailing newline.
+
+    Returns:
+        PositionAnalysis: Result of the analysis.
+    """
+    try:
+        game_state = parse_position(line)
+    except (ValueError, InvalidGameState) as ex:
+        return PositionAnalysis(line_number, line[:9], error=str(ex))
+    to_move = game_state.current_mark
+    result = PositionAnalysis(
+        line_number, game_state.grid.cells, game_state.starting_mark, to_move
+    )
+    if game_state.game_over:
+        return result._replace(
+            status="tie" if game_state.tie else "win",
+            winner=game_state.winner,
+            value=game_state.evaluate_score(to_move),
+        )
+    value, best_move = evaluate_position(game_state, _worker_cache["cache"])
+    return result._replace(status="ongoing", best_move=best_move, value=value)
+
+def attach_worker_cache(name: str) -> None:
+    """Make a pool worker use a shared search cache. Runs as the initializer of the pool, so
+    workers restarted by the pool attach again.
+
+    Args:
+        name (str): Name of the shared memory block of the cache.
+    """
+    _worker_cache["cache"] = SharedSearchCache.attach(name)
+
+def analyze_chunk(chunk: list[tuple[int, str]]) -> list[PositionAnalysis]:
+    """Analyse a chunk of numbered position lines. Runs inside the pool workers.
+
+    Args:
+        chunk (list[tuple[int, str]]): Pairs of line number and position line.
+
+    Returns:
+        list[PositionAnalysis]: Results in the same order as the chunk.
+    """
+    return [analyze_position(line_number, line) for line_number, line in chunk]
+
+def analyze_lines(
+    lines: Iterable[str], workers: int | None = None, chunk_size: int = 256
+) -> Iterator[PositionAnalysis]:
+    """Analyse a stream of position lines, preserving their order. Lines are consumed
+    lazily and at most two chunks per worker are in flight, so memory stays bounded
+    whatever the size of the input. Blank lines are skipped.
+
+    Args:
+        lines (Iterable[str]): Position lines, trailing newlines are ignored.
+        workers (int | None, optional): Size of the process pool, 0 analyses in the current
+            process. Defaults to the number of CPUs.
+        chunk_size (int, optional): Positions sent to a worker at once. Defaults to 256.
+
+    Yields:
+        Iterator[PositionAnalysis]: Result of every non blank line, in input order.
+    """
+    numbered = (
+        (line_number, line.rstrip("\r\n"))
+        for line_number, line in enumerate(lines, start=1)
+        if line.strip("\r\n")
+    )
+    chunks = iter(lambda: list(islice(numbered, chunk_size)), [])
+    if workers == 0:
+        for chunk in chunks:
+            yield from analyze_chunk(chunk)
+        return
+    workers = workers or os.cpu_count() or 1
+    with SharedSearchCache() as shared_cache, ProcessPoolExecutor(
+        max_workers=workers, initializer=attach_worker_cache, initargs=(shared_cache.name,)
+    ) as executor:
+        pending: deque[Future] = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(analyze_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
@@ -0,0 +1,166 @@
+"""Provide an opening book for the first plies of the classic game.
+
+This module allows computer players to answer the opening positions, the most expensive ones to
+search, without searching. The book is generated offline by the minimax engine and shipped as a
+small JSON data file, loaded lazily the first time it is needed. Positions are reduced by the 8
+symmetries of the grid and by swapping the marks, so that the starting mark is always X, and
+each position stores every best move with a weight, the number of replies of the opponent that
+lose plus one, used for a weighted random choice among equally good moves.
+
+Examples:
+
+    >>> from backend.logic.book import book_move
+    >>> book_move(GameState(Grid("    X    "))).cell_index in (0, 2, 6, 8)
+    True
+    >>> book_move(GameState(Grid("XO XO X  "))) is None
+    True
+
+    $ python -m backend.logic.book  # regenerate the data file
+
+The module contains the following functions:
+- `canonical(cells: str, starting_mark: Mark) -> tuple[str, tuple[int, ...]]` - Return the
+    canonical form of a position and the symmetry that produces it.
+- `build_opening_book(plies: int = 3) -> dict[str, list[list[int]]]` - Generate the book.
+- `write_opening_book(path: Path = BOOK_PATH, plies: int = 3) -> None` - Write the data file.
+- `load_opening_book() -> dict[str, list[list[int]]]` - Return the book, loading it once.
+- `book_move(game_state: GameState, rng: random.Random | None = None) -> Move | None` - Return
+    a move from the book.
+"""
+
+import json
+import random
+from functools import cache
+from pathlib import Path
+
+from backend.logic.cache import SearchCache
+from backend.logic.minimax import evaluate_position
+from backend.logic.models import GameState, Grid, Mark, Move
+from backend.logic.rules import STANDARD_RULES
+
+BOOK_PATH = Path(__file__).parent / "data" / "opening_book.json"
+BOOK_PLIES = 3
+SWAP_MARKS = str.maketrans("XO", "OX")
+
+def _symmetries() -> tuple[tuple[int, ...], ...]:
+    """Return the 8 symmetries of the grid as permutations of the cell indices, where the
+    transformed cell i is the original cell permutation[i].
+
+    Returns:
+        tuple[tuple[int, ...], ...]: Rotations and reflections of the grid.
+    """
+    rotate = (6, 3, 0, 7, 4, 1, 8, 5, 2)
+    reflect = (2, 1, 0, 5, 4, 3, 8, 7, 6)
+    permutations = []
+    permutation = tuple(range(9))
+    for _ in range(4):
+        permutations.append(permutation)
+        permutations.append(tuple(permutation[index] for index in reflect))
+        permutation = tuple(permutation[index] for index in rotate)
+    return tuple(permutations)
+
+SYMMETRIES = _symmetries()
+
+def canonical(cells: str, starting_mark: Mark) -> tuple[str, tuple[int, ...]]:
+    """Return the canonical form of a position and the symmetry that produces it. Marks are
+    swapped when O started, and the smallest of the 8 transformed grids is the canonical one.
+    The cell canonical[i] comes from the original cell symmetry[i].
+
+    Args:
+        cells (str): 9 elements X, O or space.
+        starting_mark (Mark): Starting mark of the game.
+
+    Returns:
+        tuple[str, tuple[int, ...]]: Canonical cells and symmetry used.
+    """
+    if starting_mark == "O":
+        cells = cells.translate(SWAP_MARKS)
+    return min(
+        ("".join(cells[index] for index in symmetry), symmetry) for symmetry in SYMMETRIES
+    )
+
+def build_opening_book(plies: int = BOOK_PLIES) -> dict[str, list[list[int]]]:
+    """Generate the book, with every best move of the canonical positions reached in the first
+    plies of a game started by X, whatever the moves played to reach them.
+
+    Args:
+        plies (int, optional): Number of plies covered by the book. Defaults to 3.
+
+    Returns:
+        dict[str, list[list[int]]]: Pairs of cell index and weight by canonical cells.
+    """
+    cache_ = SearchCache()
+    book = {}
+    frontier = {canonical(" " * 9, Mark.CROSS)[0]}
+    for _ in range(plies):
+        next_frontier = set()
+        for cells in sorted(frontier):
+            game_state = GameState(Grid(cells))
+            best_value, _ = evaluate_position(game_state, cache_)
+            entries = []
+            for move in game_state.possible_moves:
+                if -evaluate_position(move.after_state, cache_)[0] != best_value:
+                    continue
+                losing_replies = sum(
+                    evaluate_position(reply.after_state, cache_)[0] == 1
+                    for reply in move.after_state.possible_moves
+                )
+                entries.append([move.cell_index, 1 + losing_replies])
+            book[cells] = entries
+            next_frontier.update(
+                canonical(move.after_state.grid.cells, Mark.CROSS)[0]
+                for move in game_state.possible_moves
+            )
+        frontier = next_frontier
+    return book
+
+def write_opening_book(path: Path = BOOK_PATH, plies: int = BOOK_PLIES) -> None:
+    """Generate the book and write the data file.
+
+    Args:
+        path (Path, optional): Destination of the data file. Defaults to BOOK_PATH.
+        plies (int, optional): Number of plies covered by the book. Defaults to 3.
+    """
+    book = build_opening_book(plies)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as book_file:
+        book_file.write("{\n")
+        book_file.write(",\n".join(
+            f"{json.dumps(cells)}: {json.dumps(book[cells])}" for cells in sorted(book)
+        ))
+        book_file.write("\n}\n")
+
+@cache
+def load_opening_book() -> dict[str, list[list[int]]]:
+    """Return the book, loading the data file the first time only.
+
+    Returns:
+        dict[str, list[list[int]]]: Pairs of cell index and weight by canonical cells.
+    """
+    with open(BOOK_PATH, encoding="utf-8") as book_file:
+        return json.load(book_file)
+
+def book_move(game_state: GameState, rng: random.Random | None = None) -> Move | None:
+    """Return a move from the book, chosen at random among the best moves according to their
+    weights, or None if the position is not in the book. The book only covers the standard
+    rules.
+
+    Args:
+        game_state (GameState): current GameState, consisting of a current Grid (9 elemets that
+            that can be X, O or spaces) and a starting Mark (default X).
+        rng (random.Random | None, optional): Random generator of the choice, None for the
+            random module. Defaults to None.
+
+    Returns:
+        Move | None: A best move of the position, or None.
+    """
+    if game_state.grid.empty_count <= 9 - BOOK_PLIES or game_state.rules != STANDARD_RULES:
+        return None
+    cells, symmetry = canonical(game_state.grid.cells, game_state.starting_mark)
+    if not (entries := load_opening_book().get(cells)):
+        return None
+    indices, weights = zip(*entries)
+    index = (rng or random).choices(indices, weights)[0]
+    return game_state.make_move_to(symmetry[index])
+
+if __name__ == "__main__":
+    write_opening_book()
@@ -0,0 +1,165 @@
+"""Provide a thread-safe search cache shared by every computer player of the process.
+
+This module allows positions solved by the minimax engine to be reused by every game running
+in the process. Entries are spread over independent stripes, each one guarded by its own lock,
+so concurrent lookups of different positions never wait for each other. This keeps the cache
+correct on free-threaded builds of Python without a single global lock.
+
+Examples:
+
+    >>> from backend.logic.cache import SHARED_SEARCH_CACHE
+    >>> from backend.logic.minimax import find_best_move
+    >>> find_best_move(GameState(Grid("X   O    ")), SHARED_SEARCH_CACHE).cell_index
+    1
+    >>> SHARED_SEARCH_CACHE.stats()
+    CacheStats(hits=768, misses=634, evictions=0, size=634)
+
+The module contains the following classes:
+- `CacheStats(NamedTuple)` - Snapshot of the counters of a search cache.
+- `SearchCache` - A thread-safe, size-limited and lock-striped search cache.
+
+The module contains the following constant:
+- `SHARED_SEARCH_CACHE` - Process-wide search cache used by computer players by default.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Hashable, NamedTuple, TypeAlias
+
+CacheEntry: TypeAlias = tuple[int, int | None]
+
+class CacheStats(NamedTuple):
+    """A class that holds a snapshot of the counters of a search cache. Extends NamedTuple
+
+    Attributes:
+        hits: int
+            Lookups that found an entry.
+        misses: int
+            Lookups that did not find an entry.
+        evictions: int
+            Entries dropped to respect the size limit.
+        size: int
+            Entries currently stored.
+    """
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Ratio of lookups that found an entry.
+
+        Returns:
+            float: Value between 0 and 1, 0 if there was no lookup.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+@dataclass(slots=True)
+class _Stripe:
+    """A slice of the cache with its own lock, entries and counters."""
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    entries: dict[Hashable, CacheEntry] = field(default_factory=dict)
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+class SearchCache:
+    """A thread-safe, size-limited and lock-striped search cache. Maps a position key to the
+    minimax value of the position for the player to move and the index of the best move, None
+    when the game is over. Each stripe evicts its least recently used entry when full.
+
+    Methods:
+        key(self, game_state: Any) -> Hashable:
+            Return the key of a position.
+        get(self, key: Hashable) -> CacheEntry | None:
+            Return the entry of a position, if cached.
+        put(self, key: Hashable, entry: CacheEntry) -> None:
+            Store the entry of a position.
+        stats(self) -> CacheStats:
+            Return a snapshot of the counters of the cache.
+        clear(self) -> None:
+            Drop every entry and reset the counters.
+    """
+    def __init__(self, max_size: int = 1 << 20, stripes: int = 64) -> None:
+        """
+        Args:
+            max_size (int, optional): Maximum number of entries. Defaults to 1 << 20.
+            stripes (int, optional): Number of independently locked stripes. Defaults to 64.
+        """
+        if max_size < stripes or stripes < 1:
+            raise ValueError("Must have at least one stripe and one entry per stripe")
+        self.max_size = max_size
+        self._stripe_size = max_size // stripes
+        self._stripes = tuple(_Stripe() for _ in range(stripes))
+
+    def key(self, game_state: Any) -> Hashable:
+        """Return the key of a position, its Zobrist hash, so game states of every variant
+        can share the cache.
+
+        Args:
+            game_state (Any): Game state of any variant, or a search board.
+
+        Returns:
+            Hashable: Key of the position.
+        """
+        return game_state.zobrist_hash
+
+    def get(self, key: Hashable) -> CacheEntry | None:
+        """Return the entry of a position, if cached.
+
+        Args:
+            key (Hashable): Key of the position.
+
+        Returns:
+            CacheEntry | None: Value and index of the best move, or None on a miss.
+        """
+        stripe = self._stripes[hash(key) % len(self._stripes)]
+        with stripe.lock:
+            entry = stripe.entries.pop(key, None)
+            if entry is None:
+                stripe.misses += 1
+                return None
+            stripe.entries[key] = entry
+            stripe.hits += 1
+            return entry
+
+    def put(self, key: Hashable, entry: CacheEntry) -> None:
+        """Store the entry of a position.
+
+        Args:
+            key (Hashable): Key of the position.
+            entry (CacheEntry): Value and index of the best move.
+        """
+        stripe = self._stripes[hash(key) % len(self._stripes)]
+        with stripe.lock:
+            stripe.entries.pop(key, None)
+            stripe.entries[key] = entry
+            if len(stripe.entries) > self._stripe_size:
+                del stripe.entries[next(iter(stripe.entries))]
+                stripe.evictions += 1
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the counters of the cache.
+
+        Returns:
+            CacheStats: Hits, misses, evictions and size.
+        """
+        hits = misses = evictions = size = 0
+        for stripe in self._stripes:
+            with stripe.lock:
+                hits += stripe.hits
+                misses += stripe.misses
+                evictions += stripe.evictions
+                size += len(stripe.entries)
+        return CacheStats(hits, misses, evictions, size)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        for stripe in self._stripes:
+            with stripe.lock:
+                stripe.entries.clear()
+                stripe.hits = stripe.misses = stripe.evictions = 0
+
+SHARED_SEARCH_CACHE = SearchCache()
@@ -0,0 +1,266 @@
+"""Provide a compact integer encoding of the classic game states.
+
+This module allows game states to be moved between processes, stored in game logs and used as
+cache keys as raw 16-bit integers instead of pickled objects. The grid is read as a number in
+base 3, cell i being the digit of weight 3**i with space 0, X 1 and O 2, which fits in the 15
+lowest bits, and bit 15 is set when O is the starting mark. The rules are not part of the code,
+decoded game states follow the standard rules. Bulk functions write and read
+`array('H')` objects or any writable buffer of 16-bit items, like a NumPy `uint16` array,
+through a `memoryview`, without copying the buffer.
+
+Examples:
+
+    >>> from backend.logic.encoding import decode, encode, encode_many
+    >>> encode(GameState(Grid("X   O    ")))
+    163
+    >>> decode(163).grid.cells
+    'X   O    '
+    >>> encode_many([GameState(Grid()), GameState(Grid(), Mark("O"))])
+    array('H', [0, 32768])
+    >>> move = CompactMove.from_move(GameState(Grid("X   O    ")).make_move_to(8))
+    >>> move.after, move.after_state().grid.cells
+    (13286, 'X   O   X')
+
+The module contains the following class:
+- `CompactMove(NamedTuple)` - A move that holds the codes of its states instead of the states.
+
+The module contains the following functions:
+- `encode(game_state: GameState) -> int` - Return the code of a game state.
+- `decode(code: int) -> GameState` - Return the game state of a code.
+- `encode_many(game_states: Iterable[GameState], out: Any = None) -> array | memoryview` -
+    Return the codes of many game states.
+- `decode_many(codes: Any) -> list[GameState]` - Return the game states of many codes.
+"""
+
+from array import array
+from collections.abc import Iterable
+from functools import cache
+from typing import Any, NamedTuple
+
+from backend.logic.models import GameState, Grid, Mark, Move
+from backend.logic.rules import STANDARD_RULES, RuleSet
+
+STARTING_NAUGHT_BIT = 1 << 15
+BOARD_CODES = 3 ** 9
+TO_DIGITS = str.maketrans(" XO", "012")
+
+@cache
+def _board_cells() -> tuple[str, ...]:
+    """Return the cells of every board code, computed the first time only.
+
+    Returns:
+        tuple[str, ...]: 9 elements X, O or space by board code.
+    """
+    boards = [""]
+    for _ in range(9):
+        boards = [cells + mark for mark in " XO" for cells in boards]
+    return tuple(boards)
+
+def encode(game_state: GameState) -> int:
+    """Return the code of a game state.
+
+    Args:
+        game_state (GameState): current GameState, consisting of a current Grid (9 elemets that
+            that can be X, O or spaces) and a starting Mark (default X).
+
+    Returns:
+        int: 16-bit code.
+    """
+    code = int(game_state.grid.cells.translate(TO_DIGITS)[::-1], 3)
+    if game_state.starting_mark is Mark.NAUGHT:
+        code |= STARTING_NAUGHT_BIT
+    return code
+
+def decode(code: int) -> GameState:
+    """Return the game state of a code.
+
+    Args:
+        code (int): 16-bit code.
+
+    Raises:
+        ValueError: Exception when the code is out of range.
+        InvalidGameState: Exception when the code is not a valid game state.
+
+    Returns:
+        GameState: Game state of the code.
+    """
+    return _decode_with_rules(code, STANDARD_RULES)
+
+class CompactMove(NamedTuple):
+    """A class that holds a move with the codes of its states instead of the states. Extends
+    NamedTuple. A Move keeps both of its states, and through their cached possible moves every
+    state searched from them, while a compact move is a tuple of five integers that keeps no
+    state alive. The states are decoded again when asked for.
+
+    Attributes:
+        mark: Mark
+            Mark placed, the mark of the player unless the rules are wild.
+        cell_index: int
+            Position played.
+        code: int
+            Code of the move, as Move.code.
+        before: int
+            Code of the game state before the move.
+        after: int
+            Code of the game state after the move.
+
+    Methods:
+        from_move(cls, move: Move) -> CompactMove:
+            Return the compact move of a move.
+        before_state(self, rules: RuleSet = STANDARD_RULES) -> GameState:
+            Return the game state before the move.
+        after_state(self, rules: RuleSet = STANDARD_RULES) -> GameState:
+            Return the game state after the move.
+        move(self, rules: RuleSet = STANDARD_RULES) -> Move:
+            Return the full move.
+    """
+    mark: Mark
+    cell_index: int
+    code: int
+    before: int
+    after: int
+
+    @classmethod
+    def from_move(cls, move: Move) -> "CompactMove":
+        """Return the compact move of a move.
+
+        Args:
+            move (Move): Move of the classic game.
+
+        Returns:
+            CompactMove: Move with the codes of its states.
+        """
+        return cls(
+            move.mark, move.cell_index, move.code, encode(move.before_state),
+            encode(move.after_state),
+        )
+
+    def before_state(self, rules: RuleSet = STANDARD_RULES) -> GameState:
+        """Return the game state before the move, decoded again.
+
+        Args:
+            rules (RuleSet, optional): Rules of the game, which codes do not hold. Defaults to
+                STANDARD_RULES.
+
+        Returns:
+            GameState: Game state before the move.
+        """
+        return _decode_with_rules(self.before, rules)
+
+    def after_state(self, rules: RuleSet = STANDARD_RULES) -> GameState:
+        """Return the game state after the move, decoded again.
+
+        Args:
+            rules (RuleSet, optional): Rules of the game, which codes do not hold. Defaults to
+                STANDARD_RULES.
+
+        Returns:
+            GameState: Game state after the move.
+        """
+        return _decode_with_rules(self.after, rules)
+
+    def move(self, rules: RuleSet = STANDARD_RULES) -> Move:
+        """Return the full move, with new states.
+
+        Args:
+            rules (RuleSet, optional): Rules of the game, which codes do not hold. Defaults to
+                STANDARD_RULES.
+
+        Returns:
+            Move: Move with its states.
+        """
+        return self.before_state(rules).move_from_code(self.code)
+
+def _decode_with_rules(code: int, rules: RuleSet) -> GameState:
+    """Return the game state of a code with some rules, validated against those rules only.
+
+    Args:
+        code (int): 16-bit code.
+        rules (RuleSet): Rules of the game.
+
+    Raises:
+        ValueError: Exception when the code is out of range.
+        InvalidGameState: Exception when the code is not a valid game state.
+
+    Returns:
+        GameState: Game state of the code.
+    """
+    board = code & ~STARTING_NAUGHT_BIT
+    if not 0 <= board < BOARD_CODES or code >> 16:
+        raise ValueError(f"Invalid game state code {code}")
+    return GameState(
+        Grid(_board_cells()[board]),
+        Mark.NAUGHT if code & STARTING_NAUGHT_BIT else Mark.CROSS,
+        rules,
+    )
+
+def _codes_view(buffer: Any) -> memoryview:
+    """Return a view of 16-bit items over a contiguous buffer, sharing its memory. Only
+    buffers of unsigned 16-bit items and raw bytes are viewed, so items of another size are
+    never read as halves or pairs of codes.
+
+    Args:
+        buffer (Any): Object supporting the buffer protocol.
+
+    Raises:
+        TypeError: Exception when the object is not a buffer or its items are not unsigned
+            16-bit integers or bytes.
+        ValueError: Exception when a buffer of bytes has an odd length.
+
+    Returns:
+        memoryview: View with format H.
+    """
+    view = memoryview(buffer)
+    if view.format == "B":
+        if view.nbytes % 2:
+            raise ValueError("Buffer of bytes must have an even length")
+    elif view.format != "H":
+        raise TypeError(f"Buffer of format {view.format!r} does not hold 16-bit codes")
+    return view.cast("B").cast("H")
+
+def encode_many(game_states: Iterable[GameState], out: Any = None) -> array | memoryview:
+    """Return the codes of many game states. When a buffer is given, the codes are written
+    into it, starting at its first item, without copying it.
+
+    Args:
+        game_states (Iterable[GameState]): Game states to encode.
+        out (Any, optional): Writable, contiguous buffer of 16-bit items, like an array('H')
+            or a NumPy uint16 array. Defaults to None.
+
+    Raises:
+        TypeError: Exception when the buffer does not hold unsigned 16-bit items or bytes.
+        ValueError: Exception when a buffer of bytes has an odd length.
+        IndexError: Exception when the buffer is too small.
+
+    Returns:
+        array | memoryview: The codes in a new array('H'), or a view of the items written in
+            the buffer when one is given.
+    """
+    if out is None:
+        return array("H", map(encode, game_states))
+    view = _codes_view(out)
+    count = 0
+    for count, game_state in enumerate(game_states, 1):
+        view[count - 1] = encode(game_state)
+    return view[:count]
+
+def decode_many(codes: Any) -> list[GameState]:
+    """Return the game states of many codes, read in place from a buffer of 16-bit items or
+    bytes. Any other buffer, like an array('i') or a NumPy int64 array, and any iterable of
+    integers is read item by item.
+
+    Args:
+        codes (Any): Buffer of 16-bit items, like an array('H'), bytes or a NumPy uint16
+            array, or iterable of codes.
+
+    Raises:
+        ValueError: Exception when a buffer of bytes has an odd length.
+
+    Returns:
+        list[GameState]: Game states of the codes.
+    """
+    try:
+        codes = _codes_view(codes)
+    except TypeError:
+        pass
+    return [decode(code) for code in codes]
@@ -5,7 +5,9 @@ This module allows the raise of custom exceptions.
 The module contains the following custom exceptions:
 - `InvalidGameState`
 - `InvalidMove`
+- `SearchTimeout`
 - `UnknownGameScore`
+- `WorkUnitFailed`
 """
 
 class InvalidGameState(Exception):
@@ -14,5 +16,11 @@ class InvalidGameState(Exception):
 class InvalidMove(Exception):
     """Raised when the move is invalid."""
 
+class SearchTimeout(Exception):
+    """Raised when a time-bounded search runs out of time."""
+
 class UnknownGameScore(Exception):
     """Raised when the game score is unknown."""
+
+class WorkUnitFailed(Exception):
+    """Raised when a distributed work unit fails on every attempt."""
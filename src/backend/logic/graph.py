@@ -0,0 +1,360 @@
+"""Provide the precomputed graph of the reachable positions of the classic game.
+
+This module allows solvers, analysis tools and players to walk the game with integer indexing
+instead of building game states. Every position reachable from the empty grid is a node with
+an integer id, and every move an edge from a position to the position after it. The graph is
+stored in flat `array` buffers in compressed sparse row (CSR) layout: the edges of node `i`
+are at `offsets[i]:offsets[i + 1]` of `targets` and `move_codes`, and the predecessors are
+stored the same way. Ids are ordered by ply, so `range(len(graph))` is a topological order. The
+buffers can be shared with NumPy without copying, with `numpy.frombuffer`.
+
+Examples:
+
+    >>> from backend.logic.graph import StateGraph
+    >>> graph = StateGraph()
+    >>> len(graph), graph.edge_count
+    (5478, 16167)
+    >>> node = graph.id_of(GameState(Grid("X   O    ")))
+    >>> list(graph.moves(node))
+    [1, 2, 3, 5, 6, 7, 8]
+    >>> graph.solve()[0]
+    0
+
+The module contains the following class:
+- `StateGraph` - The graph of the reachable positions of the classic game, in CSR layout.
+
+The module contains the following constants:
+- `ONGOING`, `X_WINS`, `O_WINS`, `TIE` - Outcomes of the nodes.
+"""
+
+from array import array
+from collections import deque
+from typing import Iterator
+
+from backend.logic.encoding import STARTING_NAUGHT_BIT, TO_DIGITS, encode
+from backend.logic.models import GameState, Grid, Mark
+from backend.logic.rules import STANDARD_RULES, RuleSet
+from backend.logic.search_board import SearchBoard
+
+ONGOING = 0
+X_WINS = 1
+O_WINS = 2
+TIE = 3
+
+class StateGraph:
+    """The graph of the reachable positions of the classic game, a directed acyclic graph in
+    CSR layout. Nodes are numbered by ply, then in the order they are first reached, node 0
+    being the empty grid. The edges of a node are ordered by move code.
+
+    Attributes:
+        starting_mark: Mark
+            Starting mark of the games.
+        rules: RuleSet
+            Rules of the games.
+        codes: array
+            Compact code of every node, as encoding.encode.
+        plies: array
+            Number of moves played of every node.
+        outcomes: array
+            Outcome of every node: ONGOING, X_WINS, O_WINS or TIE.
+        terminal: array
+            1 for every node where the game is over, 0 otherwise.
+        offsets: array
+            Start of the edges of every node in targets and moves, plus the number of edges.
+        targets: array
+            Node reached by every edge.
+        move_codes: array
+            Code of the move of every edge, as Move.code.
+        parent_offsets: array
+            Start of the predecessors of every node in parents, plus the number of edges.
+        parents: array
+            Predecessor of every edge, grouped by node reached.
+
+    Methods:
+        edge_count(self) -> int:
+            Getter of the number of edges.
+        id_of(self, game_state: GameState) -> int:
+            Return the id of a position.
+        id_of_cells(self, cells: str) -> int:
+            Return the id of the position of some cells.
+        cells(self, node: int) -> str:
+            Return the cells of a node.
+        game_state(self, node: int) -> GameState:
+            Return the game state of a node.
+        successors(self, node: int) -> array:
+            Return the nodes reached by the moves of a node.
+        moves(self, node: int) -> array:
+            Return the codes of the moves of a node.
+        predecessors(self, node: int) -> array:
+            Return the nodes with a move reaching a node.
+        ply_range(self, ply: int) -> range:
+            Return the ids of the nodes of a ply.
+        descendants(self, node: int) -> Iterator[int]:
+            Return the nodes reachable from a node, breadth first.
+        solve(self) -> array:
+            Return the minimax value of every node for the player to move.
+    """
+    # pylint: disable=too-many-instance-attributes
+    # Each buffer of the CSR layout is an attribute of its own, to be shared with NumPy.
+    def __init__(
+        self, starting_mark: Mark = Mark("X"), rules: RuleSet = STANDARD_RULES
+    ) -> None:
+        """
+        Args:
+            starting_mark (Mark, optional): Starting mark of the games. Defaults to Mark("X").
+            rules (RuleSet, optional): Rules of the games. Defaults to STANDARD_RULES.
+        """
+        self.starting_mark = starting_mark
+        self.rules = rules
+        self._pack(*self._walk(SearchBoard(GameState(Grid(), starting_mark, rules))))
+
+    def _walk(
+        self, board: SearchBoard
+    ) -> tuple[list[tuple[int, int, int]], list[list[tuple[int, int]]]]:
+        """Walk every position reachable from a board, depth first, playing and taking back
+        the moves on the board in place.
+
+        Args:
+            board (SearchBoard): Board of the empty grid.
+
+        Returns:
+            tuple[list[tuple[int, int, int]], list[list[tuple[int, int]]]]: Code, ply and
+                outcome of every position in the order they are first reached, and the move
+                code and position reached of the moves of every position.
+        """
+        discovered = {board.code: 0}
+        found = [(board.code, 0, self._outcome(board))]
+        edges: list[list[tuple[int, int]]] = [[]]
+        stack = [iter(board.moves)]
+        path: list[int] = []
+        while stack:
+            code = next(stack[-1], None)
+            if code is None:
+                stack.pop()
+                if path:
+                    board.unmake(path.pop())
+                continue
+            parent = discovered[board.code]
+            board.make(code)
+            if board.code in discovered:
+                edges[parent].append((code, discovered[board.code]))
+                board.unmake(code)
+                continue
+            child = discovered[board.code] = len(found)
+            found.append((board.code, 9 - board.empty_count, self._outcome(board)))
+            edges.append([])
+            edges[parent].append((code, child))
+            path.append(code)
+            stack.append(iter(board.moves))
+        return found, edges
+
+    def _pack(
+        self, found: list[tuple[int, int, int]], edges: list[list[tuple[int, int]]]
+    ) -> None:
+        """Number the positions by ply and fill the buffers of the graph in CSR layout.
+
+        Args:
+            found (list[tuple[int, int, int]]): Code, ply and outcome of every position.
+            edges (list[list[tuple[int, int]]]): Move code and position reached of the moves of
+                every position.
+        """
+        order = sorted(range(len(found)), key=lambda node: found[node][1])
+        new_ids = array("I", bytes(4 * len(order)))
+        for new_id, node in enumerate(order):
+            new_ids[node] = new_id
+        self.codes = array("H", (found[node][0] for node in order))
+        self.plies = array("B", (found[node][1] for node in order))
+        self.outcomes = array("B", (found[node][2] for node in order))
+        self.terminal = array("B", (outcome != ONGOING for outcome in self.outcomes))
+        self.offsets = array("I", [0])
+        self.targets = array("I")
+        self.move_codes = array("B")
+        incoming: list[list[int]] = [[] for _ in order]
+        for new_id, node in enumerate(order):
+            for code, child in edges[node]:
+                self.targets.append(new_ids[child])
+                self.move_codes.append(code)
+                incoming[new_ids[child]].append(new_id)
+            self.offsets.append(len(self.targets))
+        self.parent_offsets = array("I", [0])
+        self.parents = array("I")
+        for node_parents in incoming:
+            self.parents.extend(node_parents)
+            self.parent_offsets.append(len(self.parents))
+        self._ids = {code: node for node, code in enumerate(self.codes)}
+        self._ply_offsets = array("I", [0])
+        for ply in range(10):
+            self._ply_offsets.append(self._ply_offsets[-1] + self.plies.count(ply))
+
+    def _outcome(self, board: SearchBoard) -> int:
+        """Return the outcome of the position of a board.
+
+        Args:
+            board (SearchBoard): Board of the position.
+
+        Returns:
+            int: ONGOING, X_WINS, O_WINS or TIE.
+        """
+        if not board.game_over:
+            return ONGOING
+        if board.line_mark is None:
+            return TIE
+        player = board.turn ^ 1 if self.rules.wild else board.line_mark
+        return X_WINS + (player ^ self.rules.misere)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @property
+    def edge_count(self) -> int:
+        """Getter of the number of edges, the number of moves between the positions.
+
+        Returns:
+            int: Number of edges.
+        """
+        return len(self.targets)
+
+    def id_of(self, game_state: GameState) -> int:
+        """Return the id of a position.
+
+        Args:
+            game_state (GameState): current GameState, consisting of a current Grid (9 elemets that
+                that can be X, O or spaces) and a starting Mark (default X).
+
+        Raises:
+            KeyError: Exception when the position is not a node of the graph.
+
+        Returns:
+            int: Id of the node.
+        """
+        if game_state.starting_mark is not self.starting_mark or game_state.rules != self.rules:
+            raise KeyError(game_state)
+        return self._ids[encode(game_state)]
+
+    def id_of_cells(self, cells: str) -> int:
+        """Return the id of the position of some cells.
+
+        Args:
+            cells (str): 9 elements X, O or space.
+
+        Raises:
+            KeyError: Exception when the position is not a node of the graph.
+
+        Returns:
+            int: Id of the node.
+        """
+        code = int(cells.translate(TO_DIGITS)[::-1], 3)
+        if self.starting_mark is Mark.NAUGHT:
+            code |= STARTING_NAUGHT_BIT
+        return self._ids[code]
+
+    def cells(self, node: int) -> str:
+        """Return the cells of a node.
+
+        Args:
+            node (int): Id of the node.
+
+        Returns:
+            str: 9 elements X, O or space.
+        """
+        board = self.codes[node] & ~STARTING_NAUGHT_BIT
+        cells = []
+        for _ in range(9):
+            board, digit = divmod(board, 3)
+            cells.append(" XO"[digit])
+        return "".join(cells)
+
+    def game_state(self, node: int) -> GameState:
+        """Return the game state of a node.
+
+        Args:
+            node (int): Id of the node.
+
+        Returns:
+            GameState: Position of the node.
+        """
+        return GameState(Grid(self.cells(node)), self.starting_mark, self.rules)
+
+    def successors(self, node: int) -> array:
+        """Return the nodes reached by the moves of a node, in the order of its moves.
+
+        Args:
+            node (int): Id of the node.
+
+        Returns:
+            array: Ids of the nodes, empty when the game is over.
+        """
+        return self.targets[self.offsets[node]:self.offsets[node + 1]]
+
+    def moves(self, node: int) -> array:
+        """Return the codes of the moves of a node, in the order of its successors.
+
+        Args:
+            node (int): Id of the node.
+
+        Returns:
+            array: Move codes, empty when the game is over.
+        """
+        return self.move_codes[self.offsets[node]:self.offsets[node + 1]]
+
+    def predecessors(self, node: int) -> array:
+        """Return the nodes with a move reaching a node.
+
+        Args:
+            node (int): Id of the node.
+
+        Returns:
+            array: Ids of the nodes, empty for the empty grid.
+        """
+        return self.parents[self.parent_offsets[node]:self.parent_offsets[node + 1]]
+
+    def ply_range(self, ply: int) -> range:
+        """Return the ids of the nodes of a ply, which are consecutive.
+
+        Args:
+            ply (int): Number of moves played, from 0 to 9.
+
+        Returns:
+            range: Ids of the nodes.
+        """
+        return range(self._ply_offsets[ply], self._ply_offsets[ply + 1])
+
+    def descendants(self, node: int) -> Iterator[int]:
+        """Return the nodes reachable from a node, breadth first, the node included.
+
+        Args:
+            node (int): Id of the node.
+
+        Yields:
+            Iterator[int]: Ids of the nodes, each once.
+        """
+        seen = bytearray(len(self))
+        seen[node] = 1
+        queue = deque([node])
+        while queue:
+            current = queue.popleft()
+            yield current
+            for child in self.successors(current):
+                if not seen[child]:
+                    seen[child] = 1
+                    queue.append(child)
+
+    def solve(self) -> array:
+        """Return the minimax value of every node for the player to move, computed from the
+        last ply to the first.
+
+        Returns:
+            array: Value of every node, 1, 0 or -1.
+        """
+        values = array("b", bytes(len(self)))
+        targets, offsets, outcomes = self.targets, self.offsets, self.outcomes
+        for node in reversed(range(len(self))):
+            outcome = outcomes[node]
+            if outcome == ONGOING:
+                values[node] = max(
+                    -values[child] for child in targets[offsets[node]:offsets[node + 1]]
+                )
+            elif outcome != TIE:
+                player_to_move = (self.plies[node] + (self.starting_mark is Mark.NAUGHT)) % 2
+                values[node] = 1 if outcome - X_WINS == player_to_move else -1
+        return values
@@ -16,32 +16,130 @@ Examples:
             print('-' * 10)
 
 The module contains the following functions:
-- `find_best_move(game_state: GameState)` - Return the best move available.
+- `find_best_move(
+    game_state: GameState, cache: SearchCache | SharedSearchCache | None = None
+    )` - Return the best move available.
+- `evaluate_position(
+    game_state: GameState, cache: SearchCache | SharedSearchCache
+    )` - Return the value of the position for the player to move and the index of the best move.
 - `minimax(
     move: Move, maximizer: Mark, choose_highest_score: bool = False
     )` - Return 1, 0 or -1 base in the result of the next move.
+- `find_ultimate_move(
+    game_state: UltimateGameState, max_depth: int = 8, time_limit: float | None = None,
+    cancelled: threading.Event | None = None
+    )` - Return the best move found by a bounded search in Ultimate Tic Tac Toe.
+- `find_qubic_move(
+    game_state: QubicGameState, max_depth: int = 4, time_limit: float | None = None,
+    cancelled: threading.Event | None = None
+    )` - Return the best move found by threat detection and a bounded search in Qubic.
 """
 
-from functools import partial
+import functools
+import threading
+import time
+from typing import Callable
 
+from backend.logic.cache import CacheEntry, SearchCache
+from backend.logic.exceptions import SearchTimeout
 from backend.logic.models import GameState, Mark, Move
+from backend.logic.qubic import (
+    CELL_LINES,
+    CELL_ORDER,
+    FULL_CUBE,
+    LINE_MASKS as QUBIC_LINE_MASKS,
+    QubicGameState,
+    QubicMove,
+    threats,
+)
+from backend.logic.search_board import SearchBoard
+from backend.logic.shared_cache import SharedSearchCache
+from backend.logic.ultimate import (
+    BOARD_MASKS,
+    FULL_BOARD,
+    LINE_MASKS,
+    OPEN_CELLS,
+    WON,
+    UltimateGameState,
+    UltimateMove,
+)
 
-def find_best_move(game_state: GameState) -> Move | None:
+ULTIMATE_WIN_SCORE = 1_000_000
+LINE_WEIGHTS = (0, 1, 4, 16)
+QUBIC_WIN_SCORE = 1_000_000
+QUBIC_LINE_WEIGHTS = (0, 1, 8, 64, 0)
+
+def find_best_move(
+    game_state: GameState, cache: SearchCache | SharedSearchCache | None = None
+) -> Move | None:
     """Return the best move available.
 
     Args:
         game_state (GameState): current GameState, consisting of a current Grid (9 elemets that
             that can be X, O or spaces) and a starting Mark (default X)
+        cache (SearchCache | SharedSearchCache | None, optional): Cache of solved positions to
+            read and fill. Defaults to None.
 
     Returns:
         Move | None: Inmutable data Class that is strictly a data transfer object (DTO) whose main
     purpose is to carry data. Consists of the mark identifying the player who made a move, a numeric
     zero-based index in the string of cells, and the two states before and after making a move.
     """
+    if cache is not None:
+        _, index = evaluate_position(game_state, cache)
+        return None if index is None else game_state.move_from_code(index)
     maximizer: Mark = game_state.current_mark
-    bound_minimax = partial(minimax, maximizer=maximizer)
+    bound_minimax = functools.partial(minimax, maximizer=maximizer)
     return max(game_state.possible_moves, key=bound_minimax)
 
+def evaluate_position(
+    game_state: GameState, cache: SearchCache | SharedSearchCache
+) -> CacheEntry:
+    """Return the value of the position for the player to move and the code of the best
+    move, None when the game is over. Every solved position is stored in the cache, so
+    positions already seen by any game sharing the cache are answered without searching.
+    Ties are broken in favour of the lowest code, like find_best_move without a cache.
+
+    Args:
+        game_state (GameState): current GameState, consisting of a current Grid (9 elemets that
+            that can be X, O or spaces) and a starting Mark (default X)
+        cache (SearchCache | SharedSearchCache): Cache of solved positions to read and fill.
+
+    Returns:
+        CacheEntry: Value (1, 0 or -1) and code of the best move, its index with the
+            rules that are not wild.
+    """
+    return _evaluate_board(SearchBoard(game_state), cache)
+
+def _evaluate_board(
+    board: SearchBoard, cache: SearchCache | SharedSearchCache
+) -> CacheEntry:
+    """Return the value of the position of a search board for the player to move and the code
+    of the best move. The moves are played and taken back on the board in place.
+
+    Args:
+        board (SearchBoard): Mutable board of the position, left as given.
+        cache (SearchCache | SharedSearchCache): Cache of solved positions to read and fill.
+
+    Returns:
+        CacheEntry: Value (1, 0 or -1) and code of the best move.
+    """
+    key = cache.key(board)
+    if (entry := cache.get(key)) is not None:
+        return entry
+    if board.game_over:
+        entry = (board.score(), None)
+    else:
+        entry = (-2, None)
+        for code in board.moves:
+            board.make(code)
+            value = -_evaluate_board(board, cache)[0]
+            board.unmake(code)
+            if value > entry[0]:
+                entry = (value, code)
+    cache.put(key, entry)
+    return entry
+
 def minimax(
     move: Move, maximizer: Mark, choose_highest_score: bool = False
 ) -> int:
@@ -58,9 +156,399 @@ def minimax(
     Returns:
         int: returns 1, 0 or -1
     """
-    if move.after_state.game_over:
-        return move.after_state.evaluate_score(maximizer)
-    return (max if choose_highest_score else min)(
-        minimax(next_move, maximizer, not choose_highest_score)
-        for next_move in move.after_state.possible_moves
+    board = SearchBoard(move.after_state)
+    return _minimax_board(board, int(maximizer is Mark.NAUGHT), choose_highest_score)
+
+def _minimax_board(board: SearchBoard, maximizer: int, choose_highest_score: bool) -> int:
+    """Return 1, 0 or -1 for the maximizer, playing and taking back the moves on a search
+    board in place.
+
+    Args:
+        board (SearchBoard): Mutable board of the position, left as given.
+        maximizer (int): Mark of the maximizer, 0 for X and 1 for O.
+        choose_highest_score (bool): Rather the player to move is the maximizer.
+
+    Returns:
+        int: returns 1, 0 or -1
+    """
+    if board.game_over:
+        return board.score() if board.turn == maximizer else -board.score()
+    best = -2 if choose_highest_score else 2
+    for code in board.moves:
+        board.make(code)
+        score = _minimax_board(board, maximizer, not choose_highest_score)
+        board.unmake(code)
+        best = max(best, score) if choose_highest_score else min(best, score)
+    return best
+
+def find_ultimate_move(
+    game_state: UltimateGameState,
+    max_depth: int = 8,
+    time_limit: float | None = None,
+    cancelled: threading.Event | None = None,
+) -> UltimateMove | None:
+    """Return the best move found by a bounded search in Ultimate Tic Tac Toe. The search is
+    an iterative deepening alpha-beta negamax over the bit representation of the grid. Each
+    iteration tries first the best move of the previous one, and the result of the deepest
+    iteration completed before the time limit is returned.
+
+    Args:
+        game_state (UltimateGameState): current UltimateGameState, consisting of a current
+            UltimateGrid, a starting Mark (default X) and the active board.
+        max_depth (int, optional): Maximum depth of the search in plies. Defaults to 8.
+        time_limit (float | None, optional): Seconds available for the search, None for no
+            limit. Defaults to None.
+        cancelled (threading.Event | None, optional): Event set when the search must stop
+            before the next root move. Defaults to None.
+
+    Returns:
+        UltimateMove | None: The best move found or None if the game is over.
+    """
+    moves = game_state.legal_moves
+    if not moves:
+        return None
+    deadline = None if time_limit is None else time.monotonic() + time_limit
+    mine, theirs = game_state.grid.x_bits, game_state.grid.o_bits
+    mine_boards, theirs_boards = game_state.x_boards, game_state.o_boards
+    if game_state.current_mark is Mark.NAUGHT:
+        mine, theirs = theirs, mine
+        mine_boards, theirs_boards = theirs_boards, mine_boards
+    closed = game_state.closed_boards
+
+    def move_score(index: int, depth: int, alpha: int) -> int:
+        return _ultimate_move_score(
+            mine, theirs, mine_boards, theirs_boards, closed, index, depth, alpha, deadline
+        )
+
+    return game_state.make_move_to(
+        _deepen(moves, max_depth, ULTIMATE_WIN_SCORE, move_score, cancelled)
     )
+
+def _deepen(
+    moves: list[int],
+    max_depth: int,
+    win_score: int,
+    move_score: Callable[[int, int, int], int],
+    cancelled: threading.Event | None = None,
+) -> int:
+    """Return the best move of an iterative deepening search. Each iteration tries first the
+    best move of the previous one, and stops at the first iteration that finds a win or a loss.
+    The search also stops before the next root move once it is cancelled.
+
+    Args:
+        moves (list[int]): Indexes of the moves available, in the order to try them.
+        max_depth (int): Maximum depth of the search in plies.
+        win_score (int): Lowest score of a won position.
+        move_score (Callable[[int, int, int], int]): Function returning the score of a move
+            given its index, the depth and the score already guaranteed.
+        cancelled (threading.Event | None, optional): Event set when the search must stop.
+            Defaults to None.
+
+    Returns:
+        int: Index of the best move of the deepest iteration completed before a timeout or
+            a cancellation.
+    """
+    best_index = moves[0]
+    for depth in range(1, max_depth + 1):
+        ordered = [best_index] + [index for index in moves if index != best_index]
+        alpha = -win_score * 2
+        depth_best = best_index
+        try:
+            for index in ordered:
+                if cancelled is not None and cancelled.is_set():
+                    raise SearchTimeout("Search was cancelled")
+                score = move_score(index, depth, alpha)
+                if score > alpha:
+                    alpha, depth_best = score, index
+        except SearchTimeout:
+            break
+        best_index = depth_best
+        if abs(alpha) >= win_score:
+            break
+    return best_index
+
+def _ultimate_move_score(
+    mine: int,
+    theirs: int,
+    mine_boards: int,
+    theirs_boards: int,
+    closed: int,
+    index: int,
+    depth: int,
+    alpha: int,
+    deadline: float | None,
+) -> int:
+    """Play a move for the player to move and return its negamax score.
+
+    Args:
+        mine (int): 81-bit integer of the cells of the player to move.
+        theirs (int): 81-bit integer of the cells of the opponent.
+        mine_boards (int): Mask of the sub-boards won by the player to move.
+        theirs_boards (int): Mask of the sub-boards won by the opponent.
+        closed (int): Mask of the won or full sub-boards.
+        index (int): Cell to play.
+        depth (int): Remaining depth, including this move.
+        alpha (int): Score already guaranteed to the player to move.
+        deadline (float | None): Monotonic time when the search must stop.
+
+    Returns:
+        int: Score of the move for the player to move.
+    """
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    # The position is passed as plain integers so the search allocates nothing per node.
+    board, cell = divmod(index, 9)
+    mine |= 1 << index
+    if WON[(mine >> 9 * board) & FULL_BOARD]:
+        mine_boards |= 1 << board
+        closed |= 1 << board
+        if WON[mine_boards]:
+            return ULTIMATE_WIN_SCORE + depth
+    elif ((mine | theirs) >> 9 * board) & FULL_BOARD == FULL_BOARD:
+        closed |= 1 << board
+    if closed == FULL_BOARD:
+        return 0
+    return -_ultimate_negamax(
+        theirs, mine, theirs_boards, mine_boards, closed,
+        None if closed >> cell & 1 else cell,
+        depth - 1, -ULTIMATE_WIN_SCORE * 2, -alpha, deadline,
+    )
+
+def _ultimate_negamax(
+    mine: int,
+    theirs: int,
+    mine_boards: int,
+    theirs_boards: int,
+    closed: int,
+    active: int | None,
+    depth: int,
+    alpha: int,
+    beta: int,
+    deadline: float | None,
+) -> int:
+    """Return the alpha-beta negamax score of a position for the player to move.
+
+    Args:
+        mine (int): 81-bit integer of the cells of the player to move.
+        theirs (int): 81-bit integer of the cells of the opponent.
+        mine_boards (int): Mask of the sub-boards won by the player to move.
+        theirs_boards (int): Mask of the sub-boards won by the opponent.
+        closed (int): Mask of the won or full sub-boards.
+        active (int | None): Sub-board where the move must be played, None for any.
+        depth (int): Remaining depth.
+        alpha (int): Lower bound of the score.
+        beta (int): Upper bound of the score.
+        deadline (float | None): Monotonic time when the search must stop.
+
+    Raises:
+        SearchTimeout: Exception when the deadline is reached.
+
+    Returns:
+        int: Score of the position for the player to move.
+    """
+    # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+    # The position is passed as plain integers so the search allocates nothing per node.
+    if deadline is not None and time.monotonic() > deadline:
+        raise SearchTimeout("Search ran out of time")
+    if depth == 0:
+        return _ultimate_evaluate(mine, theirs, mine_boards, theirs_boards, closed)
+    allowed = OPEN_CELLS[closed] if active is None else BOARD_MASKS[active]
+    empty = allowed & ~(mine | theirs)
+    best = -ULTIMATE_WIN_SCORE * 2
+    while empty:
+        lowest = empty & -empty
+        empty ^= lowest
+        board, cell = divmod(lowest.bit_length() - 1, 9)
+        new_mine = mine | lowest
+        new_boards, new_closed = mine_boards, closed
+        if WON[(new_mine >> 9 * board) & FULL_BOARD]:
+            new_boards |= 1 << board
+            new_closed |= 1 << board
+            if WON[new_boards]:
+                return ULTIMATE_WIN_SCORE + depth
+        elif ((new_mine | theirs) >> 9 * board) & FULL_BOARD == FULL_BOARD:
+            new_closed |= 1 << board
+        if new_closed == FULL_BOARD:
+            score = 0
+        else:
+            score = -_ultimate_negamax(
+                theirs, new_mine, theirs_boards, new_boards, new_closed,
+                None if new_closed >> cell & 1 else cell,
+                depth - 1, -beta, -alpha, deadline,
+            )
+        if score > best:
+            best = score
+            if score > alpha:
+                alpha = score
+                if alpha >= beta:
+                    break
+    return best
+
+def _ultimate_evaluate(
+    mine: int, theirs: int, mine_boards: int, theirs_boards: int, closed: int
+) -> int:
+    """Return the heuristic score of a position for the player to move. Lines of sub-boards
+    still open to a player weigh more than lines of cells inside the open sub-boards.
+
+    Args:
+        mine (int): 81-bit integer of the cells of the player to move.
+        theirs (int): 81-bit integer of the cells of the opponent.
+        mine_boards (int): Mask of the sub-boards won by the player to move.
+        theirs_boards (int): Mask of the sub-boards won by the opponent.
+        closed (int): Mask of the won or full sub-boards.
+
+    Returns:
+        int: Heuristic score for the player to move.
+    """
+    score = 32 * (
+        _line_potential(mine_boards, closed & ~mine_boards)
+        - _line_potential(theirs_boards, closed & ~theirs_boards)
+    )
+    for board in range(9):
+        if not closed >> board & 1:
+            mine_cells = (mine >> 9 * board) & FULL_BOARD
+            theirs_cells = (theirs >> 9 * board) & FULL_BOARD
+            score += _line_potential(mine_cells, theirs_cells) - _line_potential(
+                theirs_cells, mine_cells
+            )
+    return score
+
+@functools.cache
+def _line_potential(own: int, blocked: int) -> int:
+    """Return the weighted count of the lines of a 3x3 board still open to a player.
+
+    Args:
+        own (int): 9-bit integer of the cells of the player.
+        blocked (int): 9-bit integer of the cells the player can no longer use.
+
+    Returns:
+        int: Sum of the weights of the open lines, by number of cells already owned.
+    """
+    return sum(
+        LINE_WEIGHTS[(own & line).bit_count()]
+        for line in LINE_MASKS
+        if not blocked & line
+    )
+
+def find_qubic_move(
+    game_state: QubicGameState,
+    max_depth: int = 4,
+    time_limit: float | None = None,
+    cancelled: threading.Event | None = None,
+) -> QubicMove | None:
+    """Return the best move found by threat detection and a bounded search in Qubic. A
+    winning cell is played at once and a single threat of the opponent is blocked at once.
+    Otherwise an iterative deepening alpha-beta negamax runs over the 64-bit integers of the
+    marks, where forced blocks are searched beyond the depth limit, and the result of the
+    deepest iteration completed before the time limit is returned.
+
+    Args:
+        game_state (QubicGameState): current QubicGameState, consisting of a current QubicGrid
+            and a starting Mark (default X).
+        max_depth (int, optional): Maximum depth of the search in plies. Defaults to 4.
+        time_limit (float | None, optional): Seconds available for the search, None for no
+            limit. Defaults to None.
+        cancelled (threading.Event | None, optional): Event set when the search must stop
+            before the next root move. Defaults to None.
+
+    Returns:
+        QubicMove | None: The best move found or None if the game is over.
+    """
+    if game_state.game_over:
+        return None
+    mine, theirs = game_state.grid.x_bits, game_state.grid.o_bits
+    if game_state.current_mark is Mark.NAUGHT:
+        mine, theirs = theirs, mine
+    forced = threats(mine, theirs) or threats(theirs, mine)
+    if forced:
+        return game_state.make_move_to((forced & -forced).bit_length() - 1)
+    deadline = None if time_limit is None else time.monotonic() + time_limit
+    empty = FULL_CUBE & ~(mine | theirs)
+    moves = [index for index in CELL_ORDER if empty >> index & 1]
+
+    def move_score(index: int, depth: int, alpha: int) -> int:
+        return -_qubic_negamax(
+            theirs, mine | 1 << index, index, depth - 1, -QUBIC_WIN_SCORE * 2, -alpha, deadline
+        )
+
+    return game_state.make_move_to(
+        _deepen(moves, max_depth, QUBIC_WIN_SCORE, move_score, cancelled)
+    )
+
+def _qubic_negamax(
+    mine: int,
+    theirs: int,
+    last: int,
+    depth: int,
+    alpha: int,
+    beta: int,
+    deadline: float | None,
+) -> int:
+    """Return the alpha-beta negamax score of a Qubic position for the player to move. Only the
+    lines through the last move are checked for a win.
+
+    Args:
+        mine (int): 64-bit integer of the cells of the player to move.
+        theirs (int): 64-bit integer of the cells of the opponent, who just moved.
+        last (int): Cell of the last move of the opponent.
+        depth (int): Remaining depth, forced blocks are searched below zero.
+        alpha (int): Lower bound of the score.
+        beta (int): Upper bound of the score.
+        deadline (float | None): Monotonic time when the search must stop.
+
+    Raises:
+        SearchTimeout: Exception when the deadline is reached.
+
+    Returns:
+        int: Score of the position for the player to move.
+    """
+    # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-branches
+    # The position is passed as plain integers so the search allocates nothing per node.
+    if deadline is not None and time.monotonic() > deadline:
+        raise SearchTimeout("Search ran out of time")
+    for line in CELL_LINES[last]:
+        if theirs & line == line:
+            return -QUBIC_WIN_SCORE - depth
+    empty = FULL_CUBE & ~(mine | theirs)
+    if not empty:
+        return 0
+    if threats(mine, theirs):
+        return QUBIC_WIN_SCORE + depth
+    candidates = threats(theirs, mine)
+    if candidates & (candidates - 1):
+        return -QUBIC_WIN_SCORE - depth
+    if not candidates:
+        if depth <= 0:
+            return _qubic_evaluate(mine, theirs)
+        candidates = empty
+    best = -QUBIC_WIN_SCORE * 2
+    for index in CELL_ORDER:
+        if candidates >> index & 1:
+            score = -_qubic_negamax(
+                theirs, mine | 1 << index, index, depth - 1, -beta, -alpha, deadline
+            )
+            if score > best:
+                best = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+    return best
+
+def _qubic_evaluate(mine: int, theirs: int) -> int:
+    """Return the heuristic score of a Qubic position for the player to move, the weighted
+    count of the lines still open to each player.
+
+    Args:
+        mine (int): 64-bit integer of the cells of the player to move.
+        theirs (int): 64-bit integer of the cells of the opponent.
+
+    Returns:
+        int: Heuristic score for the player to move.
+    """
+    score = 0
+    for line in QUBIC_LINE_MASKS:
+        if not theirs & line:
+            score += QUBIC_LINE_WEIGHTS[(mine & line).bit_count()]
+        elif not mine & line:
+            score -= QUBIC_LINE_WEIGHTS[(theirs & line).bit_count()]
+    return score
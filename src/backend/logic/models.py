@@ -1,32 +1,29 @@
 """Provide the classes for domain model.
 
-This module allows the creation of intances of Marks, Grids, Move and GameState.
+This module allows the creation of intances of Marks, Grids, Move and GameState. The rules of a
+game state come from its rule set, compiled into lookup tables, so finding the winner is a
+table lookup on the bits of each mark.
 
 The module contains the following class:
 - `Mark` - A class that handles user marks.
 - `Grid` - A inmutable Class that handles the grid information.
 - `Move` - A inmutable data class that handles move information.
+- `GameStateMixin` - A mixin with the behaviour shared by the game states of every variant.
 - `GameState` - A inmutable data class that handles game state information.
 """
 import enum
 import random
-import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from functools import cached_property
+from typing import Any
 
 from backend.logic.exceptions import InvalidMove, UnknownGameScore
+from backend.logic.rules import STANDARD_RULES, RuleSet
 from backend.logic.validators import validate_game_state, validate_grid
+from backend.logic.zobrist import CLASSIC_ZOBRIST
 
-WINNING_PATTERNS = (
-    "???......",
-    "...???...",
-    "......???",
-    "?..?..?..",
-    ".?..?..?.",
-    "..?..?..?",
-    "?...?...?",
-    "..?.?.?..",
-)
+X_BITS = str.maketrans("XO ", "100")
+O_BITS = str.maketrans("XO ", "010")
 
 class Mark(enum.StrEnum):
     """A class that handles user marks. it can be CROSS or X, or NAUGHT or O. Extends enum.StrEnum
@@ -52,60 +49,69 @@ class Mark(enum.StrEnum):
         """
         return Mark.CROSS if self is Mark.NAUGHT else Mark.NAUGHT
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Grid:
     """An inmutable Class that handles the grid. It is instantiate as a empty grid 9 spaces as
     default. It runs as Post instantiation hook that verifies that grid composition. Allowed
-    cell position: 9 elements (X, O, or space).
+    cell position: 9 elements (X, O, or space). Grids use slots instead of a dict, and the
+    cells of each mark are computed once as bits, from which the counts are read.
 
     Attributes:
         cells: str
             Represents the grid, 9 elements X, O or space.
+        x_bits: int
+            The cells of X, bit i set when X occupies cell i.
+        o_bits: int
+            The cells of O, bit i set when O occupies cell i.
 
     Methods:
         x_count(self) -> int:
-            Cached getter of total of X.
+            Getter of total of X.
         o_count(self) -> int:
-            Cached getter of total of O
+            Getter of total of O
         empty_count(self) -> int:
-            Cached getter of total of spaces
+            Getter of total of spaces
 
     Raises:
         ValueError: Raises ValueError if
     """
     cells: str = " " * 9
+    x_bits: int = field(init=False, repr=False, compare=False)
+    o_bits: int = field(init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         """Post instantiation hook that verifies that the grid is compose of 9 elements (X, O, or
-        space)"""
+        space) and computes the cells of each mark"""
         validate_grid(self)
+        object.__setattr__(self, "x_bits", int(self.cells.translate(X_BITS)[::-1], 2))
+        object.__setattr__(self, "o_bits", int(self.cells.translate(O_BITS)[::-1], 2))
 
-    @cached_property
+    @property
     def x_count(self) -> int:
-        """Cached getter of total of X
+        """Getter of total of X
 
         Returns:
             int: Total of X
         """
-        return self.cells.count("X")
+        return self.x_bits.bit_count()
 
-    @cached_property
+    @property
     def o_count(self) -> int:
-        """Cached getter of total of O
+        """Getter of total of O
 
         Returns:
             int: Total of Y
         """
-        return self.cells.count("O")
+        return self.o_bits.bit_count()
 
-    @cached_property
+    @property
     def empty_count(self) -> int:
-        """Cached getter of total of spaces
+        """Getter of total of spaces
 
         Returns:
             int: Total of spaces
         """
-        return self.cells.count(" ")
+        return 9 - (self.x_bits | self.o_bits).bit_count()
 
 @dataclass(frozen=True)
 class Move:
@@ -115,21 +121,114 @@ class Move:
 
     Attributes:
         mark: Mark
-            Represent the mark of the player.
+            Represent the mark placed, the mark of the player unless the rules are wild.
         cell_index: int
             Represent the position to play.
         before_state: "GameState"
             Represent the game state before the move.
         after_state: "GameState"
             Represent the game state after the move.
+
+    Methods:
+        code(self) -> int:
+            Getter of the code of the move, the cell index plus 9 when the mark placed is not
+            the mark of the player.
     """
     mark: Mark
     cell_index: int
     before_state: "GameState"
     after_state: "GameState"
 
+    @property
+    def code(self) -> int:
+        """Getter of the code of the move, the cell index plus 9 when the mark placed is not
+        the mark of the player, which only happens with wild rules.
+
+        Returns:
+            int: Code from 0 to 17.
+        """
+        if self.mark is self.before_state.current_mark:
+            return self.cell_index
+        return self.cell_index + 9
+
+class GameStateMixin:
+    """A mixin with the behaviour shared by the game states of every variant, based on their
+    cached getters.
+
+    Methods:
+        release_moves(self) -> None:
+            Drop the cached possible moves.
+        make_random_move(self, rng: random.Random | None = None) -> Any:
+            Return possible move based on possible moves.
+        evaluate_score(self, mark: Mark) -> int:
+            Returns score based on the result of the move.
+        bits_after_move(self, index: int) -> tuple[int, int]:
+            Return the bits of X and O after the player to move plays a cell.
+    """
+    grid: Any
+    current_mark: Mark
+    game_over: bool
+    tie: bool
+    winner: Mark | None
+    possible_moves: list[Any]
+
+    def release_moves(self) -> None:
+        """Drop the cached possible moves, so the states they hold, and every state searched
+        from them, can be freed. They are built again when needed.
+        """
+        self.__dict__.pop("possible_moves", None)
+
+    def make_random_move(self, rng: random.Random | None = None) -> Any:
+        """Return possible move based on possible moves.
+
+        Args:
+            rng (random.Random | None, optional): Random generator of the choice, None for
+                the random module. Defaults to None.
+
+        Returns:
+            Any: Snapshot of moves, None if the game is over.
+        """
+        try:
+            return (rng or random).choice(self.possible_moves)
+        except IndexError:
+            return None
+
+    def evaluate_score(self, mark: Mark) -> int:
+        """Returns score based on the result of the move.
+
+        Args:
+            mark (Mark): Class that handles user marks.
+
+        Raises:
+            UnknownGameScore: Exception when no score can be calculated.
+
+        Returns:
+            int: score for the game.
+        """
+        if self.game_over:
+            if self.tie:
+                return 0
+            if self.winner is mark:
+                return 1
+            return -1
+        raise UnknownGameScore("Game is not over yet")
+
+    def bits_after_move(self, index: int) -> tuple[int, int]:
+        """Return the bits of X and O after the player to move plays a cell.
+
+        Args:
+            index (int): Position of the move.
+
+        Returns:
+            tuple[int, int]: Integers of the cells of X and of O, one bit per cell.
+        """
+        x_bits, o_bits = self.grid.x_bits, self.grid.o_bits
+        if self.current_mark is Mark.CROSS:
+            return x_bits | 1 << index, o_bits
+        return x_bits, o_bits | 1 << index
+
 @dataclass(frozen=True)
-class GameState:
+class GameState(GameStateMixin):
     """An inmutable data Class that is strictly a data transfer object (DTO) whose main purpose
     is to carry data, consisting of the grid of cells and the starting player's mark
 
@@ -138,6 +237,11 @@ class GameState:
             Represents the grid, 9 elements X, O or space
         starting_mark: Mark = Mark("X")
             Represent the starting mark. Default to X
+        rules: RuleSet = STANDARD_RULES
+            Represent the rules of the game. Default to the standard rules
+        zobrist_hash: int | None = None
+            64-bit Zobrist hash of the position. Computed from the grid and the rules when
+            not given, and updated with a single XOR by make_move_to. Not part of equality.
 
     Methods:
         current_mark(self) -> Mark:
@@ -150,32 +254,54 @@ class GameState:
         tie(self) -> bool:
             Cached getter to check if there is a tie by checking if
             there is a winner or grid is empty.
+        line_mark(self) -> Mark | None:
+            Cached getter of the mark of the completed line, if any.
         winner(self) -> Mark | None:
-            Cached getter that check if there is a winner by checking winning patterns.
+            Cached getter that check if there is a winner by checking the lines of the rules.
+        winning_cells(self) -> list[int]:
+            Cached getter of the cells of the completed line.
         possible_moves(self) -> list[Move]:
             Cached getter of possible moves.
-        make_random_move(self) -> Move | None:
+        release_moves(self) -> None:
+            Drop the cached possible moves.
+        make_random_move(self, rng: random.Random | None = None) -> Move | None:
             Return possible move based on possible moves.
-        make_move_to(self, index: int) -> Move:
+        make_move_to(self, index: int, mark: Mark | None = None) -> Move:
             Return the move to make based on index.
+        move_from_code(self, code: int) -> Move:
+            Return the move of a move code.
         evaluate_score(self, mark: Mark) -> int:
             Returns score based on the result of the move.
     """
     grid: Grid
     starting_mark: Mark = Mark("X")
+    rules: RuleSet = STANDARD_RULES
+    zobrist_hash: int | None = field(default=None, compare=False, repr=False)
 
     def __post_init__(self) -> None:
-        """Post instantiation hook that verifies that the gamestate is correct
+        """Post instantiation hook that verifies that the gamestate is correct and computes
+        its Zobrist hash when not given
         """
         validate_game_state(self)
+        if self.zobrist_hash is None:
+            object.__setattr__(
+                self,
+                "zobrist_hash",
+                CLASSIC_ZOBRIST.hash_cells(self.grid.cells, self.starting_mark)
+                ^ self.rules.zobrist_salt,
+            )
 
     @cached_property
     def current_mark(self) -> Mark:
-        """Cached getter of current mark.
+        """Cached getter of current mark, the mark of the player to move.
 
         Returns:
             Mark: Mark of current state.
         """
+        if self.rules.wild:
+            if self.grid.empty_count % 2:
+                return self.starting_mark
+            return self.starting_mark.other
         if self.grid.x_count == self.grid.o_count:
             return self.starting_mark
         return self.starting_mark.other
@@ -210,63 +336,72 @@ class GameState:
         return self.winner is None and self.grid.empty_count == 0
 
     @cached_property
-    def winner(self) -> Mark | None:
-        """Cached getter that check if there is a winner by checking winning patterns.
+    def line_mark(self) -> Mark | None:
+        """Cached getter of the mark of the completed line, if any.
 
         Returns:
             Mark | None: Could be X, O or None.
         """
-        for pattern in WINNING_PATTERNS:
-            for mark in Mark:
-                if re.match(pattern.replace("?", mark), self.grid.cells):
-                    return mark
+        x_line = self.rules.completed[self.grid.x_bits]
+        o_line = self.rules.completed[self.grid.o_bits]
+        if x_line and not 0 < o_line < x_line:
+            return Mark.CROSS
+        if o_line:
+            return Mark.NAUGHT
         return None
 
     @cached_property
-    def winning_cells(self) -> list[int]:
-        """Chaced getter with information of position of marks in winning cell
+    def winner(self) -> Mark | None:
+        """Cached getter that check if there is a winner by checking the lines of the rules.
+        The player who completes a line wins, or loses with misère rules.
 
         Returns:
-            list[int]: List of positions of marks in winning cell
+            Mark | None: Could be X, O or None.
         """
-        for pattern in WINNING_PATTERNS:
-            for mark in Mark:
-                if re.match(pattern.replace("?", mark), self.grid.cells):
-                    return [
-                        match.start()
-                        for match in re.finditer(r"\?", pattern)
-                    ]
-        return []
+        if self.line_mark is None:
+            return None
+        player = self.current_mark.other if self.rules.wild else self.line_mark
+        return player.other if self.rules.misere else player
 
     @cached_property
-    def possible_moves(self) -> list[Move]:
-        """Cached getter of possible moves.
+    def winning_cells(self) -> list[int]:
+        """Chaced getter with information of position of marks in the completed line
 
         Returns:
-            list[Move]: list of possible moves
+            list[int]: List of positions of marks in the completed line
         """
-        moves = []
-        if not self.game_over:
-            for match in re.finditer(r"\s", self.grid.cells):
-                moves.append(self.make_move_to(match.start()))
-        return moves
+        if self.line_mark is None:
+            return []
+        bits = self.grid.x_bits if self.line_mark is Mark.CROSS else self.grid.o_bits
+        return list(self.rules.lines[self.rules.completed[bits] - 1])
 
-    def make_random_move(self) -> Move | None:
-        """Return possible move based on possible moves.
+    @cached_property
+    def possible_moves(self) -> list[Move]:
+        """Cached getter of possible moves. With wild rules, each empty cell can take the mark
+        of the player, then the other mark.
 
         Returns:
-            Move | None: Snapshot of moves.
+            list[Move]: list of possible moves
         """
-        try:
-            return random.choice(self.possible_moves)
-        except IndexError:
-            return None
-
-    def make_move_to(self, index: int) -> Move:
+        if self.game_over:
+            return []
+        marks = (self.current_mark,)
+        if self.rules.wild:
+            marks = (self.current_mark, self.current_mark.other)
+        return [
+            self.make_move_to(index, mark)
+            for index, cell in enumerate(self.grid.cells)
+            if cell == " "
+            for mark in marks
+        ]
+
+    def make_move_to(self, index: int, mark: Mark | None = None) -> Move:
         """Return the move to make based on index.
 
         Args:
             index (int): Position of the move.
+            mark (Mark | None, optional): Mark to place, only another mark than the mark of
+                the player with wild rules. Defaults to the mark of the player.
 
         Raises:
             InvalidMove: Exception when a invalid move is selected
@@ -276,36 +411,34 @@ class GameState:
         """
         if self.grid.cells[index] != " ":
             raise InvalidMove("Cell is not empty")
+        if mark is None:
+            mark = self.current_mark
+        elif mark is not self.current_mark and not self.rules.wild:
+            raise InvalidMove("Wrong mark")
         return Move(
-            mark=self.current_mark,
+            mark=mark,
             cell_index=index,
             before_state=self,
             after_state=GameState(
-                Grid(
-                    self.grid.cells[:index]
-                    + self.current_mark
-                    + self.grid.cells[index + 1:]
-                ),
+                Grid(self.grid.cells[:index] + mark + self.grid.cells[index + 1:]),
                 self.starting_mark,
+                self.rules,
+                self.zobrist_hash ^ CLASSIC_ZOBRIST.key(index, mark),
             ),
         )
 
-    def evaluate_score(self, mark: Mark) -> int:
-        """Returns score based on the result of the move.
+    def move_from_code(self, code: int) -> Move:
+        """Return the move of a move code, as given by Move.code.
 
         Args:
-            mark (Mark): Class that handles user marks.
+            code (int): Cell index, plus 9 to place the mark of the other player.
 
         Raises:
-            UnknownGameScore: Exception when no score can be calculated.
+            InvalidMove: Exception when a invalid move is selected
 
         Returns:
-            int: score for the game.
+            Move: Snapshot of moves
         """
-        if self.game_over:
-            if self.tie:
-                return 0
-            if self.winner is mark:
-                return 1
-            return -1
-        raise UnknownGameScore("Game is not over yet")
+        if code < 9:
+            return self.make_move_to(code)
+        return self.make_move_to(code - 9, self.current_mark.other)
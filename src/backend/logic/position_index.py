@@ -0,0 +1,291 @@
+"""Provide an index of the reachable positions of the classic game for puzzle and analysis
+queries.
+
+This module allows questions like "every position where O forces a win in at most 3 moves,
+with exactly 4 marks" to be answered without searching. The index is built once over the
+state graph and holds a column per property of the positions. Each value of a column is also
+kept as a bitmap, an integer with bit i set when node i has that value, so a query is a few
+bitwise operations over the bitmaps of its filters, and only the matching positions are turned
+into game states.
+
+Examples:
+
+    >>> from backend.logic.position_index import PositionIndex
+    >>> from backend.logic.models import Mark
+    >>> index = PositionIndex()
+    >>> index.count(result="O", max_distance=6, marks=4)
+    36
+    >>> puzzle = next(index.positions(result="X", to_move=Mark("X"), max_distance=1,
+    ...     winning_moves=1, canonical=True))
+    >>> puzzle.grid.cells
+    'XO XO    '
+
+The module contains the following classes:
+- `QueryFilters` - A inmutable data class with the filters of a query.
+- `PositionIndex` - An index of the positions of a state graph, with bitmaps per column.
+"""
+
+from array import array
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+from backend.logic.book import SYMMETRIES
+from backend.logic.graph import StateGraph
+from backend.logic.models import GameState, Mark
+
+RESULTS = ("X", "O", "tie")
+
+@dataclass(frozen=True)
+class QueryFilters:
+    """An inmutable data class that is strictly a data transfer object (DTO) whose main purpose
+    is to carry the filters of a query. Filters left to None match every position.
+
+    Attributes:
+        value: int | None = None
+            Value for the player to move.
+        result: str | None = None
+            Result with best play, X, O or tie.
+        to_move: Mark | None = None
+            Mark of the player to move.
+        marks: int | None = None
+            Number of marks on the grid.
+        x_count: int | None = None
+            Number of X.
+        o_count: int | None = None
+            Number of O.
+        min_distance: int | None = None
+            Fewest plies to the end of the game.
+        max_distance: int | None = None
+            Most plies to the end of the game, 2n - 1 for a win in n moves of the player to
+            move.
+        winning_moves: int | None = None
+            Number of winning moves, 1 for puzzles with a single solution.
+        symmetry_class: int | None = None
+            Symmetry class of the positions.
+        canonical: bool = False
+            Rather to keep one position per symmetry class.
+
+    Methods:
+        column_values(self) -> Iterator[tuple[str, int]]:
+            Return the column and value of every filter on a single value.
+    """
+    # pylint: disable=too-many-instance-attributes
+    # One field per filter of a query, like the keyword arguments it is built from.
+    value: int | None = None
+    result: str | None = None
+    to_move: Mark | None = None
+    marks: int | None = None
+    x_count: int | None = None
+    o_count: int | None = None
+    min_distance: int | None = None
+    max_distance: int | None = None
+    winning_moves: int | None = None
+    symmetry_class: int | None = None
+    canonical: bool = False
+
+    def __post_init__(self) -> None:
+        """Post instantiation hook that verifies that the result is valid"""
+        if self.result is not None and self.result not in RESULTS:
+            raise ValueError("Result must be X, O or tie")
+
+    def column_values(self) -> Iterator[tuple[str, int]]:
+        """Return the column and value of every filter on a single value, as stored in the
+        columns of the index.
+
+        Yields:
+            Iterator[tuple[str, int]]: Name of the column and value of the filter.
+        """
+        filters = (
+            ("values", self.value),
+            ("results", None if self.result is None else RESULTS.index(self.result)),
+            ("to_move", None if self.to_move is None else int(self.to_move is Mark.NAUGHT)),
+            ("marks", self.marks),
+            ("x_counts", self.x_count),
+            ("o_counts", self.o_count),
+            ("winning_moves", self.winning_moves),
+            ("symmetry_classes", self.symmetry_class),
+        )
+        for column, column_value in filters:
+            if column_value is not None:
+                yield column, column_value
+
+class PositionIndex:
+    """An index of the positions of a state graph, with a column per property and a bitmap
+    per value of each column. Columns are indexed by node id. Values and results assume best
+    play from the position, distances are in plies.
+
+    Attributes:
+        graph: StateGraph
+            Graph of the positions.
+        values: array
+            Minimax value for the player to move, 1, 0 or -1.
+        results: array
+            Result with best play, index in RESULTS: X wins, O wins or tie.
+        distances: array
+            Plies to the end of the game with best play: the winner ends the game as soon as
+            possible, the loser as late as possible, and a tie fills the grid.
+        x_counts: array
+            Number of X.
+        o_counts: array
+            Number of O.
+        to_move: array
+            Mark of the player to move, 0 for X and 1 for O.
+        symmetry_classes: array
+            Smallest id of the positions equal to the node by a symmetry of the grid.
+        winning_moves: array
+            Number of moves that win with best play for the player to move.
+
+    Methods:
+        query(self, **filters: Any) -> list[int]:
+            Return the ids of the positions matching every filter given.
+        count(self, **filters: Any) -> int:
+            Return the number of positions matching the filters.
+        positions(self, **filters: Any) -> Iterator[GameState]:
+            Return the game states of the positions matching the filters.
+    """
+    # pylint: disable=too-many-instance-attributes
+    # Each property of the positions is a public column of its own, indexed by node id.
+    def __init__(self, graph: StateGraph | None = None) -> None:
+        """
+        Args:
+            graph (StateGraph | None, optional): Graph of the positions. Defaults to the graph
+                of the games started by X with the standard rules.
+        """
+        self.graph = StateGraph() if graph is None else graph
+        size = len(self.graph)
+        self.values = self.graph.solve()
+        self.distances = array("B", bytes(size))
+        self.winning_moves = array("B", bytes(size))
+        for node in reversed(range(size)):
+            children = self.graph.successors(node)
+            if not children:
+                continue
+            value = self.values[node]
+            if value == 1:
+                winning = [child for child in children if self.values[child] == -1]
+                self.winning_moves[node] = len(winning)
+                self.distances[node] = 1 + min(self.distances[child] for child in winning)
+            elif value == -1:
+                self.distances[node] = 1 + max(self.distances[child] for child in children)
+            else:
+                self.distances[node] = 9 - self.graph.plies[node]
+        starting = int(self.graph.starting_mark is Mark.NAUGHT)
+        self.to_move = array("B", ((ply + starting) % 2 for ply in self.graph.plies))
+        self.results = array(
+            "B",
+            (
+                2 if value == 0 else mover ^ (value == -1)
+                for value, mover in zip(self.values, self.to_move)
+            ),
+        )
+        cells = [self.graph.cells(node) for node in range(size)]
+        self.x_counts = array("B", (node_cells.count("X") for node_cells in cells))
+        self.o_counts = array("B", (node_cells.count("O") for node_cells in cells))
+        self.symmetry_classes = array(
+            "I",
+            (
+                min(
+                    self.graph.id_of_cells("".join(node_cells[index] for index in symmetry))
+                    for symmetry in SYMMETRIES
+                )
+                for node_cells in cells
+            ),
+        )
+        self._all = (1 << size) - 1
+        self._bitmaps = {
+            name: _bitmaps(getattr(self, name))
+            for name in (
+                "values", "results", "distances", "x_counts", "o_counts", "to_move",
+                "winning_moves", "symmetry_classes",
+            )
+        }
+        self._bitmaps["marks"] = _bitmaps(self.graph.plies)
+        self._canonical = sum(
+            1 << node for node, symmetry_class in enumerate(self.symmetry_classes)
+            if symmetry_class == node
+        )
+
+    def query(self, **filters: Any) -> list[int]:
+        """Return the ids of the positions matching every filter given. Filters left out
+        match every position.
+
+        Args:
+            **filters (Any): Keyword arguments of QueryFilters, like result="X" or marks=4.
+
+        Raises:
+            TypeError: Exception when a filter is unknown.
+            ValueError: Exception when the result is not X, O or tie.
+
+        Returns:
+            list[int]: Ids of the nodes, in increasing order.
+        """
+        mask = self._mask(QueryFilters(**filters))
+        ids = []
+        while mask:
+            lowest = mask & -mask
+            ids.append(lowest.bit_length() - 1)
+            mask ^= lowest
+        return ids
+
+    def count(self, **filters: Any) -> int:
+        """Return the number of positions matching the filters.
+
+        Args:
+            **filters (Any): Keyword arguments of QueryFilters.
+
+        Returns:
+            int: Number of positions.
+        """
+        return self._mask(QueryFilters(**filters)).bit_count()
+
+    def positions(self, **filters: Any) -> Iterator[GameState]:
+        """Return the game states of the positions matching the filters, built one at a time
+        as they are consumed.
+
+        Args:
+            **filters (Any): Keyword arguments of QueryFilters.
+
+        Yields:
+            Iterator[GameState]: Positions in increasing order of id.
+        """
+        for node in self.query(**filters):
+            yield self.graph.game_state(node)
+
+    def _mask(self, filters: QueryFilters) -> int:
+        """Return the bitmap of the positions matching every filter.
+
+        Args:
+            filters (QueryFilters): Filters of the query.
+
+        Returns:
+            int: Bit i set when node i matches.
+        """
+        mask = self._all
+        for column, column_value in filters.column_values():
+            mask &= self._bitmaps[column].get(column_value, 0)
+        if filters.min_distance is not None or filters.max_distance is not None:
+            low = 0 if filters.min_distance is None else filters.min_distance
+            high = 9 if filters.max_distance is None else filters.max_distance
+            for distance, bitmap in self._bitmaps["distances"].items():
+                if not low <= distance <= high:
+                    mask &= ~bitmap
+        if filters.canonical:
+            mask &= self._canonical
+        return mask
+
+def _bitmaps(column: array) -> dict[int, int]:
+    """Return the bitmap of every value of a column.
+
+    Args:
+        column (array): Value of every node.
+
+    Returns:
+        dict[int, int]: Integer with bit i set when node i has the value, by value.
+    """
+    nodes: dict[int, list[int]] = {}
+    for node, column_value in enumerate(column):
+        nodes.setdefault(column_value, []).append(node)
+    return {
+        column_value: sum(1 << node for node in value_nodes)
+        for column_value, value_nodes in nodes.items()
+    }
@@ -0,0 +1,329 @@
+"""Provide the classes for the domain model of Qubic, 3D Tic Tac Toe in a 4x4x4 cube.
+
+This module allows the creation of intances of QubicGrid, QubicMove and QubicGameState. The 64
+cells are indexed as 16 * layer + 4 * row + column and each mark is stored as a 64-bit integer,
+one bit per cell. The 76 winning lines are precomputed as bit masks, so checking a line is a
+single AND, and the lines through each cell are precomputed too, so a move only needs to check
+the lines it belongs to.
+
+Examples:
+
+    >>> game_state = QubicGameState(QubicGrid())
+    >>> len(LINE_MASKS)
+    76
+    >>> game_state.make_move_to(0).after_state.grid.x_count
+    1
+
+The module contains the following class:
+- `QubicGrid` - A inmutable Class that handles the grid information.
+- `QubicMove` - A inmutable data class that handles move information.
+- `QubicGameState` - A inmutable data class that handles game state information.
+
+The module contains the following functions:
+- `threats(own: int, other: int) -> int` - Return the mask of cells that complete a line.
+"""
+from dataclasses import dataclass, field
+from functools import cached_property
+from itertools import product
+
+from backend.logic.exceptions import InvalidMove
+from backend.logic.models import GameStateMixin, Mark
+from backend.logic.validators import validate_qubic_game_state, validate_qubic_grid
+from backend.logic.zobrist import QUBIC_ZOBRIST
+
+SIZE = 4
+CELLS = SIZE ** 3
+FULL_CUBE = (1 << CELLS) - 1
+
+def _line_masks() -> tuple[int, ...]:
+    """Return the masks of the 76 winning lines of the cube, built by walking the 13 directions
+    from every cell where a whole line fits.
+
+    Returns:
+        tuple[int, ...]: One 64-bit mask per line.
+    """
+    directions = [
+        step for step in product((-1, 0, 1), repeat=3)
+        if step > (0, 0, 0)
+    ]
+    masks = set()
+    for start in product(range(SIZE), repeat=3):
+        for step in directions:
+            cells = [
+                tuple(start[axis] + step[axis] * distance for axis in range(3))
+                for distance in range(SIZE)
+            ]
+            if all(0 <= coordinate < SIZE for cell in cells for coordinate in cell):
+                masks.add(sum(1 << (16 * layer + 4 * row + column) for layer, row, column in cells))
+    return tuple(sorted(masks))
+
+LINE_MASKS = _line_masks()
+CELL_LINES = tuple(
+    tuple(line for line in LINE_MASKS if line >> index & 1) for index in range(CELLS)
+)
+CELL_ORDER = tuple(sorted(range(CELLS), key=lambda index: -len(CELL_LINES[index])))
+
+def threats(own: int, other: int) -> int:
+    """Return the mask of empty cells that complete a line of a mark, the lines with three
+    cells of the mark and none of the other.
+
+    Args:
+        own (int): 64-bit integer of the cells of the mark.
+        other (int): 64-bit integer of the cells of the other mark.
+
+    Returns:
+        int: 64-bit integer with a bit set on every winning cell.
+    """
+    mask = 0
+    for line in LINE_MASKS:
+        if not other & line and (own & line).bit_count() == SIZE - 1:
+            mask |= line & ~own
+    return mask
+
+@dataclass(frozen=True)
+class QubicGrid:
+    """An inmutable Class that handles the grid of Qubic. It is instantiate as a empty cube as
+    default. Each mark is stored as a 64-bit integer, bit 16 * layer + 4 * row + column is set
+    when the mark occupies that cell.
+
+    Attributes:
+        x_bits: int
+            Represents the cells occupied by X.
+        o_bits: int
+            Represents the cells occupied by O.
+
+    Methods:
+        cells(self) -> str:
+            Cached getter of the 64 elements X, O or space.
+        x_count(self) -> int:
+            Cached getter of total of X.
+        o_count(self) -> int:
+            Cached getter of total of O
+        empty_count(self) -> int:
+            Cached getter of total of spaces
+    """
+    x_bits: int = 0
+    o_bits: int = 0
+
+    def __post_init__(self) -> None:
+        """Post instantiation hook that verifies that the grid is compose of 64 cells with no
+        cell occupied by both marks"""
+        validate_qubic_grid(self)
+
+    @cached_property
+    def cells(self) -> str:
+        """Cached getter of the 64 elements X, O or space, in the order of the cell indices.
+
+        Returns:
+            str: Elements of the grid.
+        """
+        return "".join(
+            "X" if self.x_bits >> index & 1 else "O" if self.o_bits >> index & 1 else " "
+            for index in range(CELLS)
+        )
+
+    @cached_property
+    def x_count(self) -> int:
+        """Cached getter of total of X
+
+        Returns:
+            int: Total of X
+        """
+        return self.x_bits.bit_count()
+
+    @cached_property
+    def o_count(self) -> int:
+        """Cached getter of total of O
+
+        Returns:
+            int: Total of O
+        """
+        return self.o_bits.bit_count()
+
+    @cached_property
+    def empty_count(self) -> int:
+        """Cached getter of total of spaces
+
+        Returns:
+            int: Total of spaces
+        """
+        return CELLS - self.x_count - self.o_count
+
+@dataclass(frozen=True)
+class QubicMove:
+    """An inmutable data class that is strictly a data transfer object (DTO) whose main purpose
+    is to carry data. Consists of the mark identifying the player who made a move, a numeric
+    zero-based index of the 64 cells, and the two states before and after making a move.
+
+    Attributes:
+        mark: Mark
+            Represent the mark of the player.
+        cell_index: int
+            Represent the position to play, 16 * layer + 4 * row + column.
+        before_state: "QubicGameState"
+            Represent the game state before the move.
+        after_state: "QubicGameState"
+            Represent the game state after the move.
+    """
+    mark: Mark
+    cell_index: int
+    before_state: "QubicGameState"
+    after_state: "QubicGameState"
+
+@dataclass(frozen=True)
+class QubicGameState(GameStateMixin):
+    """An inmutable data Class that is strictly a data transfer object (DTO) whose main purpose
+    is to carry data, consisting of the grid of cells and the starting player's mark
+
+    Attributes:
+        grid: QubicGrid
+            Represents the cube, 64 cells X, O or space
+        starting_mark: Mark = Mark("X")
+            Represent the starting mark. Default to X
+        zobrist_hash: int | None = None
+            64-bit Zobrist hash of the position. Computed when not given and updated with a
+            single XOR by make_move_to. Not part of equality.
+
+    Methods:
+        current_mark(self) -> Mark:
+            Cached getter of current mark.
+        game_not_started(self) -> bool:
+            Cached getter if current state is the initial state.
+        game_over(self) -> bool:
+            Cached getter to check if the game is over.
+        tie(self) -> bool:
+            Cached getter to check if there is a tie.
+        winner(self) -> Mark | None:
+            Cached getter that check if there is a winner by checking the line masks.
+        winning_cells(self) -> list[int]:
+            Cached getter of the cells of the winning line.
+        possible_moves(self) -> list[QubicMove]:
+            Cached getter of possible moves.
+        release_moves(self) -> None:
+            Drop the cached possible moves.
+        make_random_move(self, rng: random.Random | None = None) -> QubicMove | None:
+            Return possible move based on possible moves.
+        make_move_to(self, index: int) -> QubicMove:
+            Return the move to make based on index.
+        evaluate_score(self, mark: Mark) -> int:
+            Returns score based on the result of the move.
+    """
+    grid: QubicGrid
+    starting_mark: Mark = Mark("X")
+    zobrist_hash: int | None = field(default=None, compare=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Post instantiation hook that verifies that the gamestate is correct and computes
+        its Zobrist hash when not given
+        """
+        validate_qubic_game_state(self)
+        if self.zobrist_hash is None:
+            object.__setattr__(
+                self,
+                "zobrist_hash",
+                QUBIC_ZOBRIST.hash_bits(self.grid.x_bits, self.grid.o_bits, self.starting_mark),
+            )
+
+    @cached_property
+    def current_mark(self) -> Mark:
+        """Cached getter of current mark.
+
+        Returns:
+            Mark: Mark of current state.
+        """
+        if self.grid.x_count == self.grid.o_count:
+            return self.starting_mark
+        return self.starting_mark.other
+
+    @cached_property
+    def game_not_started(self) -> bool:
+        """Cached getter if current state is the initial state.
+
+        Returns:
+            bool: Rather current turn is the first turn or not
+        """
+        return self.grid.empty_count == CELLS
+
+    @cached_property
+    def game_over(self) -> bool:
+        """Cached getter to check if the game is over by check if there is a winner or
+        there is a tie.
+
+        Returns:
+            bool: Rather the game is over or not.
+        """
+        return self.winner is not None or self.tie
+
+    @cached_property
+    def tie(self) -> bool:
+        """Cached getter to check if there is a tie by checking if
+        there is a winner or grid is empty.
+
+        Returns:
+            bool: Rather the game has a winner or grid is empty
+        """
+        return self.winner is None and self.grid.empty_count == 0
+
+    @cached_property
+    def winner(self) -> Mark | None:
+        """Cached getter that check if there is a winner by checking the line masks.
+
+        Returns:
+            Mark | None: Could be X, O or None.
+        """
+        for line in LINE_MASKS:
+            if self.grid.x_bits & line == line:
+                return Mark.CROSS
+            if self.grid.o_bits & line == line:
+                return Mark.NAUGHT
+        return None
+
+    @cached_property
+    def winning_cells(self) -> list[int]:
+        """Cached getter of the cells of the winning line.
+
+        Returns:
+            list[int]: List of positions of marks in winning line
+        """
+        for line in LINE_MASKS:
+            if line in (self.grid.x_bits & line, self.grid.o_bits & line):
+                return [index for index in range(CELLS) if line >> index & 1]
+        return []
+
+    @cached_property
+    def possible_moves(self) -> list[QubicMove]:
+        """Cached getter of possible moves.
+
+        Returns:
+            list[QubicMove]: list of possible moves
+        """
+        if self.game_over:
+            return []
+        empty = FULL_CUBE & ~(self.grid.x_bits | self.grid.o_bits)
+        return [self.make_move_to(index) for index in range(CELLS) if empty >> index & 1]
+
+    def make_move_to(self, index: int) -> QubicMove:
+        """Return the move to make based on index.
+
+        Args:
+            index (int): Position of the move.
+
+        Raises:
+            InvalidMove: Exception when a invalid move is selected
+
+        Returns:
+            QubicMove: Snapshot of moves
+        """
+        if (self.grid.x_bits | self.grid.o_bits) >> index & 1:
+            raise InvalidMove("Cell is not empty")
+        x_bits, o_bits = self.bits_after_move(index)
+        return QubicMove(
+            mark=self.current_mark,
+            cell_index=index,
+            before_state=self,
+            after_state=QubicGameState(
+                QubicGrid(x_bits, o_bits),
+                self.starting_mark,
+                self.zobrist_hash ^ QUBIC_ZOBRIST.key(index, self.current_mark),
+            ),
+        )
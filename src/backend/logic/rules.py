@@ -0,0 +1,132 @@
+"""Provide the rule sets of the classic game, compiled into lookup tables.
+
+This module allows the classic 3x3 game to be played with other rules: misère, where completing
+a line loses, Wild Tic Tac Toe, where each player may place either mark, and custom sets of
+lines. A rule set is compiled once into a bit mask per line and a table with an entry for each
+of the 512 sets of cells a mark can occupy, so checking a position for a completed line is a
+single lookup. Cell i is bit i of the masks.
+
+Examples:
+
+    >>> from backend.logic.rules import MISERE_RULES, RuleSet
+    >>> GameState(Grid("XXXOO    "), rules=MISERE_RULES).winner
+    <Mark.NAUGHT: 'O'>
+    >>> corners = RuleSet("corners", ((0, 2, 6, 8),))
+    >>> GameState(Grid("X XOOOX X"), rules=corners).winning_cells
+    [0, 2, 6, 8]
+
+The module contains the following class:
+- `RuleSet` - A inmutable data class that handles the rules of the classic game.
+
+The module contains the following constants:
+- `STANDARD_LINES` - The 8 rows, columns and diagonals of the grid.
+- `STANDARD_RULES` - Three in a row wins.
+- `MISERE_RULES` - Three in a row loses.
+- `WILD_RULES` - Either mark each turn, three in a row of any mark wins.
+- `RULE_SETS` - Predefined rule sets by name.
+"""
+
+import random
+from dataclasses import dataclass, field
+from functools import cached_property
+
+STANDARD_LINES = (
+    (0, 1, 2),
+    (3, 4, 5),
+    (6, 7, 8),
+    (0, 3, 6),
+    (1, 4, 7),
+    (2, 5, 8),
+    (0, 4, 8),
+    (2, 4, 6),
+)
+
+@dataclass(frozen=True)
+class RuleSet:
+    """An inmutable data class that handles the rules of the classic game. The cells of each
+    line are sorted and repeated lines dropped when created. When both marks complete a line,
+    the first line in order counts.
+
+    Attributes:
+        name: str = "standard"
+            Name of the rule set. Not part of equality.
+        lines: tuple[tuple[int, ...], ...] = STANDARD_LINES
+            Cells of every line that ends the game when a mark occupies all of them.
+        misere: bool = False
+            Rather the player who completes a line loses instead of winning.
+        wild: bool = False
+            Rather each player may place either mark. The player who completes a line of any
+            mark wins, or loses when misere is set.
+
+    Methods:
+        line_masks(self) -> tuple[int, ...]:
+            Cached getter of the bit mask of every line.
+        completed(self) -> tuple[int, ...]:
+            Cached getter of the table of the first line completed by every set of cells.
+        zobrist_salt(self) -> int:
+            Cached getter of the key mixed into the Zobrist hash of the positions.
+    """
+    name: str = field(default="standard", compare=False)
+    lines: tuple[tuple[int, ...], ...] = STANDARD_LINES
+    misere: bool = False
+    wild: bool = False
+
+    def __post_init__(self) -> None:
+        """Post instantiation hook that verifies and normalizes the lines.
+
+        Raises:
+            ValueError: Exception when a line is empty or has a cell outside the grid.
+        """
+        if not self.lines or any(
+            not line or not all(0 <= index < 9 for index in line) for line in self.lines
+        ):
+            raise ValueError("Lines must contain cells from 0 to 8")
+        object.__setattr__(
+            self, "lines", tuple(dict.fromkeys(tuple(sorted(set(line))) for line in self.lines))
+        )
+
+    @cached_property
+    def line_masks(self) -> tuple[int, ...]:
+        """Cached getter of the bit mask of every line.
+
+        Returns:
+            tuple[int, ...]: One 9-bit mask per line.
+        """
+        return tuple(sum(1 << index for index in line) for line in self.lines)
+
+    @cached_property
+    def completed(self) -> tuple[int, ...]:
+        """Cached getter of the table of the first line completed by every set of cells,
+        indexed by the 9-bit integer of the cells occupied by a mark.
+
+        Returns:
+            tuple[int, ...]: Number of the first line completed, counting from 1, 0 when there
+                is none.
+        """
+        return tuple(
+            next(
+                (number for number, line in enumerate(self.line_masks, 1) if bits & line == line),
+                0,
+            )
+            for bits in range(1 << 9)
+        )
+
+    @cached_property
+    def zobrist_salt(self) -> int:
+        """Cached getter of the key mixed into the Zobrist hash of the positions, so positions
+        of different rule sets never share a hash. It is 0 for the standard rules.
+
+        Returns:
+            int: 64-bit key.
+        """
+        if self == STANDARD_RULES:
+            return 0
+        return random.Random(f"rules-{self.lines}-{self.misere}-{self.wild}").getrandbits(64)
+
+STANDARD_RULES = RuleSet()
+MISERE_RULES = RuleSet("misere", misere=True)
+WILD_RULES = RuleSet("wild", wild=True)
+
+RULE_SETS = {
+    rules.name: rules for rules in (STANDARD_RULES, MISERE_RULES, WILD_RULES)
+}
@@ -0,0 +1,182 @@
+"""Provide a mutable board of the classic game for searches.
+
+This module allows the minimax engine to search without creating objects at every node. A game
+state is copied once into a `SearchBoard`, whose moves are played and taken back in place with
+`make` and `unmake`. The cells of each mark, the Zobrist hash, the compact code, the number of
+empty cells and the mark of the completed line are updated incrementally, so a node costs a few
+integer operations instead of a `Move`, a `Grid` and a `GameState`. The public game states stay
+immutable, only the search uses the board.
+
+Examples:
+
+    >>> from backend.logic.search_board import SearchBoard
+    >>> board = SearchBoard(GameState(Grid("XX OO    ")))
+    >>> board.make(2)
+    >>> board.game_over, board.score()
+    (True, -1)
+    >>> board.unmake(2)
+    >>> board.moves
+    (2, 5, 6, 7, 8)
+
+The module contains the following class:
+- `SearchBoard` - A mutable board of the classic game, played and taken back in place.
+"""
+
+from functools import cache
+
+from backend.logic.encoding import encode
+from backend.logic.models import GameState, Mark
+from backend.logic.zobrist import CLASSIC_ZOBRIST
+
+DIGIT_WEIGHTS = tuple((3 ** index, 2 * 3 ** index) for index in range(9))
+FULL_GRID = (1 << 9) - 1
+
+class SearchBoard:
+    """A mutable board of the classic game, played and taken back in place. Marks are
+    numbered 0 for X and 1 for O. Moves are given by their codes, as Move.code: the cell
+    index, plus 9 to place the mark of the other player with wild rules.
+
+    Attributes:
+        bits: list[int]
+            Cells of X and cells of O, bit i set when the mark occupies cell i.
+        turn: int
+            Mark of the player to move, 0 for X and 1 for O.
+        empty_count: int
+            Number of empty cells.
+        line_mark: int | None
+            Mark of the completed line, if any.
+        zobrist_hash: int
+            64-bit Zobrist hash of the position, as GameState.zobrist_hash.
+        code: int
+            16-bit compact code of the position, as encoding.encode.
+        rules: RuleSet
+            Rules of the game.
+
+    Methods:
+        moves(self) -> tuple[int, ...]:
+            Getter of the codes of the possible moves.
+        game_over(self) -> bool:
+            Getter of rather the game is over.
+        make(self, code: int) -> None:
+            Play a move in place.
+        unmake(self, code: int) -> None:
+            Take back the last move played.
+        score(self) -> int:
+            Return the score of a game over for the player to move.
+    """
+    # pylint: disable=too-many-instance-attributes
+    # Every value updated at a node is a slot of its own, read without any indirection.
+    __slots__ = (
+        "bits", "turn", "empty_count", "line_mark", "zobrist_hash", "code", "rules",
+        "_completed", "_moves", "_line_marks",
+    )
+
+    def __init__(self, game_state: GameState) -> None:
+        """
+        Args:
+            game_state (GameState): current GameState, consisting of a current Grid (9 elemets
+                that that can be X, O or spaces) and a starting Mark (default X).
+        """
+        self.bits = [game_state.grid.x_bits, game_state.grid.o_bits]
+        self.turn = int(game_state.current_mark is Mark.NAUGHT)
+        self.empty_count = game_state.grid.empty_count
+        line_mark = game_state.line_mark
+        self.line_mark = None if line_mark is None else int(line_mark is Mark.NAUGHT)
+        self.zobrist_hash = game_state.zobrist_hash
+        self.code = encode(game_state)
+        self.rules = game_state.rules
+        self._completed = game_state.rules.completed
+        self._moves = _wild_moves() if game_state.rules.wild else _moves()
+        self._line_marks: list[int | None] = []
+
+    @property
+    def moves(self) -> tuple[int, ...]:
+        """Getter of the codes of the possible moves, in the order of GameState.possible_moves.
+
+        Returns:
+            tuple[int, ...]: Move codes, empty when the game is over.
+        """
+        if self.game_over:
+            return ()
+        return self._moves[self.bits[0] | self.bits[1]]
+
+    @property
+    def game_over(self) -> bool:
+        """Getter of rather the game is over, by a completed line or a full grid.
+
+        Returns:
+            bool: Rather the game is over or not.
+        """
+        return self.line_mark is not None or not self.empty_count
+
+    def make(self, code: int) -> None:
+        """Play a move in place. The move is not checked, it must be one of the moves.
+
+        Args:
+            code (int): Code of the move.
+        """
+        index = code % 9
+        mark = self.turn ^ (code >= 9)
+        bits = self.bits[mark] | 1 << index
+        self.bits[mark] = bits
+        self.zobrist_hash ^= CLASSIC_ZOBRIST.marks[index][mark]
+        self.code += DIGIT_WEIGHTS[index][mark]
+        self.empty_count -= 1
+        self.turn ^= 1
+        self._line_marks.append(self.line_mark)
+        if self.line_mark is None and self._completed[bits]:
+            self.line_mark = mark
+
+    def unmake(self, code: int) -> None:
+        """Take back the last move played.
+
+        Args:
+            code (int): Code of the last move played.
+        """
+        index = code % 9
+        self.turn ^= 1
+        mark = self.turn ^ (code >= 9)
+        self.bits[mark] &= ~(1 << index)
+        self.zobrist_hash ^= CLASSIC_ZOBRIST.marks[index][mark]
+        self.code -= DIGIT_WEIGHTS[index][mark]
+        self.empty_count += 1
+        self.line_mark = self._line_marks.pop()
+
+    def score(self) -> int:
+        """Return the score of a game over for the player to move, as GameState.evaluate_score
+        with the current mark.
+
+        Returns:
+            int: 1, 0 or -1.
+        """
+        if self.line_mark is None:
+            return 0
+        player = self.turn ^ 1 if self.rules.wild else self.line_mark
+        return 1 if player ^ self.rules.misere == self.turn else -1
+
+@cache
+def _moves() -> tuple[tuple[int, ...], ...]:
+    """Return the codes of the moves of every set of occupied cells, computed the first time
+    only.
+
+    Returns:
+        tuple[tuple[int, ...], ...]: Indexes of the empty cells by set of occupied cells.
+    """
+    return tuple(
+        tuple(index for index in range(9) if not occupied >> index & 1)
+        for occupied in range(FULL_GRID + 1)
+    )
+
+@cache
+def _wild_moves() -> tuple[tuple[int, ...], ...]:
+    """Return the codes of the moves of every set of occupied cells with wild rules, computed
+    the first time only.
+
+    Returns:
+        tuple[tuple[int, ...], ...]: Codes of the empty cells, with the mark of the player and
+            then the other mark, by set of occupied cells.
+    """
+    return tuple(
+        tuple(code for index in indexes for code in (index, index + 9))
+        for indexes in _moves()
+    )
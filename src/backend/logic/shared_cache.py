@@ -0,0 +1,173 @@
+"""Provide a search cache in shared memory for the workers of a process pool.
+
+This module allows every process of a pool to read and fill a single search cache of the
+classic game, so memory stays constant however many workers are used and a worker benefits
+from the positions solved by the others. The cache is a block of `multiprocessing.shared_memory`
+with one byte per compact game state code, 64 KiB in total. An entry fits in its byte, so it is
+written with a single store and readers never see half an entry, no lock is needed. The block
+is owned by the process that creates it and outlives the workers that attach to it, so a
+restarted worker finds every entry already there.
+
+Examples:
+
+    >>> from backend.logic.minimax import find_best_move
+    >>> from backend.logic.shared_cache import SharedSearchCache
+    >>> with SharedSearchCache() as cache:
+            worker_cache = SharedSearchCache.attach(cache.name)  # in another process
+            find_best_move(GameState(Grid("X   O    ")), worker_cache).cell_index
+            worker_cache.close()
+            cache.stats().size
+    1
+    634
+
+The module contains the following class:
+- `SharedSearchCache` - A lock-free search cache of the classic game in shared memory.
+"""
+
+from multiprocessing import shared_memory
+
+from backend.logic.cache import CacheEntry, CacheStats
+from backend.logic.encoding import encode
+from backend.logic.models import GameState
+from backend.logic.rules import STANDARD_RULES
+from backend.logic.search_board import SearchBoard
+
+SLOTS = 1 << 16
+STORED_FLAG = 0x80
+NO_MOVE = 0x0F
+
+class SharedSearchCache:
+    """A lock-free search cache of the classic game in shared memory. Maps the compact code of
+    a game state to its minimax value for the player to move and the index of its best move.
+    Each entry is a byte at the offset of the code: bit 7 is set once stored, bits 0 and 1 hold
+    the value plus one and bits 2 to 5 the index of the best move, 15 when the game is over.
+    Hit and miss counters are kept by each process.
+
+    Attributes:
+        name: str
+            Name of the shared memory block, used by other processes to attach to it.
+
+    Methods:
+        attach(cls, name: str) -> SharedSearchCache:
+            Return a cache backed by an existing shared memory block.
+        key(self, game_state: GameState) -> int:
+            Return the key of a position.
+        get(self, key: int) -> CacheEntry | None:
+            Return the entry of a position, if cached.
+        put(self, key: int, entry: CacheEntry) -> None:
+            Store the entry of a position.
+        stats(self) -> CacheStats:
+            Return a snapshot of the counters of the cache.
+        clear(self) -> None:
+            Drop every entry and reset the counters.
+        close(self) -> None:
+            Detach from the shared memory block, freeing it when owned.
+    """
+    def __init__(self, name: str | None = None) -> None:
+        """
+        Args:
+            name (str | None, optional): Name of the shared memory block to create. Defaults
+                to a unique name.
+        """
+        self._memory = shared_memory.SharedMemory(name, create=True, size=SLOTS)
+        self._memory.buf[:SLOTS] = bytes(SLOTS)
+        self._owner = True
+        self.name = self._memory.name
+        self._hits = 0
+        self._misses = 0
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedSearchCache":
+        """Return a cache backed by an existing shared memory block. Closing it leaves the
+        block to its owner. Meant for the processes started by the owner, which share its
+        resource tracker.
+
+        Args:
+            name (str): Name of the shared memory block.
+
+        Returns:
+            SharedSearchCache: Cache sharing the entries of the block.
+        """
+        cache_ = cls.__new__(cls)
+        cache_._memory = shared_memory.SharedMemory(name)
+        cache_._owner = False
+        cache_.name = cache_._memory.name
+        cache_._hits = 0
+        cache_._misses = 0
+        return cache_
+
+    def key(self, game_state: GameState | SearchBoard) -> int:
+        """Return the key of a position, its compact code.
+
+        Args:
+            game_state (GameState | SearchBoard): current GameState, consisting of a current
+                Grid (9 elemets that that can be X, O or spaces) and a starting Mark (default
+                X), or the search board of a position.
+
+        Raises:
+            ValueError: Exception when the game state does not follow the standard rules.
+
+        Returns:
+            int: 16-bit code of the game state.
+        """
+        if game_state.rules is not STANDARD_RULES and game_state.rules != STANDARD_RULES:
+            raise ValueError("Only positions with the standard rules can be shared")
+        if isinstance(game_state, SearchBoard):
+            return game_state.code
+        return encode(game_state)
+
+    def get(self, key: int) -> CacheEntry | None:
+        """Return the entry of a position, if cached.
+
+        Args:
+            key (int): 16-bit code of the position.
+
+        Returns:
+            CacheEntry | None: Value and index of the best move, or None on a miss.
+        """
+        slot = self._memory.buf[key]
+        if not slot & STORED_FLAG:
+            self._misses += 1
+            return None
+        self._hits += 1
+        index = slot >> 2 & NO_MOVE
+        return (slot & 0x03) - 1, None if index == NO_MOVE else index
+
+    def put(self, key: int, entry: CacheEntry) -> None:
+        """Store the entry of a position.
+
+        Args:
+            key (int): 16-bit code of the position.
+            entry (CacheEntry): Value and index of the best move.
+        """
+        value, index = entry
+        self._memory.buf[key] = (
+            STORED_FLAG | (NO_MOVE if index is None else index) << 2 | value + 1
+        )
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the counters of the cache. Hits and misses are those of the
+        current process, the size is shared by every process.
+
+        Returns:
+            CacheStats: Hits, misses, evictions and size.
+        """
+        size = SLOTS - bytes(self._memory.buf[:SLOTS]).count(0)
+        return CacheStats(self._hits, self._misses, 0, size)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        self._memory.buf[:SLOTS] = bytes(SLOTS)
+        self._hits = self._misses = 0
+
+    def close(self) -> None:
+        """Detach from the shared memory block, freeing it when owned."""
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+
+    def __enter__(self) -> "SharedSearchCache":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
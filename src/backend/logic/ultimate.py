@@ -0,0 +1,466 @@
+"""Provide the classes for the domain model of Ultimate Tic Tac Toe.
+
+This module allows the creation of intances of UltimateGrid, UltimateMove and UltimateGameState.
+The board is a 3x3 grid of 3x3 sub-boards, 81 cells indexed as 9 * board + cell, where both
+board and cell are numbered like the cells of a classic Grid. The cell played sends the
+opponent to the sub-board with the same number, unless that sub-board is already won or full,
+in which case the opponent can play in any open sub-board. Three sub-boards in a row win.
+
+Each mark is stored as an 81-bit integer, one bit per cell, so legal move generation and win
+detection are a handful of bit operations and table lookups.
+
+Examples:
+
+    >>> game_state = UltimateGameState(UltimateGrid())
+    >>> move = game_state.make_move_to(9 * 4 + 2)
+    >>> move.after_state.active_board
+    2
+
+The module contains the following class:
+- `UltimateGrid` - A inmutable Class that handles the grid information.
+- `UltimateMove` - A inmutable data class that handles move information.
+- `UltimateGameState` - A inmutable data class that handles game state information.
+
+The module contains the following functions:
+- `board_bits(bits: int, board: int) -> int` - Return the 9 bits of a sub-board.
+- `won_boards(bits: int) -> int` - Return the mask of sub-boards won by a mark.
+- `closed_boards(x_bits: int, o_bits: int) -> int` - Return the mask of won or full sub-boards.
+"""
+import random
+from dataclasses import dataclass, field
+from functools import cached_property
+
+from backend.logic.exceptions import InvalidMove
+from backend.logic.models import GameStateMixin, Mark
+from backend.logic.validators import validate_ultimate_game_state, validate_ultimate_grid
+from backend.logic.zobrist import ULTIMATE_ZOBRIST
+
+LINE_MASKS = (
+    0b000000111,
+    0b000111000,
+    0b111000000,
+    0b001001001,
+    0b010010010,
+    0b100100100,
+    0b100010001,
+    0b001010100,
+)
+FULL_BOARD = 0b111111111
+BOARD_MASKS = tuple(FULL_BOARD << 9 * board for board in range(9))
+WON = tuple(
+    any(bits & line == line for line in LINE_MASKS) for bits in range(512)
+)
+OPEN_CELLS = tuple(
+    sum(BOARD_MASKS[board] for board in range(9) if not closed >> board & 1)
+    for closed in range(512)
+)
+
+def board_bits(bits: int, board: int) -> int:
+    """Return the 9 bits of a sub-board.
+
+    Args:
+        bits (int): 81-bit integer of the cells of a mark.
+        board (int): Index of the sub-board.
+
+    Returns:
+        int: 9-bit integer of the cells of the mark in the sub-board.
+    """
+    return (bits >> 9 * board) & FULL_BOARD
+
+def won_boards(bits: int) -> int:
+    """Return the mask of sub-boards won by a mark.
+
+    Args:
+        bits (int): 81-bit integer of the cells of a mark.
+
+    Returns:
+        int: 9-bit integer with a bit set for every sub-board won.
+    """
+    mask = 0
+    for board in range(9):
+        if WON[board_bits(bits, board)]:
+            mask |= 1 << board
+    return mask
+
+def closed_boards(x_bits: int, o_bits: int) -> int:
+    """Return the mask of won or full sub-boards, where no move can be played.
+
+    Args:
+        x_bits (int): 81-bit integer of the cells of X.
+        o_bits (int): 81-bit integer of the cells of O.
+
+    Returns:
+        int: 9-bit integer with a bit set for every closed sub-board.
+    """
+    mask = won_boards(x_bits) | won_boards(o_bits)
+    for board in range(9):
+        if board_bits(x_bits | o_bits, board) == FULL_BOARD:
+            mask |= 1 << board
+    return mask
+
+@dataclass(frozen=True)
+class UltimateGrid:
+    """An inmutable Class that handles the grid of Ultimate Tic Tac Toe. It is instantiate as a
+    empty grid as default. Each mark is stored as an 81-bit integer, bit 9 * board + cell is
+    set when the mark occupies that cell.
+
+    Attributes:
+        x_bits: int
+            Represents the cells occupied by X.
+        o_bits: int
+            Represents the cells occupied by O.
+
+    Methods:
+        from_cells(cls, cells: str) -> UltimateGrid:
+            Build a grid from 81 elements X, O or space.
+        cells(self) -> str:
+            Cached getter of the 81 elements X, O or space.
+        x_count(self) -> int:
+            Cached getter of total of X.
+        o_count(self) -> int:
+            Cached getter of total of O
+        empty_count(self) -> int:
+            Cached getter of total of spaces
+        board_cells(self, board: int) -> str:
+            Return the 9 elements of a sub-board.
+    """
+    x_bits: int = 0
+    o_bits: int = 0
+
+    def __post_init__(self) -> None:
+        """Post instantiation hook that verifies that the grid is compose of 81 cells with no
+        cell occupied by both marks"""
+        validate_ultimate_grid(self)
+
+    @classmethod
+    def from_cells(cls, cells: str) -> "UltimateGrid":
+        """Build a grid from 81 elements X, O or space, in the order of the cell indices.
+
+        Args:
+            cells (str): 81 elements X, O or space.
+
+        Raises:
+            ValueError: "Must contain 81 cells of: X, O, or space"
+
+        Returns:
+            UltimateGrid: The grid with those cells.
+        """
+        if len(cells) != 81 or set(cells) - {"X", "O", " "}:
+            raise ValueError("Must contain 81 cells of: X, O, or space")
+        x_bits = o_bits = 0
+        for index, cell in enumerate(cells):
+            if cell == "X":
+                x_bits |= 1 << index
+            elif cell == "O":
+                o_bits |= 1 << index
+        return cls(x_bits, o_bits)
+
+    @cached_property
+    def cells(self) -> str:
+        """Cached getter of the 81 elements X, O or space, in the order of the cell indices.
+
+        Returns:
+            str: Elements of the grid.
+        """
+        return "".join(
+            "X" if self.x_bits >> index & 1 else "O" if self.o_bits >> index & 1 else " "
+            for index in range(81)
+        )
+
+    @cached_property
+    def x_count(self) -> int:
+        """Cached getter of total of X
+
+        Returns:
+            int: Total of X
+        """
+        return self.x_bits.bit_count()
+
+    @cached_property
+    def o_count(self) -> int:
+        """Cached getter of total of O
+
+        Returns:
+            int: Total of O
+        """
+        return self.o_bits.bit_count()
+
+    @cached_property
+    def empty_count(self) -> int:
+        """Cached getter of total of spaces
+
+        Returns:
+            int: Total of spaces
+        """
+        return 81 - self.x_count - self.o_count
+
+    def board_cells(self, board: int) -> str:
+        """Return the 9 elements of a sub-board, like the cells of a classic Grid.
+
+        Args:
+            board (int): Index of the sub-board.
+
+        Returns:
+            str: 9 elements X, O or space.
+        """
+        return self.cells[9 * board: 9 * board + 9]
+
+@dataclass(frozen=True)
+class UltimateMove:
+    """An inmutable data class that is strictly a data transfer object (DTO) whose main purpose
+    is to carry data. Consists of the mark identifying the player who made a move, a numeric
+    zero-based index of the 81 cells, and the two states before and after making a move.
+
+    Attributes:
+        mark: Mark
+            Represent the mark of the player.
+        cell_index: int
+            Represent the position to play, 9 * board + cell.
+        before_state: "UltimateGameState"
+            Represent the game state before the move.
+        after_state: "UltimateGameState"
+            Represent the game state after the move.
+    """
+    mark: Mark
+    cell_index: int
+    before_state: "UltimateGameState"
+    after_state: "UltimateGameState"
+
+@dataclass(frozen=True)
+class UltimateGameState(GameStateMixin):
+    """An inmutable data Class that is strictly a data transfer object (DTO) whose main purpose
+    is to carry data, consisting of the grid, the starting player's mark and the sub-board where
+    the next move must be played.
+
+    Attributes:
+        grid: UltimateGrid
+            Represents the grid, 81 cells X, O or space
+        starting_mark: Mark = Mark("X")
+            Represent the starting mark. Default to X
+        active_board: int | None = None
+            Represent the sub-board where the next move must be played, None for any open one.
+        zobrist_hash: int | None = None
+            64-bit Zobrist hash of the position, including the active board. Computed when
+            not given and updated incrementally by make_move_to. Not part of equality.
+
+    Methods:
+        current_mark(self) -> Mark:
+            Cached getter of current mark.
+        game_not_started(self) -> bool:
+            Cached getter if current state is the initial state.
+        x_boards(self) -> int:
+            Cached getter of the mask of sub-boards won by X.
+        o_boards(self) -> int:
+            Cached getter of the mask of sub-boards won by O.
+        closed_boards(self) -> int:
+            Cached getter of the mask of won or full sub-boards.
+        game_over(self) -> bool:
+            Cached getter to check if the game is over.
+        tie(self) -> bool:
+            Cached getter to check if there is a tie.
+        winner(self) -> Mark | None:
+            Cached getter that check if there is a winner of three sub-boards in a row.
+        winning_boards(self) -> list[int]:
+            Cached getter of the sub-boards of the winning line.
+        legal_moves(self) -> list[int]:
+            Cached getter of the indices of the legal moves.
+        possible_moves(self) -> list[UltimateMove]:
+            Cached getter of possible moves.
+        release_moves(self) -> None:
+            Drop the cached possible moves.
+        make_random_move(self, rng: random.Random | None = None) -> UltimateMove | None:
+            Return possible move based on possible moves.
+        make_move_to(self, index: int) -> UltimateMove:
+            Return the move to make based on index.
+        evaluate_score(self, mark: Mark) -> int:
+            Returns score based on the result of the move.
+    """
+    grid: UltimateGrid
+    starting_mark: Mark = Mark("X")
+    active_board: int | None = None
+    zobrist_hash: int | None = field(default=None, compare=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Post instantiation hook that verifies that the gamestate is correct and computes
+        its Zobrist hash when not given
+        """
+        validate_ultimate_game_state(self)
+        if self.zobrist_hash is None:
+            value = ULTIMATE_ZOBRIST.hash_bits(
+                self.grid.x_bits, self.grid.o_bits, self.starting_mark
+            )
+            if self.active_board is not None:
+                value ^= ULTIMATE_ZOBRIST.extra[self.active_board]
+            object.__setattr__(self, "zobrist_hash", value)
+
+    @cached_property
+    def current_mark(self) -> Mark:
+        """Cached getter of current mark.
+
+        Returns:
+            Mark: Mark of current state.
+        """
+        if self.grid.x_count == self.grid.o_count:
+            return self.starting_mark
+        return self.starting_mark.other
+
+    @cached_property
+    def game_not_started(self) -> bool:
+        """Cached getter if current state is the initial state.
+
+        Returns:
+            bool: Rather current turn is the first turn or not
+        """
+        return self.grid.empty_count == 81
+
+    @cached_property
+    def x_boards(self) -> int:
+        """Cached getter of the mask of sub-boards won by X.
+
+        Returns:
+            int: 9-bit integer with a bit set for every sub-board won by X.
+        """
+        return won_boards(self.grid.x_bits)
+
+    @cached_property
+    def o_boards(self) -> int:
+        """Cached getter of the mask of sub-boards won by O.
+
+        Returns:
+            int: 9-bit integer with a bit set for every sub-board won by O.
+        """
+        return won_boards(self.grid.o_bits)
+
+    @cached_property
+    def closed_boards(self) -> int:
+        """Cached getter of the mask of won or full sub-boards.
+
+        Returns:
+            int: 9-bit integer with a bit set for every closed sub-board.
+        """
+        return closed_boards(self.grid.x_bits, self.grid.o_bits)
+
+    @cached_property
+    def game_over(self) -> bool:
+        """Cached getter to check if the game is over by check if there is a winner or
+        there is a tie.
+
+        Returns:
+            bool: Rather the game is over or not.
+        """
+        return self.winner is not None or self.tie
+
+    @cached_property
+    def tie(self) -> bool:
+        """Cached getter to check if there is a tie, when every sub-board is closed and
+        there is no winner.
+
+        Returns:
+            bool: Rather the game is tied
+        """
+        return self.winner is None and self.closed_boards == FULL_BOARD
+
+    @cached_property
+    def winner(self) -> Mark | None:
+        """Cached getter that check if there is a winner of three sub-boards in a row.
+
+        Returns:
+            Mark | None: Could be X, O or None.
+        """
+        if WON[self.x_boards]:
+            return Mark.CROSS
+        if WON[self.o_boards]:
+            return Mark.NAUGHT
+        return None
+
+    @cached_property
+    def winning_boards(self) -> list[int]:
+        """Cached getter of the sub-boards of the winning line.
+
+        Returns:
+            list[int]: Indices of the sub-boards of the winning line, empty if no winner.
+        """
+        boards = self.x_boards if self.winner is Mark.CROSS else self.o_boards
+        for line in LINE_MASKS:
+            if self.winner and boards & line == line:
+                return [board for board in range(9) if line >> board & 1]
+        return []
+
+    @cached_property
+    def legal_moves(self) -> list[int]:
+        """Cached getter of the indices of the legal moves.
+
+        Returns:
+            list[int]: Indices of the empty cells of the active sub-board, or of every open
+                sub-board when the move is free.
+        """
+        if self.game_over:
+            return []
+        if self.active_board is None:
+            allowed = OPEN_CELLS[self.closed_boards]
+        else:
+            allowed = BOARD_MASKS[self.active_board]
+        empty = allowed & ~(self.grid.x_bits | self.grid.o_bits)
+        moves = []
+        while empty:
+            lowest = empty & -empty
+            moves.append(lowest.bit_length() - 1)
+            empty ^= lowest
+        return moves
+
+    @cached_property
+    def possible_moves(self) -> list[UltimateMove]:
+        """Cached getter of possible moves.
+
+        Returns:
+            list[UltimateMove]: list of possible moves
+        """
+        return [self.make_move_to(index) for index in self.legal_moves]
+
+    def make_random_move(self, rng: random.Random | None = None) -> UltimateMove | None:
+        """Return possible move based on possible moves.
+
+        Args:
+            rng (random.Random | None, optional): Random generator of the choice, None for
+                the random module. Defaults to None.
+
+        Returns:
+            UltimateMove | None: Snapshot of moves.
+        """
+        try:
+            return self.make_move_to((rng or random).choice(self.legal_moves))
+        except IndexError:
+            return None
+
+    def make_move_to(self, index: int) -> UltimateMove:
+        """Return the move to make based on index.
+
+        Args:
+            index (int): Position of the move, 9 * board + cell.
+
+        Raises:
+            InvalidMove: Exception when a invalid move is selected
+
+        Returns:
+            UltimateMove: Snapshot of moves
+        """
+        if (self.grid.x_bits | self.grid.o_bits) >> index & 1:
+            raise InvalidMove("Cell is not empty")
+        if index not in self.legal_moves:
+            raise InvalidMove("Move must be played in the active board")
+        x_bits, o_bits = self.bits_after_move(index)
+        next_board = index % 9
+        if closed_boards(x_bits, o_bits) >> next_board & 1:
+            next_board = None
+        zobrist_hash = self.zobrist_hash ^ ULTIMATE_ZOBRIST.key(index, self.current_mark)
+        for board in (self.active_board, next_board):
+            if board is not None:
+                zobrist_hash ^= ULTIMATE_ZOBRIST.extra[board]
+        return UltimateMove(
+            mark=self.current_mark,
+            cell_index=index,
+            before_state=self,
+            after_state=UltimateGameState(
+                UltimateGrid(x_bits, o_bits), self.starting_mark, next_board, zobrist_hash
+            ),
+        )
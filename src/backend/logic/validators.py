@@ -33,16 +33,27 @@ The module contains the following functions:
     ) ` - Validate winner by verifying total of Xs and Os.
 - `validate_players(player1: Player, player2: Player)` - Validate the correct instantiation of
     Players.
+- `validate_ultimate_grid(grid: UltimateGrid)` - Verify that the ultimate grid has 81 cells and
+    no cell is occupied by both marks.
+- `validate_ultimate_game_state(game_state: UltimateGameState)` - Verify a correct ultimate
+    gamestate, raises exceptions if is not.
+- `validate_active_board(game_state: UltimateGameState)` - Verify that the active board of an
+    ultimate gamestate is open.
+- `validate_qubic_grid(grid: QubicGrid)` - Verify that the qubic grid has 64 cells and no cell
+    is occupied by both marks.
+- `validate_qubic_game_state(game_state: QubicGameState)` - Verify a correct qubic gamestate,
+    raises exceptions if is not.
 """
 
 from __future__ import annotations
-import re
 from typing import TYPE_CHECKING
 from backend.logic.exceptions import InvalidGameState
 
 if TYPE_CHECKING:
     from backend.game.players import Player
     from backend.logic.models import GameState, Grid, Mark
+    from backend.logic.qubic import QubicGameState, QubicGrid
+    from backend.logic.ultimate import UltimateGameState, UltimateGrid
 
 def validate_grid(grid: Grid) -> None:
     """Verify that the grid is compose of 9 elements (X, O, or
@@ -54,20 +65,23 @@ def validate_grid(grid: Grid) -> None:
     Raises:
         ValueError: "Must contain 9 cells of: X, O, or space"
     """
-    if not re.match(r"^[\sXO]{9}$", grid.cells):
+    if len(grid.cells) != 9 or grid.cells.strip("XO "):
         raise ValueError("Must contain 9 cells of: X, O, or space")
 
 def validate_game_state(game_state: GameState) -> None:
-    """Verify a correct gamestate, raises exceptions if is not.
+    """Verify a correct gamestate, raises exceptions if is not. With wild rules any mix of
+    marks can be reached, so the marks are not counted.
 
     Args:
         game_state (GameState): current GameState, consisting of a current Grid (9 elemets that
             that can be X, O or spaces) and a starting Mark (default X)
     """
+    if game_state.rules.wild:
+        return
     validate_number_of_marks(game_state.grid)
     validate_starting_mark(game_state.grid, game_state.starting_mark)
     validate_winner(
-        game_state.grid, game_state.starting_mark, game_state.winner
+        game_state.grid, game_state.starting_mark, game_state.line_mark
     )
 
 def validate_number_of_marks(grid: Grid) -> None:
@@ -107,6 +121,7 @@ def validate_winner(
     Args:
         grid (Grid): Grid with 9 elements(X, O or space)
         starting_mark (Mark): Mark that represents the winner
+        winner (Mark | None): Mark of the completed line, the winner with standard rules
 
     Raises:
         InvalidGameState: Exception that represent a invalidad game state.
@@ -140,3 +155,89 @@ def validate_players(player1: Player, player2: Player) -> None:
     """
     if player1.mark is player2.mark:
         raise ValueError("Players must use different marks")
+
+def validate_ultimate_grid(grid: UltimateGrid) -> None:
+    """Verify that the ultimate grid is compose of 81 cells and no cell is occupied by
+    both marks. Raises ValueError it the composition is incorrect
+
+    Args:
+        grid (UltimateGrid): Grid with 81 elements(X, O or space)
+
+    Raises:
+        ValueError: "Must contain 81 cells of: X, O, or space"
+    """
+    if (
+        not 0 <= grid.x_bits < 1 << 81
+        or not 0 <= grid.o_bits < 1 << 81
+        or grid.x_bits & grid.o_bits
+    ):
+        raise ValueError("Must contain 81 cells of: X, O, or space")
+
+def validate_ultimate_game_state(game_state: UltimateGameState) -> None:
+    """Verify a correct ultimate gamestate, raises exceptions if is not.
+
+    Args:
+        game_state (UltimateGameState): current UltimateGameState, consisting of a current
+            UltimateGrid, a starting Mark (default X) and the active board.
+
+    Raises:
+        InvalidGameState: Exception that represent a invalidad game state.
+    """
+    validate_number_of_marks(game_state.grid)
+    validate_starting_mark(game_state.grid, game_state.starting_mark)
+    if game_state.x_boards & game_state.o_boards:
+        raise InvalidGameState("Sub-board won by both marks")
+    validate_winner(
+        game_state.grid, game_state.starting_mark, game_state.winner
+    )
+    validate_active_board(game_state)
+
+def validate_active_board(game_state: UltimateGameState) -> None:
+    """Verify that the active board of an ultimate gamestate is None or an open sub-board.
+
+    Args:
+        game_state (UltimateGameState): current UltimateGameState, consisting of a current
+            UltimateGrid, a starting Mark (default X) and the active board.
+
+    Raises:
+        InvalidGameState: Exception that represent a invalidad game state.
+    """
+    if game_state.active_board is None or game_state.game_over:
+        return
+    if not 0 <= game_state.active_board < 9:
+        raise InvalidGameState("Wrong active board")
+    if game_state.closed_boards >> game_state.active_board & 1:
+        raise InvalidGameState("Active board is closed")
+
+def validate_qubic_grid(grid: QubicGrid) -> None:
+    """Verify that the qubic grid is compose of 64 cells and no cell is occupied by both
+    marks. Raises ValueError it the composition is incorrect
+
+    Args:
+        grid (QubicGrid): Grid with 64 elements(X, O or space)
+
+    Raises:
+        ValueError: "Must contain 64 cells of: X, O, or space"
+    """
+    if (
+        not 0 <= grid.x_bits < 1 << 64
+        or not 0 <= grid.o_bits < 1 << 64
+        or grid.x_bits & grid.o_bits
+    ):
+        raise ValueError("Must contain 64 cells of: X, O, or space")
+
+def validate_qubic_game_state(game_state: QubicGameState) -> None:
+    """Verify a correct qubic gamestate, raises exceptions if is not.
+
+    Args:
+        game_state (QubicGameState): current QubicGameState, consisting of a current QubicGrid
+            and a starting Mark (default X).
+
+    Raises:
+        InvalidGameState: Exception that represent a invalidad game state.
+    """
+    validate_number_of_marks(game_state.grid)
+    validate_starting_mark(game_state.grid, game_state.starting_mark)
+    validate_winner(
+        game_state.grid, game_state.starting_mark, game_state.winner
+    )
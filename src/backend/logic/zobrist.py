@@ -0,0 +1,118 @@
+"""Provide Zobrist hashing for the positions of every variant of the game.
+
+This module allows positions to be identified by a 64-bit integer. A table holds one random key
+per cell and mark, the hash of a position is the XOR of the keys of its occupied cells, so
+playing a move updates the hash with a single XOR. Keys are drawn from a generator seeded by
+the size of the board, so hashes are stable across processes and can be used as cache keys,
+deduplication keys and record ids in game logs.
+
+Examples:
+
+    >>> from backend.logic.zobrist import CLASSIC_ZOBRIST
+    >>> empty = CLASSIC_ZOBRIST.hash_cells(" " * 9, "X")
+    >>> empty ^ CLASSIC_ZOBRIST.key(4, "X") == CLASSIC_ZOBRIST.hash_cells("    X    ", "X")
+    True
+
+The module contains the following class:
+- `ZobristTable` - A table of random keys for the cells of a board.
+
+The module contains the following constants:
+- `CLASSIC_ZOBRIST` - Table of the classic 3x3 grid.
+- `ULTIMATE_ZOBRIST` - Table of the Ultimate Tic Tac Toe grid, with a key per active board.
+- `QUBIC_ZOBRIST` - Table of the Qubic 4x4x4 cube.
+"""
+
+from __future__ import annotations
+import random
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from backend.logic.models import Mark
+
+class ZobristTable:
+    """A table of random 64-bit keys for the cells of a board, one per cell and mark, plus a
+    key for games started by O and optional extra keys for other parts of a position.
+
+    Attributes:
+        cells: int
+            Number of cells of the board.
+        marks: tuple[tuple[int, int], ...]
+            Keys of X and O for every cell.
+        starting_naught: int
+            Key toggled when O is the starting mark.
+        extra: tuple[int, ...]
+            Keys of other parts of a position, like the active board of Ultimate Tic Tac Toe.
+
+    Methods:
+        key(self, index: int, mark: Mark) -> int:
+            Return the key of a mark on a cell.
+        hash_cells(self, cells: str, starting_mark: Mark) -> int:
+            Return the hash of a board given as a string of X, O and spaces.
+        hash_bits(self, x_bits: int, o_bits: int, starting_mark: Mark) -> int:
+            Return the hash of a board given as one integer per mark.
+    """
+    def __init__(self, cells: int, extra: int = 0) -> None:
+        """
+        Args:
+            cells (int): Number of cells of the board.
+            extra (int, optional): Number of extra keys. Defaults to 0.
+        """
+        generator = random.Random(f"zobrist-{cells}-{extra}")
+        self.cells = cells
+        self.marks = tuple(
+            (generator.getrandbits(64), generator.getrandbits(64)) for _ in range(cells)
+        )
+        self.starting_naught = generator.getrandbits(64)
+        self.extra = tuple(generator.getrandbits(64) for _ in range(extra))
+
+    def key(self, index: int, mark: Mark) -> int:
+        """Return the key of a mark on a cell.
+
+        Args:
+            index (int): Index of the cell.
+            mark (Mark): Mark on the cell.
+
+        Returns:
+            int: 64-bit key.
+        """
+        return self.marks[index][mark == "O"]
+
+    def hash_cells(self, cells: str, starting_mark: Mark) -> int:
+        """Return the hash of a board given as a string of X, O and spaces.
+
+        Args:
+            cells (str): One element X, O or space per cell.
+            starting_mark (Mark): Starting mark of the game.
+
+        Returns:
+            int: 64-bit hash.
+        """
+        value = self.starting_naught if starting_mark == "O" else 0
+        for index, cell in enumerate(cells):
+            if cell != " ":
+                value ^= self.marks[index][cell == "O"]
+        return value
+
+    def hash_bits(self, x_bits: int, o_bits: int, starting_mark: Mark) -> int:
+        """Return the hash of a board given as one integer per mark, bit i set when the mark
+        occupies cell i.
+
+        Args:
+            x_bits (int): Cells occupied by X.
+            o_bits (int): Cells occupied by O.
+            starting_mark (Mark): Starting mark of the game.
+
+        Returns:
+            int: 64-bit hash.
+        """
+        value = self.starting_naught if starting_mark == "O" else 0
+        for bits, mark in ((x_bits, 0), (o_bits, 1)):
+            while bits:
+                lowest = bits & -bits
+                value ^= self.marks[lowest.bit_length() - 1][mark]
+                bits ^= lowest
+        return value
+
+CLASSIC_ZOBRIST = ZobristTable(9)
+ULTIMATE_ZOBRIST = ZobristTable(81, extra=9)
+QUBIC_ZOBRIST = ZobristTable(64)
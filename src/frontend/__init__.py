@@ -3,4 +3,5 @@
 Subpackages exported by this subpackage:
 
 - `console`: Handle the frontend console.
+- `service`: Handle the frontend HTTP service.
 """
@@ -2,8 +2,13 @@
 
 Modules exported by this package:
 
+- `analysis`: Provide functions to handle the bulk position analysis from the CLI.
 - `args`: Provide exceptions for that handles the game.
 - `CLI`: Provide methods to implement basic AI to computer player
+- `dataset`: Provide functions to handle the building of training datasets from the CLI.
+- `distributed`: Provide functions to handle the distributed analyses and tournaments from
+    the CLI.
+- `memory`: Provide functions to handle the memory report from the CLI.
 - `players`: Provide methods to validate game states and grid.
 - `renderes`: Provide classes for domain models.
 
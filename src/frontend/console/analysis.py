@@ -0,0 +1,68 @@
+"""Provide functions to handle the bulk position analysis from the CLI.
+
+This module allows the streaming of positions from a file or stdin to the analysis engine and
+the writing of the results as CSV or JSONL.
+
+Examples:
+    >>> tictactoe analyze positions.txt --format jsonl --workers 4
+    >>> cat positions.txt | tictactoe analyze -o results.csv
+
+The module contains the following functions:
+- `analyze(args: AnalyzeArgs) -> None` - Stream the positions through the analysis engine.
+- `write_csv(results: Iterable[PositionAnalysis], output: TextIO) -> None` - Write results as CSV.
+- `write_jsonl(results: Iterable[PositionAnalysis], output: TextIO) -> None` - Write results as
+    JSON lines.
+"""
+
+import csv
+import json
+import sys
+from contextlib import ExitStack
+from typing import Iterable, TextIO
+
+from backend.logic.analysis import PositionAnalysis, analyze_lines
+
+from .args import AnalyzeArgs
+
+def analyze(args: AnalyzeArgs) -> None:
+    """Stream the positions through the analysis engine.
+
+    Args:
+        args (AnalyzeArgs): Parsed arguments of the analyze subcommand.
+    """
+    with ExitStack() as stack:
+        source = sys.stdin
+        if args.input not in (None, "-"):
+            source = stack.enter_context(open(args.input, encoding="utf-8", newline=""))
+        output = sys.stdout
+        if args.output not in (None, "-"):
+            output = stack.enter_context(open(args.output, "w", encoding="utf-8", newline=""))
+        results = analyze_lines(source, args.workers, args.chunk_size)
+        WRITERS[args.format](results, output)
+
+def write_csv(results: Iterable[PositionAnalysis], output: TextIO) -> None:
+    """Write results as CSV, with a header row.
+
+    Args:
+        results (Iterable[PositionAnalysis]): Stream of results.
+        output (TextIO): Destination text stream.
+    """
+    writer = csv.writer(output)
+    writer.writerow(PositionAnalysis._fields)
+    for result in results:
+        writer.writerow(result)
+
+def write_jsonl(results: Iterable[PositionAnalysis], output: TextIO) -> None:
+    """Write results as JSON lines, one object per position.
+
+    Args:
+        results (Iterable[PositionAnalysis]): Stream of results.
+        output (TextIO): Destination text stream.
+    """
+    for result in results:
+        output.write(json.dumps(result._asdict()) + "\n")
+
+WRITERS = {
+    "csv": write_csv,
+    "jsonl": write_jsonl,
+}
@@ -4,20 +4,37 @@ This module allows the handle CLI arguments and options.
 
 The module contains the following classes and functions:
 - `Args(NamedTuple)` - A class to create a namedtuple to handle arguments for CLI
-- `parse_args` - Returns type handled tuple with information about the players and initial Mark.
+- `AnalyzeArgs(NamedTuple)` - A class to create a namedtuple to handle arguments for the
+    analyze subcommand.
+- `DatasetArgs(NamedTuple)` - A class to create a namedtuple to handle arguments for the
+    dataset subcommand.
+- `ServeArgs(NamedTuple)` - A class to create a namedtuple to handle arguments for the serve
+    subcommand.
+- `CoordinateArgs(NamedTuple)` - A class to create a namedtuple to handle arguments for the
+    coordinate subcommand.
+- `WorkArgs(NamedTuple)` - A class to create a namedtuple to handle arguments for the work
+    subcommand.
+- `MemoryArgs(NamedTuple)` - A class to create a namedtuple to handle arguments for the memory
+    subcommand.
+- `parse_args` - Returns type handled tuple with information about the players and initial Mark,
+    or about the analyze, dataset, serve, coordinate, work or memory subcommand.
 """
 
 import argparse
 from typing import NamedTuple
 
+from backend.game.clock import TimeControl
 from backend.game.players import (
     Player,
     RandomComputerPlayer,
     MinimaxComputerPlayer,
+    QubicComputerPlayer,
+    UltimateComputerPlayer,
 )
 from backend.logic.models import Mark
+from backend.logic.rules import RULE_SETS, STANDARD_RULES, RuleSet
 
-from .players import ConsolePlayer
+from .players import ConsolePlayer, QubicConsolePlayer, UltimateConsolePlayer
 
 PLAYER_CLASSES = {
     "human": ConsolePlayer,
@@ -25,6 +42,26 @@ PLAYER_CLASSES = {
     "minimax": MinimaxComputerPlayer,
 }
 
+ULTIMATE_PLAYER_CLASSES = {
+    "human": UltimateConsolePlayer,
+    "random": RandomComputerPlayer,
+    "minimax": UltimateComputerPlayer,
+}
+
+QUBIC_PLAYER_CLASSES = {
+    "human": QubicConsolePlayer,
+    "random": RandomComputerPlayer,
+    "minimax": QubicComputerPlayer,
+}
+
+COMPUTER_PLAYERS = [name for name in PLAYER_CLASSES if name != "human"]
+
+VARIANT_PLAYER_CLASSES = {
+    "classic": PLAYER_CLASSES,
+    "ultimate": ULTIMATE_PLAYER_CLASSES,
+    "qubic": QUBIC_PLAYER_CLASSES,
+}
+
 class Args(NamedTuple):
     """A class that handle arguments for CLI. Extends NamedTuple
 
@@ -33,21 +70,163 @@ class Args(NamedTuple):
             An instance of subclass of the Player class that represents a human or computer.
         player2: Player
             An instance of subclass of the Player class that represents a human or computer.
-        renderer: Renderer
-            An instance of subclass of the Renderer class that handles UI rendering.
+        starting_mark: Mark
+            Represent the starting mark.
+        variant: str
+            Name of the variant of the game, "classic", "ultimate" or "qubic".
+        rules: RuleSet
+            Rules of the classic game.
+        time_control: TimeControl | None
+            Base time and increment of every player, None to play without clocks.
     """
     player1: Player
     player2: Player
     starting_mark: Mark
+    variant: str = "classic"
+    rules: RuleSet = STANDARD_RULES
+    time_control: TimeControl | None = None
 
-def parse_args() -> Args:
-    """Returns type handled tuple with information about the players and initial Mark.
+class AnalyzeArgs(NamedTuple):
+    """A class that handle arguments for the analyze subcommand. Extends NamedTuple
 
-    Returns:
-        Args: tuple[Player, Player, Mark] tuple with players and Mark
+    Attributes:
+        input: str | None
+            Path of the file with one position per line, stdin if None or "-".
+        output: str | None
+            Path of the file where results are written, stdout if None or "-".
+        format: str
+            Output format, "csv" or "jsonl".
+        workers: int | None
+            Size of the process pool, 0 to analyse in the current process.
+        chunk_size: int
+            Positions sent to a worker at once.
     """
+    input: str | None
+    output: str | None
+    format: str
+    workers: int | None
+    chunk_size: int
 
-    parser = argparse.ArgumentParser()
+class DatasetArgs(NamedTuple):
+    """A class that handle arguments for the dataset subcommand. Extends NamedTuple
+
+    Attributes:
+        output: str
+            Directory where the `.npy` files are written.
+        games: int
+            Number of self-play games, 0 to walk every reachable position.
+        player_x: str
+            Name of the player of X in self-play games.
+        player_o: str
+            Name of the player of O in self-play games.
+        seed: int | None
+            Seed of the random generator, for reproducible builds.
+        chunk_size: int
+            Positions gathered before writing.
+    """
+    output: str
+    games: int
+    player_x: str
+    player_o: str
+    seed: int | None
+    chunk_size: int
+
+class ServeArgs(NamedTuple):
+    """A class that handle arguments for the serve subcommand. Extends NamedTuple
+
+    Attributes:
+        host: str
+            Host the service listens on.
+        port: int
+            Port the service listens on.
+        workers: int
+            Connections served at once.
+        cache_size: int
+            Maximum number of cached analyses.
+        idle_timeout: float
+            Seconds a connection is kept alive without a request.
+    """
+    host: str
+    port: int
+    workers: int
+    cache_size: int
+    idle_timeout: float
+
+class CoordinateArgs(NamedTuple):
+    """A class that handle arguments for the coordinate subcommand. Extends NamedTuple
+
+    Attributes:
+        input: str | None
+            Path of the file with one position per line, stdin if None or "-".
+        output: str | None
+            Path of the file where results are written, stdout if None or "-".
+        format: str
+            Output format, "csv" or "jsonl".
+        games: int
+            Games of every match of a tournament, 0 to analyse positions instead.
+        players: list[str]
+            Names of the computer players of the tournament.
+        seed: int | None
+            Seed of the tournament, for reproducible results.
+        host: str
+            Host the coordinator listens on.
+        port: int
+            Port the coordinator listens on.
+        chunk_size: int
+            Positions or games of a work unit.
+        max_attempts: int
+            Times a work unit is handed out before it fails.
+        local_workers: int
+            Workers started as local processes.
+    """
+    input: str | None
+    output: str | None
+    format: str
+    games: int
+    players: list[str]
+    seed: int | None
+    host: str
+    port: int
+    chunk_size: int
+    max_attempts: int
+    local_workers: int
+
+class WorkArgs(NamedTuple):
+    """A class that handle arguments for the work subcommand. Extends NamedTuple
+
+    Attributes:
+        host: str
+            Host of the coordinator.
+        port: int
+            Port of the coordinator.
+    """
+    host: str
+    port: int
+
+class MemoryArgs(NamedTuple):
+    """A class that handle arguments for the memory subcommand. Extends NamedTuple
+
+    Attributes:
+        games: int
+            Number of games played while memory is traced.
+        player_x: str
+            Name of the computer player of X.
+        player_o: str
+            Name of the computer player of O.
+        low_memory: bool
+            Rather to play in low memory mode.
+    """
+    games: int
+    player_x: str
+    player_o: str
+    low_memory: bool
+
+def _add_game_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options of a game between two players to the parser.
+
+    Args:
+        parser (argparse.ArgumentParser): Parser of the CLI.
+    """
     parser.add_argument(
         "-X",
         dest="player_x",
@@ -68,12 +247,263 @@ def parse_args() -> Args:
         type=Mark,
         default="X",
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "-v",
+        "--variant",
+        choices=VARIANT_PLAYER_CLASSES.keys(),
+        default="classic",
+    )
+    parser.add_argument(
+        "-r",
+        "--rules",
+        choices=RULE_SETS.keys(),
+        default="standard",
+        help="rules of the classic game",
+    )
+    parser.add_argument(
+        "-p",
+        "--ponder",
+        action="store_true",
+        help="let minimax players search during the opponent's turn",
+    )
+    parser.add_argument(
+        "-t",
+        "--time",
+        type=float,
+        help="seconds on the clock of every player, a player out of time loses",
+    )
+    parser.add_argument(
+        "-i",
+        "--increment",
+        type=float,
+        default=0.0,
+        help="seconds added to the clock of a player after each move",
+    )
+
+def _add_analyze_arguments(analyze_parser: argparse.ArgumentParser) -> None:
+    """Add the arguments of the analyze subcommand.
+
+    Args:
+        analyze_parser (argparse.ArgumentParser): Parser of the subcommand.
+    """
+    analyze_parser.add_argument("input", nargs="?")
+    analyze_parser.add_argument("-o", "--output")
+    analyze_parser.add_argument("-f", "--format", choices=("csv", "jsonl"), default="csv")
+    analyze_parser.add_argument("-w", "--workers", type=int)
+    analyze_parser.add_argument("-c", "--chunk-size", dest="chunk_size", type=int, default=256)
+
+def _add_dataset_arguments(dataset_parser: argparse.ArgumentParser) -> None:
+    """Add the arguments of the dataset subcommand.
+
+    Args:
+        dataset_parser (argparse.ArgumentParser): Parser of the subcommand.
+    """
+    dataset_parser.add_argument("output")
+    dataset_parser.add_argument(
+        "-g", "--games", type=int, default=0, help="self-play games, 0 for every position"
+    )
+    dataset_parser.add_argument(
+        "-X", dest="dataset_x", choices=COMPUTER_PLAYERS, default="random"
+    )
+    dataset_parser.add_argument(
+        "-O", dest="dataset_o", choices=COMPUTER_PLAYERS, default="minimax"
+    )
+    dataset_parser.add_argument("--seed", type=int)
+    dataset_parser.add_argument("-c", "--chunk-size", dest="chunk_size", type=int, default=4096)
+
+def _add_serve_arguments(serve_parser: argparse.ArgumentParser) -> None:
+    """Add the arguments of the serve subcommand.
+
+    Args:
+        serve_parser (argparse.ArgumentParser): Parser of the subcommand.
+    """
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8000)
+    serve_parser.add_argument("-w", "--workers", dest="serve_workers", type=int, default=16)
+    serve_parser.add_argument("--cache-size", dest="cache_size", type=int, default=65536)
+    serve_parser.add_argument(
+        "--idle-timeout",
+        dest="idle_timeout",
+        type=float,
+        default=1.0,
+        help="seconds a connection is kept alive without a request",
+    )
+
+def _add_coordinate_arguments(coordinate_parser: argparse.ArgumentParser) -> None:
+    """Add the arguments of the coordinate subcommand.
+
+    Args:
+        coordinate_parser (argparse.ArgumentParser): Parser of the subcommand.
+    """
+    coordinate_parser.add_argument("input", nargs="?")
+    coordinate_parser.add_argument("-o", "--output")
+    coordinate_parser.add_argument("-f", "--format", choices=("csv", "jsonl"), default="csv")
+    coordinate_parser.add_argument(
+        "-g", "--games", type=int, default=0, help="games of every match, 0 to analyse positions"
+    )
+    coordinate_parser.add_argument(
+        "--players", nargs="+", choices=COMPUTER_PLAYERS, default=COMPUTER_PLAYERS
+    )
+    coordinate_parser.add_argument("--seed", type=int)
+    coordinate_parser.add_argument("--host", default="127.0.0.1")
+    coordinate_parser.add_argument("--port", type=int, default=9000)
+    coordinate_parser.add_argument(
+        "-c", "--chunk-size", dest="chunk_size", type=int, default=256
+    )
+    coordinate_parser.add_argument("--max-attempts", dest="max_attempts", type=int, default=3)
+    coordinate_parser.add_argument(
+        "-l", "--local-workers", dest="local_workers", type=int, default=0
+    )
+
+def _add_work_arguments(work_parser: argparse.ArgumentParser) -> None:
+    """Add the arguments of the work subcommand.
+
+    Args:
+        work_parser (argparse.ArgumentParser): Parser of the subcommand.
+    """
+    work_parser.add_argument("--host", default="127.0.0.1")
+    work_parser.add_argument("--port", type=int, default=9000)
+
+def _add_memory_arguments(memory_parser: argparse.ArgumentParser) -> None:
+    """Add the arguments of the memory subcommand.
+
+    Args:
+        memory_parser (argparse.ArgumentParser): Parser of the subcommand.
+    """
+    memory_parser.add_argument("-g", "--games", type=int, default=1000)
+    memory_parser.add_argument(
+        "-X", dest="memory_x", choices=COMPUTER_PLAYERS, default="random"
+    )
+    memory_parser.add_argument(
+        "-O", dest="memory_o", choices=COMPUTER_PLAYERS, default="minimax"
+    )
+    memory_parser.add_argument(
+        "-l",
+        "--low-memory",
+        dest="low_memory",
+        action="store_true",
+        help="drop cached moves and keep compact moves in the events",
+    )
+
+def _analyze_args(args: argparse.Namespace) -> AnalyzeArgs:
+    """Return the arguments of the analyze subcommand."""
+    return AnalyzeArgs(args.input, args.output, args.format, args.workers, args.chunk_size)
 
-    player1 = PLAYER_CLASSES[args.player_x](Mark("X"))
-    player2 = PLAYER_CLASSES[args.player_o](Mark("O"))
+def _dataset_args(args: argparse.Namespace) -> DatasetArgs:
+    """Return the arguments of the dataset subcommand."""
+    return DatasetArgs(
+        args.output, args.games, args.dataset_x, args.dataset_o, args.seed, args.chunk_size
+    )
+
+def _serve_args(args: argparse.Namespace) -> ServeArgs:
+    """Return the arguments of the serve subcommand."""
+    return ServeArgs(
+        args.host, args.port, args.serve_workers, args.cache_size, args.idle_timeout
+    )
+
+def _coordinate_args(args: argparse.Namespace) -> CoordinateArgs:
+    """Return the arguments of the coordinate subcommand."""
+    return CoordinateArgs(
+        args.input, args.output, args.format, args.games, args.players, args.seed,
+        args.host, args.port, args.chunk_size, args.max_attempts, args.local_workers,
+    )
+
+def _work_args(args: argparse.Namespace) -> WorkArgs:
+    """Return the arguments of the work subcommand."""
+    return WorkArgs(args.host, args.port)
+
+def _memory_args(args: argparse.Namespace) -> MemoryArgs:
+    """Return the arguments of the memory subcommand."""
+    return MemoryArgs(args.games, args.memory_x, args.memory_o, args.low_memory)
+
+COMMANDS = {
+    "analyze": (
+        "score positions in bulk with the minimax engine",
+        _add_analyze_arguments,
+        _analyze_args,
+    ),
+    "dataset": (
+        "write positions labelled by the minimax engine as .npy files",
+        _add_dataset_arguments,
+        _dataset_args,
+    ),
+    "serve": (
+        "answer best move requests over HTTP with JSON",
+        _add_serve_arguments,
+        _serve_args,
+    ),
+    "coordinate": (
+        "hand out analyses or tournament games to workers over TCP",
+        _add_coordinate_arguments,
+        _coordinate_args,
+    ),
+    "work": (
+        "run analyses or tournament games handed out by a coordinator",
+        _add_work_arguments,
+        _work_args,
+    ),
+    "memory": (
+        "report the memory used by games, traced with tracemalloc",
+        _add_memory_arguments,
+        _memory_args,
+    ),
+}
+
+def _game_args(parser: argparse.ArgumentParser, args: argparse.Namespace) -> Args:
+    """Return the players, starting mark, variant, rules and time control of a game.
+
+    Args:
+        parser (argparse.ArgumentParser): Parser of the CLI, to report invalid options.
+        args (argparse.Namespace): Parsed options of the game.
+
+    Returns:
+        Args: tuple with the players, Mark, variant, rules and time control.
+    """
+    if args.rules != "standard" and args.variant != "classic":
+        parser.error("--rules only applies to the classic variant")
+
+    player_classes = VARIANT_PLAYER_CLASSES[args.variant]
+    player1 = player_classes[args.player_x](Mark("X"))
+    player2 = player_classes[args.player_o](Mark("O"))
+    for player in (player1, player2):
+        if isinstance(player, MinimaxComputerPlayer):
+            player.ponder = args.ponder
 
     if args.starting_mark == "O":
         player1, player2 = player2, player1
 
-    return Args(player1, player2, args.starting_mark)
+    time_control = None
+    if args.time is not None:
+        try:
+            time_control = TimeControl(args.time, args.increment)
+        except ValueError as ex:
+            parser.error(str(ex))
+
+    return Args(
+        player1, player2, args.starting_mark, args.variant, RULE_SETS[args.rules], time_control
+    )
+
+def parse_args() -> (
+    Args | AnalyzeArgs | DatasetArgs | ServeArgs | CoordinateArgs | WorkArgs | MemoryArgs
+):
+    """Returns type handled tuple with information about the players and initial Mark,
+    or about the analyze, dataset, serve, coordinate, work or memory subcommand.
+
+    Returns:
+        Args | AnalyzeArgs | DatasetArgs | ServeArgs | CoordinateArgs | WorkArgs | MemoryArgs:
+            tuple[Player, Player, Mark, str] tuple with players, Mark and variant, or
+            tuple with the options of the analyze, dataset, serve, coordinate, work or memory
+            subcommand.
+    """
+
+    parser = argparse.ArgumentParser()
+    _add_game_arguments(parser)
+    subparsers = parser.add_subparsers(dest="command")
+    for command, (command_help, add_arguments, _) in COMMANDS.items():
+        add_arguments(subparsers.add_parser(command, help=command_help))
+    args = parser.parse_args()
+
+    if args.command in COMMANDS:
+        _, _, command_args = COMMANDS[args.command]
+        return command_args(args)
+    return _game_args(parser, args)
@@ -5,18 +5,76 @@ This module allows the handle CLI start game
 Examples:
     >>> python -m console -X human -O human
     >>> tictactoe -X human -O human
+    >>> tictactoe --variant ultimate -X human -O minimax
+    >>> tictactoe --rules misere -X human -O minimax
+    >>> tictactoe -X human -O minimax --time 60 --increment 2
+    >>> tictactoe analyze positions.txt --format jsonl
+    >>> tictactoe dataset data --games 10000 --seed 1
+    >>> tictactoe serve --port 8000
+    >>> tictactoe coordinate positions.txt --local-workers 4
+    >>> tictactoe work --host coordinator-host --port 9000
+    >>> tictactoe memory --games 1000 --low-memory
 
 The module contains the following classes and functions:
 - `main` - Handle start game from CLI
 """
 
 from backend.game.engine import TicTacToe
+from backend.logic.models import GameState, Grid
+from backend.logic.qubic import QubicGameState, QubicGrid
+from backend.logic.ultimate import UltimateGameState, UltimateGrid
+from frontend.service.server import serve
 
-from .args import parse_args
-from .renderers import ConsoleRenderer
+from .analysis import analyze
+from .args import (
+    AnalyzeArgs,
+    CoordinateArgs,
+    DatasetArgs,
+    MemoryArgs,
+    ServeArgs,
+    WorkArgs,
+    parse_args,
+)
+from .dataset import build
+from .distributed import coordinate, work
+from .memory import report
+from .renderers import ConsoleRenderer, QubicConsoleRenderer, UltimateConsoleRenderer
+
+RENDERERS = {
+    "classic": ConsoleRenderer,
+    "ultimate": UltimateConsoleRenderer,
+    "qubic": QubicConsoleRenderer,
+}
+
+INITIAL_STATES = {
+    "classic": lambda starting_mark, rules: GameState(Grid(), starting_mark, rules),
+    "ultimate": lambda starting_mark, _: UltimateGameState(UltimateGrid(), starting_mark),
+    "qubic": lambda starting_mark, _: QubicGameState(QubicGrid(), starting_mark),
+}
 
 def main() -> None:
     """Handle start game from CLI
     """
-    player1, player2, starting_mark = parse_args()
-    TicTacToe(player1, player2, ConsoleRenderer()).play(starting_mark)
+    args = parse_args()
+    if isinstance(args, AnalyzeArgs):
+        analyze(args)
+        return
+    if isinstance(args, DatasetArgs):
+        build(args)
+        return
+    if isinstance(args, ServeArgs):
+        serve(*args)
+        return
+    if isinstance(args, CoordinateArgs):
+        coordinate(args)
+        return
+    if isinstance(args, WorkArgs):
+        work(args)
+        return
+    if isinstance(args, MemoryArgs):
+        report(args)
+        return
+    player1, player2, starting_mark, variant, rules, time_control = args
+    TicTacToe(player1, player2, RENDERERS[variant](), time_control=time_control).play(
+        starting_mark, INITIAL_STATES[variant](starting_mark, rules)
+    )
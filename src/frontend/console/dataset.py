@@ -0,0 +1,42 @@
+"""Provide functions to handle the building of training datasets from the CLI.
+
+This module allows the positions of every game, or of self-play games between computer
+players, to be labelled by the minimax engine and written as `.npy` files.
+
+Examples:
+    >>> tictactoe dataset data
+    >>> tictactoe dataset data --games 10000 -X random -O minimax --seed 1
+
+The module contains the following function:
+- `build(args: DatasetArgs) -> None` - Build the dataset and report its size.
+"""
+
+from backend.game.dataset import (
+    REACHABLE_POSITIONS,
+    build_dataset,
+    reachable_positions,
+    self_play_positions,
+)
+from backend.logic.models import Mark
+
+from .args import PLAYER_CLASSES, DatasetArgs
+
+def build(args: DatasetArgs) -> None:
+    """Build the dataset and report its size.
+
+    Args:
+        args (DatasetArgs): Parsed arguments of the dataset subcommand.
+    """
+    if args.games:
+        positions = self_play_positions(
+            PLAYER_CLASSES[args.player_x](Mark("X"), delay_seconds=0),
+            PLAYER_CLASSES[args.player_o](Mark("O"), delay_seconds=0),
+            args.games,
+            seed=args.seed,
+        )
+        capacity = 9 * args.games
+    else:
+        positions = reachable_positions()
+        capacity = 2 * REACHABLE_POSITIONS
+    rows = build_dataset(args.output, positions, capacity, args.chunk_size)
+    print(f"Wrote {rows} positions to {args.output}")
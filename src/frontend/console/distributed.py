@@ -0,0 +1,114 @@
+"""Provide functions to handle the distributed analyses and tournaments from the CLI.
+
+This module allows a coordinator to hand out position lines or tournament games to workers
+on other machines, and the results to be written as CSV or JSONL. Workers can also be started
+as local processes, to stand in for remote nodes.
+
+Examples:
+    >>> tictactoe coordinate positions.txt --host 0.0.0.0 --port 9000 -o results.csv
+    >>> tictactoe work --host coordinator-host --port 9000
+    >>> tictactoe coordinate --games 1000 --players random minimax --local-workers 4
+
+The module contains the following functions:
+- `coordinate(args: CoordinateArgs) -> None` - Hand out the work and write the results.
+- `work(args: WorkArgs) -> None` - Run the work handed out by a coordinator.
+- `write_tournament_csv(totals: dict, output: TextIO) -> None` - Write tournament results as
+    CSV.
+- `write_tournament_jsonl(totals: dict, output: TextIO) -> None` - Write tournament results
+    as JSON lines.
+"""
+
+import csv
+import json
+import multiprocessing
+import sys
+from contextlib import ExitStack
+from typing import TextIO
+
+from backend.game.distributed import (
+    MATCH_RESULTS,
+    Coordinator,
+    aggregate_tournament,
+    analysis_results,
+    analysis_units,
+    run_worker,
+    tournament_units,
+)
+
+from .analysis import WRITERS
+from .args import CoordinateArgs, WorkArgs
+
+def coordinate(args: CoordinateArgs) -> None:
+    """Hand out the work to the workers and write the results as they arrive.
+
+    Args:
+        args (CoordinateArgs): Parsed arguments of the coordinate subcommand.
+    """
+    with ExitStack() as stack:
+        source = sys.stdin
+        if not args.games and args.input not in (None, "-"):
+            source = stack.enter_context(open(args.input, encoding="utf-8", newline=""))
+        output = sys.stdout
+        if args.output not in (None, "-"):
+            output = stack.enter_context(open(args.output, "w", encoding="utf-8", newline=""))
+        if args.games:
+            units = tournament_units(args.players, args.games, args.chunk_size, seed=args.seed)
+        else:
+            units = analysis_units(source, args.chunk_size)
+        coordinator = stack.enter_context(
+            Coordinator(units, (args.host, args.port), max_attempts=args.max_attempts)
+        )
+        host, port = coordinator.address
+        print(f"Coordinating workers on {host}:{port}", file=sys.stderr)
+        workers = [
+            multiprocessing.Process(target=run_worker, args=(host, port), daemon=True)
+            for _ in range(args.local_workers)
+        ]
+        for worker in workers:
+            worker.start()
+        if args.games:
+            TOURNAMENT_WRITERS[args.format](aggregate_tournament(coordinator.results()), output)
+        else:
+            WRITERS[args.format](analysis_results(coordinator.results()), output)
+        for worker in workers:
+            worker.join()
+
+def work(args: WorkArgs) -> None:
+    """Run the work handed out by a coordinator until it is done.
+
+    Args:
+        args (WorkArgs): Parsed arguments of the work subcommand.
+    """
+    units_run = run_worker(args.host, args.port)
+    print(f"Ran {units_run} work units")
+
+def write_tournament_csv(totals: dict[tuple[str, str], dict[str, int]], output: TextIO) -> None:
+    """Write tournament results as CSV, with a header row and a row per match.
+
+    Args:
+        totals (dict[tuple[str, str], dict[str, int]]): Counts by result, by player of X and
+            player of O.
+        output (TextIO): Destination text stream.
+    """
+    writer = csv.writer(output)
+    writer.writerow(("player_x", "player_o", *MATCH_RESULTS))
+    for (player_x, player_o), counts in totals.items():
+        writer.writerow((player_x, player_o, *(counts[result] for result in MATCH_RESULTS)))
+
+def write_tournament_jsonl(
+    totals: dict[tuple[str, str], dict[str, int]], output: TextIO
+) -> None:
+    """Write tournament results as JSON lines, one object per match.
+
+    Args:
+        totals (dict[tuple[str, str], dict[str, int]]): Counts by result, by player of X and
+            player of O.
+        output (TextIO): Destination text stream.
+    """
+    for (player_x, player_o), counts in totals.items():
+        output.write(json.dumps({"player_x": player_x, "player_o": player_o, **counts}) + "\n")
+
+TOURNAMENT_WRITERS = {
+    "csv": write_tournament_csv,
+    "jsonl": write_tournament_jsonl,
+}
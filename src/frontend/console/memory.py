@@ -0,0 +1,39 @@
+"""Provide functions to handle the memory report from the CLI.
+
+This module allows the memory used by games between computer players to be traced and
+printed, to check the footprint of long-running processes.
+
+Examples:
+    >>> tictactoe memory --games 1000
+    >>> tictactoe memory --games 1000 -X minimax -O minimax --low-memory
+
+The module contains the following function:
+- `report(args: MemoryArgs) -> None` - Play the games while tracing memory and print the
+    report.
+"""
+
+from backend.game.engine import TicTacToe
+from backend.game.memory import measure_games
+from backend.logic.models import Mark
+
+from .args import PLAYER_CLASSES, MemoryArgs
+
+def report(args: MemoryArgs) -> None:
+    """Play the games while tracing memory and print the report.
+
+    Args:
+        args (MemoryArgs): Parsed arguments of the memory subcommand.
+    """
+    engine = TicTacToe(
+        PLAYER_CLASSES[args.player_x](Mark("X"), delay_seconds=0),
+        PLAYER_CLASSES[args.player_o](Mark("O"), delay_seconds=0),
+        low_memory=args.low_memory,
+    )
+    memory_report = measure_games(engine, args.games)
+    print(f"Games:           {memory_report.games}")
+    print(f"Low memory:      {memory_report.low_memory}")
+    print(f"Bytes per state: {memory_report.bytes_per_state:,.1f}")
+    print(f"Bytes per move:  {memory_report.bytes_per_move:,.1f}")
+    print(f"Peak per game:   {memory_report.mean_peak_bytes:,.0f} mean, "
+          f"{memory_report.max_peak_bytes:,} max")
+    print("Held memory:     " + ", ".join(f"{held:,}" for held in memory_report.held_bytes))
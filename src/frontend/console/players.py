@@ -4,23 +4,113 @@ This module allows the handle CLI arguments and options.
 
 The module contains the following classes:
 - `ConsolePlayer(Player)` - A class that represents human players.
+- `UltimateConsolePlayer(ConsolePlayer)` - A class that represents human players of Ultimate
+    Tic Tac Toe.
+- `QubicConsolePlayer(ConsolePlayer)` - A class that represents human players of Qubic.
 
 The module contains the following functions:
 - `grid_to_index(grid: str) -> int:` - Return infex of the next move.
+- `grid_to_move(grid: str) -> tuple[int, Mark | None]:` - Return index and mark of the next move
+    with wild rules.
+- `ultimate_grid_to_index(grid: str, active_board: int | None = None) -> int:` - Return index
+    of the next move in Ultimate Tic Tac Toe.
+- `qubic_grid_to_index(grid: str) -> int:` - Return index of the next move in Qubic.
 """
+import queue
 import re
+import threading
 
 from backend.game.players import Player
 from backend.logic.exceptions import InvalidMove
-from backend.logic.models import GameState, Move
+from backend.logic.models import GameState, Mark, Move
+from backend.logic.qubic import QubicGameState, QubicMove
+from backend.logic.ultimate import UltimateGameState, UltimateMove
+
+class _ConsoleInput:
+    """Lines typed on the console, read by a single daemon thread, so a player waiting for a
+    line can stop waiting when their time runs out. The thread is started on the first read
+    and serves every player of the process, however many games run out of time.
+
+    Methods:
+        start(self) -> None:
+            Start the thread reading the console, unless it is already running.
+        read_line(self, prompt: str, cancelled: threading.Event) -> str | None:
+            Return the next line typed, None when cancelled first.
+    """
+    def __init__(self) -> None:
+        self._lines: queue.Queue[str | None] = queue.Queue()
+        self._reader: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start the thread reading the console, unless it is already running."""
+        with self._lock:
+            if self._reader is None:
+                self._reader = threading.Thread(target=self._read, daemon=True)
+                self._reader.start()
+
+    def read_line(self, prompt: str, cancelled: threading.Event) -> str | None:
+        """Return the next line typed, None when cancelled first.
+
+        Args:
+            prompt (str): Text written before reading.
+            cancelled (threading.Event): Event set when the player must stop waiting.
+
+        Raises:
+            EOFError: Exception when the console input is closed.
+
+        Returns:
+            str | None: Line typed, without the newline, or None.
+        """
+        self.start()
+        print(prompt, end="", flush=True)
+        while not cancelled.is_set():
+            try:
+                line = self._lines.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if line is None:
+                self._lines.put(None)
+                raise EOFError
+            return line
+        return None
+
+    def _read(self) -> None:
+        """Read lines until the console input is closed, which is marked with None."""
+        while True:
+            try:
+                self._lines.put(input())
+            except EOFError:
+                self._lines.put(None)
+                return
+
+_console_input = _ConsoleInput()
 
 class ConsolePlayer(Player):
     """A class that represents human players. Extend abstract class for the creation of players.
 
     Methods:
+        read_line(self, prompt: str) -> str | None:
+            Return the stripped line typed by the player, None when cancelled first.
         get_move(self, game_state: GameState) -> Move | None:
             Return the current player's move based on the human player choice.
     """
+    def read_line(self, prompt: str) -> str | None:
+        """Return the stripped line typed by the player. In games with time controls the line
+        is read by the thread reading the console, so the player stops waiting and gets None
+        once the move is cancelled.
+
+        Args:
+            prompt (str): Text written before reading.
+
+        Returns:
+            str | None: Line typed, None when the move was cancelled first.
+        """
+        if self.move_cancelled is None:
+            return input(prompt).strip()
+        line = _console_input.read_line(prompt, self.move_cancelled)
+        return None if line is None else line.strip()
+
     def get_move(self, game_state: GameState) -> Move | None:
         """Return the current player's move based on the human player choice.
 
@@ -31,11 +121,81 @@ class ConsolePlayer(Player):
         Returns:
             Move | None: return a move class or none.
         """
+        prompt = f"{self.mark}'s move: "
+        if game_state.rules.wild:
+            prompt = f"{self.mark}'s move and mark: "
         while not game_state.game_over:
+            if (line := self.read_line(prompt)) is None:
+                break
             try:
-                index = grid_to_index(input(f"{self.mark}'s move: ").strip())
+                if game_state.rules.wild:
+                    index, mark = grid_to_move(line)
+                else:
+                    index, mark = grid_to_index(line), None
             except ValueError:
                 print("Please provide coordinates in the form of A1 or 1A")
+            else:
+                try:
+                    return game_state.make_move_to(index, mark)
+                except InvalidMove:
+                    print("That cell is already occupied.")
+        return None
+
+class UltimateConsolePlayer(ConsolePlayer):
+    """A class that represents human players of Ultimate Tic Tac Toe. Extend class ConsolePlayer.
+
+    Methods:
+        get_move(self, game_state: UltimateGameState) -> UltimateMove | None:
+            Return the current player's move based on the human player choice.
+    """
+    def get_move(self, game_state: UltimateGameState) -> UltimateMove | None:
+        """Return the current player's move based on the human player choice.
+
+        Args:
+            game_state (UltimateGameState): current UltimateGameState, consisting of a current
+                UltimateGrid, a starting Mark (default X) and the active board.
+
+        Returns:
+            UltimateMove | None: return a move class or none.
+        """
+        while not game_state.game_over:
+            if (line := self.read_line(f"{self.mark}'s move: ")) is None:
+                break
+            try:
+                index = ultimate_grid_to_index(line, game_state.active_board)
+            except ValueError:
+                print("Please provide the board and the cell in the form of B2 A1")
+            else:
+                try:
+                    return game_state.make_move_to(index)
+                except InvalidMove as ex:
+                    print(f"{ex}.")
+        return None
+
+class QubicConsolePlayer(ConsolePlayer):
+    """A class that represents human players of Qubic. Extend class ConsolePlayer.
+
+    Methods:
+        get_move(self, game_state: QubicGameState) -> QubicMove | None:
+            Return the current player's move based on the human player choice.
+    """
+    def get_move(self, game_state: QubicGameState) -> QubicMove | None:
+        """Return the current player's move based on the human player choice.
+
+        Args:
+            game_state (QubicGameState): current QubicGameState, consisting of a current
+                QubicGrid and a starting Mark (default X).
+
+        Returns:
+            QubicMove | None: return a move class or none.
+        """
+        while not game_state.game_over:
+            if (line := self.read_line(f"{self.mark}'s move: ")) is None:
+                break
+            try:
+                index = qubic_grid_to_index(line)
+            except ValueError:
+                print("Please provide the layer and the cell in the form of 2 B3")
             else:
                 try:
                     return game_state.make_move_to(index)
@@ -63,3 +223,65 @@ def grid_to_index(grid: str) -> int:
     else:
         raise ValueError("Invalid grid coordinates")
     return 3 * (int(row) - 1) + (ord(col.upper()) - ord("A"))
+
+def grid_to_move(grid: str) -> tuple[int, Mark | None]:
+    """Return index and mark of the next move with wild rules. Input must be in the format
+    accepted by grid_to_index, optionally followed by the mark to place, for instance A1 O.
+
+    Args:
+        grid (str): String with the position option from human input
+
+    Raises:
+        ValueError: Exception when a value of the index is outside bounds.
+
+    Returns:
+        tuple[int, Mark | None]: index of move and mark, None for the mark of the player
+    """
+    if match := re.fullmatch(r"(\w\w)\s*([xoXO])", grid):
+        return grid_to_index(match[1]), Mark(match[2].upper())
+    return grid_to_index(grid), None
+
+def ultimate_grid_to_index(grid: str, active_board: int | None = None) -> int:
+    """Return index of the next move in Ultimate Tic Tac Toe. Input must be the coordinates of
+    the board followed by the coordinates of the cell, both in the format accepted by
+    grid_to_index, for instance B2 A1. The board can be omitted when the move must be played
+    in the active board.
+
+    Args:
+        grid (str): String with the position option from human input
+        active_board (int | None, optional): Board where the move must be played, if any.
+            Defaults to None.
+
+    Raises:
+        ValueError: Exception when a value of the index is outside bounds.
+
+    Returns:
+        int: index of move, 9 * board + cell
+    """
+    coordinates = grid.replace(" ", "")
+    if len(coordinates) == 2 and active_board is not None:
+        return 9 * active_board + grid_to_index(coordinates)
+    if len(coordinates) == 4:
+        return 9 * grid_to_index(coordinates[:2]) + grid_to_index(coordinates[2:])
+    raise ValueError("Invalid grid coordinates")
+
+def qubic_grid_to_index(grid: str) -> int:
+    """Return index of the next move in Qubic. Input must be the layer, from 1 to 4, followed
+    by the cell in format A1 or 1A, with letters A to D and numbers 1 to 4, for instance 2 B3.
+
+    Args:
+        grid (str): String with the position option from human input
+
+    Raises:
+        ValueError: Exception when a value of the index is outside bounds.
+
+    Returns:
+        int: index of move, 16 * layer + 4 * row + column
+    """
+    if match := re.match(r"^([1-4])\s*([a-dA-D])([1-4])$", grid):
+        layer, col, row = match.groups()
+    elif match := re.match(r"^([1-4])\s*([1-4])([a-dA-D])$", grid):
+        layer, row, col = match.groups()
+    else:
+        raise ValueError("Invalid grid coordinates")
+    return 16 * (int(layer) - 1) + 4 * (int(row) - 1) + (ord(col.upper()) - ord("A"))
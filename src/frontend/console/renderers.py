@@ -4,7 +4,12 @@ Provide the classes handle human players.
 This module allows the handle CLI arguments and options.
 
 The module contains the following classes:
-- `ConsoleRenderer(Renderer)` - A class to handler render UI in the console.
+- `BaseConsoleRenderer(Renderer)` - ABC. A class to handler render the clock in the console.
+- `ConsoleRenderer(BaseConsoleRenderer)` - A class to handler render UI in the console.
+- `UltimateConsoleRenderer(BaseConsoleRenderer)` - A class to handler render UI of Ultimate
+    Tic Tac Toe in the console.
+- `QubicConsoleRenderer(BaseConsoleRenderer)` - A class to handler render UI of Qubic in the
+    console.
 
 The module contains the following functions:
 - `clear_screen() -> None:` - Clear console, like command reset on modern Linux systems.
@@ -14,15 +19,43 @@ The module contains the following functions:
     - Add blinking ANSI code to positions in cells.
 - `print_solid(cells: Iterable[str]) -> None:` - Render game UI. It uses textwrap and
     format to replace on the correct position..
+- `dim(text: str) -> str:` - Modify information to be print to console and add faint intensity.
+- `index_to_grid(index: int) -> str:` - Return the coordinates of a cell or board, like A1.
+- `print_ultimate(game_state: UltimateGameState) -> None:` - Render the Ultimate Tic Tac Toe UI.
+- `print_qubic(cells: Iterable[str]) -> None:` - Render the Qubic UI, the four layers side by
+    side.
+- `print_clock(clock: dict[str, float], flagged: Mark | None = None) -> None:` - Render the
+    time left of every player.
 """
 
+import abc
 import textwrap
 from typing import Iterable
 
 from backend.game.renderers import Renderer
-from backend.logic.models import GameState
+from backend.logic.models import GameState, Mark
+from backend.logic.qubic import QubicGameState
+from backend.logic.ultimate import UltimateGameState
 
-class ConsoleRenderer(Renderer):
+class BaseConsoleRenderer(Renderer, metaclass=abc.ABCMeta):
+    """Abstract class for the console renderers of every variant, which render the clock of the
+    game the same way. Extends abstract class Renderer.
+
+    Methods:
+        render_clock(self, clock: dict[str, float], flagged: Mark | None = None) -> None:
+            Renders the time left of every player below the game.
+    """
+    def render_clock(self, clock: dict[str, float], flagged: Mark | None = None) -> None:
+        """Renders the time left of every player below the game.
+
+        Args:
+            clock (dict[str, float]): Seconds left by mark.
+            flagged (Mark | None, optional): Mark of the player whose time ran out, if any.
+                Defaults to None.
+        """
+        print_clock(clock, flagged)
+
+class ConsoleRenderer(BaseConsoleRenderer):
     """A class to handler render UI in the console. Extend abstract class Renderar
         for the creation of visual and state rendering
 
@@ -49,6 +82,62 @@ class ConsoleRenderer(Renderer):
     def placeholder2(self) -> None:
         """This is a placeholder
         """
+
+class UltimateConsoleRenderer(BaseConsoleRenderer):
+    """A class to handler render UI of Ultimate Tic Tac Toe in the console. Extend abstract class
+        Renderer for the creation of visual and state rendering
+
+    Methods:
+        render(self, game_state: UltimateGameState) -> None:
+            Renders a new UI depending on game state.
+    """
+    def render(self, game_state: UltimateGameState) -> None:
+        """Renders a new UI depending on game state. Closed sub-boards are faint and the
+        sub-boards of the winning line blink.
+
+        Args:
+            game_state (UltimateGameState): current UltimateGameState, consisting of a current
+                UltimateGrid, a starting Mark (default X) and the active board.
+        """
+        clear_screen()
+        print_ultimate(game_state)
+        if game_state.winner:
+            print(f"{game_state.winner} wins \N{party popper}")
+        elif game_state.tie:
+            print("No one wins this time \N{neutral face}")
+        elif game_state.active_board is None:
+            print(f"{game_state.current_mark} plays in any open board")
+        else:
+            print(
+                f"{game_state.current_mark} plays in board "
+                f"{index_to_grid(game_state.active_board)}"
+            )
+
+class QubicConsoleRenderer(BaseConsoleRenderer):
+    """A class to handler render UI of Qubic in the console. Extend abstract class Renderer
+        for the creation of visual and state rendering
+
+    Methods:
+        render(self, game_state: QubicGameState) -> None:
+            Renders a new UI depending on game state.
+    """
+    def render(self, game_state: QubicGameState) -> None:
+        """Renders a new UI depending on game state.
+
+        Args:
+            game_state (QubicGameState): current QubicGameState, consisting of a current
+                QubicGrid and a starting Mark (default X).
+        """
+        clear_screen()
+        mutable_cells = list(game_state.grid.cells)
+        for position in game_state.winning_cells:
+            mutable_cells[position] = blink(mutable_cells[position])
+        print_qubic(mutable_cells)
+        if game_state.winner:
+            print(f"{game_state.winner} wins \N{party popper}")
+        elif game_state.tie:
+            print("No one wins this time \N{neutral face}")
+
 def clear_screen() -> None:
     """Clear console, like command reset on modern Linux systems.
     """
@@ -92,3 +181,81 @@ def print_solid(cells: Iterable[str]) -> None:
     """
         ).format(*cells)
     )
+
+def dim(text: str) -> str:
+    """Modify information to be print to console and add faint intensity [2m and [0m reset.
+    """
+    return f"\033[2m{text}\033[0m"
+
+def index_to_grid(index: int) -> str:
+    """Return the coordinates of a cell or board, like A1. Inverse of grid_to_index.
+
+    Args:
+        index (int): Index of the cell or board, from 0 to 8.
+
+    Returns:
+        str: Column letter followed by row number.
+    """
+    return f"{'ABC'[index % 3]}{index // 3 + 1}"
+
+def print_ultimate(game_state: UltimateGameState) -> None:
+    """Render the Ultimate Tic Tac Toe UI. Boards and cells are labelled with the coordinates
+    used to enter moves, boards outside and cells inside.
+
+    Args:
+        game_state (UltimateGameState): current UltimateGameState, consisting of a current
+            UltimateGrid, a starting Mark (default X) and the active board.
+    """
+    cells = game_state.grid.cells
+    print(" " * 11 + (" " * 13).join("ABC"))
+    print(" " * 7 + (" " * 5).join(["A   B   C"] * 3))
+    for board_row in range(3):
+        if board_row:
+            print("    ┆ " + "╋".join(["━" * 12, "━" * 13, "━" * 12]))
+        for cell_row in range(3):
+            parts = []
+            for board in range(3 * board_row, 3 * board_row + 3):
+                style = str
+                if board in game_state.winning_boards:
+                    style = blink
+                elif game_state.closed_boards >> board & 1:
+                    style = dim
+                parts.append(" │ ".join(
+                    style(cells[9 * board + 3 * cell_row + column]) for column in range(3)
+                ))
+            label = board_row + 1 if cell_row == 1 else " "
+            print(f"{label} {cell_row + 1} ┆  " + "  ┃  ".join(parts))
+
+def print_qubic(cells: Iterable[str]) -> None:
+    """Render the Qubic UI, the four layers side by side, labelled with the coordinates used
+    to enter moves.
+
+    Args:
+        cells (Iterable[str]): List of the 64 cells, layer by layer.
+    """
+    cells = list(cells)
+    print(" " * 5 + (" " * 5).join(f"{f'Layer {layer}':^13}" for layer in range(1, 5)))
+    print(" " * 5 + (" " * 5).join(["A   B   C   D"] * 4))
+    for row in range(4):
+        if row:
+            print("  ┆ " + " ┃ ".join(["───┼───┼───┼───"] * 4))
+        print(f"{row + 1} ┆  " + "  ┃  ".join(
+            " │ ".join(cells[16 * layer + 4 * row + column] for column in range(4))
+            for layer in range(4)
+        ))
+
+def print_clock(clock: dict[str, float], flagged: Mark | None = None) -> None:
+    """Render the time left of every player, as minutes and seconds, and the loss on time.
+
+    Args:
+        clock (dict[str, float]): Seconds left by mark.
+        flagged (Mark | None, optional): Mark of the player whose time ran out, if any.
+            Defaults to None.
+    """
+    times = []
+    for mark, seconds in clock.items():
+        minutes, tenths = divmod(round(seconds * 10), 600)
+        times.append(f"{mark} {minutes}:{tenths // 10:02}.{tenths % 10}")
+    print(" │ ".join(times))
+    if flagged:
+        print(f"{flagged} ran out of time, {flagged.other} wins \N{alarm clock}")
@@ -0,0 +1,6 @@
+"""Package that handles the frontend service.
+
+Modules exported by this package:
+
+- `server`: Provide a local HTTP service that returns the best move of a position.
+"""
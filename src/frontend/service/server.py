@@ -0,0 +1,408 @@
+"""Provide a local HTTP service that returns the best move of a position.
+
+This module allows other services to call the minimax engine over HTTP with JSON. The server
+only uses the standard library and runs offline. Each connection is served by a thread of a
+bounded pool, and only a bounded number of connections wait for a free thread, further ones
+are answered with a 503 status. Connections are kept alive between requests, following
+HTTP/1.1, and are closed once idle for a short timeout, separate from the timeout to read a
+request, so idle clients do not hold the workers for long. Analyses are kept in an LRU
+cache keyed on the canonical position. The 8 symmetries of the grid and swapping the marks when
+O started give the same analysis, so positions that are equivalent share an entry.
+
+Examples:
+
+    $ tictactoe serve --port 8000
+    $ curl -d '{"grid": "X   O    ", "starting_mark": "X"}' localhost:8000/analyze
+    {"grid": "X   O    ", "starting_mark": "X", "rules": "standard", "status": "ongoing",
+    "winner": null, "to_move": "X", "best_move": {"index": 8, "mark": "X"},
+    "moves": [{"index": 1, "mark": "X", "score": 0}, ...]}
+    $ curl 'localhost:8000/analyze?grid=XXO+O+X+O&starting_mark=X'
+
+The module contains the following classes:
+- `AnalysisServer` - HTTP server with a bounded pool of workers and a cache of analyses.
+- `AnalysisHandler` - Handler of the requests of the analysis service.
+
+The module contains the following functions:
+- `analyze_canonical(cells: str, rules_name: str) -> tuple` - Return the analysis of a
+    canonical position.
+- `position_report(
+    cells: str, starting_mark: str, rules_name: str = "standard", analyze: Callable = ...
+    ) -> dict` - Return the analysis of a position as a JSON-serializable dict.
+- `serve(host: str = "127.0.0.1", port: int = 8000, workers: int = 16,
+    cache_size: int = 65536, idle_timeout: float = 1.0) -> None` - Run the service until
+    interrupted.
+"""
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any, Callable
+from urllib.parse import parse_qs, urlsplit
+
+from backend.logic.book import canonical
+from backend.logic.cache import SHARED_SEARCH_CACHE
+from backend.logic.exceptions import InvalidGameState
+from backend.logic.minimax import evaluate_position
+from backend.logic.models import GameState, Grid, Mark
+from backend.logic.rules import RULE_SETS
+
+MAX_BODY_SIZE = 4096
+
+BUSY_BODY = json.dumps({"error": "Too many connections"}).encode()
+
+def analyze_canonical(cells: str, rules_name: str) -> tuple:
+    """Return the analysis of a canonical position, a position started by X. The game state
+    is validated when it is built.
+
+    Args:
+        cells (str): 9 elements X, O or space.
+        rules_name (str): Name of the rule set.
+
+    Raises:
+        InvalidGameState: Exception when the position can not be reached.
+        ValueError: Exception when the cells are malformed.
+
+    Returns:
+        tuple: Status, winner, mark to move, code of the best move and pairs of move code and
+            score for every possible move.
+    """
+    game_state = GameState(Grid(cells), Mark.CROSS, RULE_SETS[rules_name])
+    if game_state.winner:
+        status = "win"
+    elif game_state.tie:
+        status = "tie"
+    else:
+        status = "ongoing"
+    _, best_code = evaluate_position(game_state, SHARED_SEARCH_CACHE)
+    scores = tuple(
+        (move.code, -evaluate_position(move.after_state, SHARED_SEARCH_CACHE)[0])
+        for move in game_state.possible_moves
+    )
+    return status, game_state.winner, game_state.current_mark, best_code, scores
+
+def position_report(
+    cells: str,
+    starting_mark: str,
+    rules_name: str = "standard",
+    analyze: Callable[[str, str], tuple] = analyze_canonical,
+) -> dict[str, Any]:
+    """Return the analysis of a position as a JSON-serializable dict, mapping the analysis of
+    its canonical position back to its cells and marks. The position is validated as given,
+    and positions where both marks completed a line, which no game reaches, are rejected.
+
+    Args:
+        cells (str): 9 elements X, O or space.
+        starting_mark (str): Starting mark of the game, X or O.
+        rules_name (str, optional): Name of the rule set. Defaults to "standard".
+        analyze (Callable[[str, str], tuple], optional): Function returning the analysis of a
+            canonical position, usually a cached analyze_canonical. Defaults to
+            analyze_canonical.
+
+    Raises:
+        InvalidGameState: Exception when the position can not be reached.
+        ValueError: Exception when an argument is malformed.
+
+    Returns:
+        dict[str, Any]: Status, winner, mark to move, best move and score of every move.
+    """
+    mark = _validate_position(cells, starting_mark, rules_name)
+    canonical_cells, symmetry = canonical(cells, mark)
+    status, winner, to_move, best_code, scores = analyze(canonical_cells, rules_name)
+
+    def original(value: Mark | None) -> str | None:
+        if value is None:
+            return None
+        return value.other if mark is Mark.NAUGHT else value
+
+    player = original(to_move)
+
+    def move(code: int) -> dict[str, Any]:
+        return {
+            "index": symmetry[code % 9],
+            "mark": player if code < 9 else player.other,
+        }
+
+    return {
+        "grid": cells,
+        "starting_mark": mark,
+        "rules": rules_name,
+        "status": status,
+        "winner": original(winner),
+        "to_move": None if status != "ongoing" else player,
+        "best_move": None if best_code is None else move(best_code),
+        "moves": sorted(
+            ({**move(code), "score": score} for code, score in scores),
+            key=lambda entry: (entry["index"], entry["mark"] != player),
+        ),
+    }
+
+def _validate_position(cells: Any, starting_mark: Any, rules_name: Any) -> Mark:
+    """Validate a position as given in a request, whatever the JSON types of its values.
+
+    Args:
+        cells (Any): 9 elements X, O or space.
+        starting_mark (Any): Starting mark of the game, X or O.
+        rules_name (Any): Name of the rule set.
+
+    Raises:
+        InvalidGameState: Exception when the position can not be reached.
+        ValueError: Exception when an argument is malformed.
+
+    Returns:
+        Mark: Starting mark of the game.
+    """
+    if not isinstance(rules_name, str) or rules_name not in RULE_SETS:
+        raise ValueError(f"Unknown rules {rules_name!r}")
+    if not isinstance(cells, str) or len(cells) != 9 or cells.strip("XO "):
+        raise ValueError("Must contain 9 cells of: X, O, or space")
+    if not isinstance(starting_mark, str):
+        raise ValueError(f"Unknown starting mark {starting_mark!r}")
+    mark = Mark(starting_mark)
+    grid = Grid(cells)
+    rules = RULE_SETS[rules_name]
+    GameState(grid, mark, rules)
+    if rules.completed[grid.x_bits] and rules.completed[grid.o_bits]:
+        raise InvalidGameState("Both marks completed a line")
+    return mark
+
+class AnalysisHandler(BaseHTTPRequestHandler):
+    """Handler of the requests of the analysis service. Extends BaseHTTPRequestHandler.
+
+    Requests are sent to `/analyze`, either as a POST with a JSON object or as a GET with a
+    query string, with the keys `grid`, `starting_mark` (default X) and `rules` (default
+    standard). Responses are JSON objects, with an `error` key and a 400 status for invalid
+    positions. The next request of a connection is waited for no longer than the idle timeout
+    of the server, and its reading then takes no longer than `timeout`.
+
+    Methods:
+        handle_one_request(self) -> None:
+            Wait for the next request of the connection while idle, then answer it.
+        do_GET(self) -> None:
+            Answer a request with the position in the query string.
+        do_POST(self) -> None:
+            Answer a request with the position in a JSON body.
+    """
+    protocol_version = "HTTP/1.1"
+    server_version = "TicTacToeAnalysis/1.0"
+    timeout = 5
+    disable_nagle_algorithm = True
+
+    server: "AnalysisServer"
+
+    def handle_one_request(self) -> None:
+        """Wait for the next request of the connection while idle, then answer it. The
+        connection is closed when no request starts before the idle timeout of the server, or
+        when the client closed it.
+        """
+        self.connection.settimeout(self.server.idle_timeout)
+        try:
+            started = self.rfile.peek(1)
+        except OSError:
+            started = b""
+        if not started:
+            self.close_connection = True
+            return
+        self.connection.settimeout(self.timeout)
+        super().handle_one_request()
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """Answer a request with the position in the query string."""
+        url = urlsplit(self.path)
+        if url.path != "/analyze":
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "Not found"})
+            return
+        query = {
+            key: values[-1] for key, values in parse_qs(url.query, keep_blank_values=True).items()
+        }
+        self._answer(query)
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        """Answer a request with the position in a JSON body. The connection is closed after
+        a body of unknown or excessive length, which can not be skipped.
+        """
+        header = self.headers.get("Content-Length")
+        if header is None:
+            self.close_connection = True
+            self._send_json(HTTPStatus.LENGTH_REQUIRED, {"error": "Content-Length required"})
+            return
+        try:
+            length = int(header)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": "Invalid Content-Length"})
+            return
+        if length > MAX_BODY_SIZE:
+            self.close_connection = True
+            self._send_json(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "Body too large"})
+            return
+        body = self.rfile.read(length)
+        if urlsplit(self.path).path != "/analyze":
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "Not found"})
+            return
+        try:
+            query = json.loads(body)
+        except ValueError:
+            query = None
+        if not isinstance(query, dict):
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": "Body must be a JSON object"})
+            return
+        self._answer(query)
+
+    def _answer(self, query: dict[str, Any]) -> None:
+        """Send the analysis of the position of a request.
+
+        Args:
+            query (dict[str, Any]): Keys grid, starting_mark and rules.
+        """
+        try:
+            report = position_report(
+                query.get("grid"),
+                query.get("starting_mark", "X"),
+                query.get("rules", "standard"),
+                self.server.analyze,
+            )
+        except (InvalidGameState, ValueError) as ex:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": str(ex)})
+        else:
+            self._send_json(HTTPStatus.OK, report)
+
+    def _send_json(self, status: HTTPStatus, content: dict[str, Any]) -> None:
+        """Send a JSON response.
+
+        Args:
+            status (HTTPStatus): Status of the response.
+            content (dict[str, Any]): Object sent as JSON.
+        """
+        body = json.dumps(content).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Silence the log of every request, which would slow down the service."""
+
+class AnalysisServer(HTTPServer):
+    """HTTP server with a bounded pool of workers and a cache of analyses. Extends HTTPServer.
+    Each accepted connection is served by a worker of the pool, up to `max_pending`
+    connections beyond the size of the pool wait for a free worker, and further ones are
+    answered with a 503 status and closed.
+
+    Attributes:
+        analyze: Callable[[str, str], tuple]
+            analyze_canonical wrapped in an LRU cache.
+        idle_timeout: float
+            Seconds a connection is kept alive without a request.
+
+    Methods:
+        process_request(self, request, client_address) -> None:
+            Serve a connection in a worker of the pool.
+        server_close(self) -> None:
+            Close the socket and stop the workers.
+    """
+    request_queue_size = 128
+    max_pending = 64
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        workers: int = 16,
+        cache_size: int = 65536,
+        idle_timeout: float = 1.0,
+    ) -> None:
+        """
+        Args:
+            address (tuple[str, int]): Host and port to listen on.
+            workers (int, optional): Connections served at once. Defaults to 16.
+            cache_size (int, optional): Maximum number of cached analyses. Defaults to 65536.
+            idle_timeout (float, optional): Seconds a connection is kept alive without a
+                request. Defaults to 1.0.
+        """
+        super().__init__(address, AnalysisHandler)
+        self.analyze = lru_cache(maxsize=cache_size)(analyze_canonical)
+        self.idle_timeout = idle_timeout
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="analysis")
+        self._pending = threading.BoundedSemaphore(workers + self.max_pending)
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        """Serve a connection in a worker of the pool, or answer it with a 503 status and
+        close it when too many connections are served or waiting.
+
+        Args:
+            request (Any): Socket of the connection.
+            client_address (Any): Address of the client.
+        """
+        # The slot is released by the worker once the connection is closed.
+        if not self._pending.acquire(blocking=False):  # pylint: disable=consider-using-with
+            self._refuse(request)
+            return
+        self._executor.submit(self._serve_connection, request, client_address)
+
+    def _refuse(self, request: Any) -> None:
+        """Answer a connection with a 503 status, without reading its request, and close it.
+
+        Args:
+            request (Any): Socket of the connection.
+        """
+        try:
+            request.sendall(
+                b"HTTP/1.1 503 Service Unavailable\r\n"
+                b"Content-Type: application/json\r\n"
+                + f"Content-Length: {len(BUSY_BODY)}\r\n".encode()
+                + b"Retry-After: 1\r\nConnection: close\r\n\r\n"
+                + BUSY_BODY
+            )
+        except OSError:
+            pass
+        self.shutdown_request(request)
+
+    def _serve_connection(self, request: Any, client_address: Any) -> None:
+        """Handle every request of a connection, then close it.
+
+        Args:
+            request (Any): Socket of the connection.
+            client_address (Any): Address of the client.
+        """
+        try:
+            self.finish_request(request, client_address)
+        # Like socketserver.ThreadingMixIn, report any error of a connection and keep serving.
+        except Exception:  # pylint: disable=broad-exception-caught
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._pending.release()
+
+    def server_close(self) -> None:
+        """Close the socket and stop the workers."""
+        super().server_close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    workers: int = 16,
+    cache_size: int = 65536,
+    idle_timeout: float = 1.0,
+) -> None:
+    """Run the service until interrupted.
+
+    Args:
+        host (str, optional): Host to listen on. Defaults to "127.0.0.1".
+        port (int, optional): Port to listen on. Defaults to 8000.
+        workers (int, optional): Connections served at once. Defaults to 16.
+        cache_size (int, optional): Maximum number of cached analyses. Defaults to 65536.
+        idle_timeout (float, optional): Seconds a connection is kept alive without a
+            request. Defaults to 1.0.
+    """
+    with AnalysisServer((host, port), workers, cache_size, idle_timeout) as server:
+        print(f"Serving best moves on http://{host}:{server.server_port}/analyze")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass